@@ -2,25 +2,58 @@ from __future__ import annotations
 
 import asyncio
 from asyncio import subprocess as aio_subprocess
+import base64
+import contextvars
+import copy
+import fcntl
+import gzip
+import heapq
+import importlib
 import io
+import itertools
 import json
 import logging
 import os
+import re
+import shutil
+import signal
+import socket
+import sqlite3
 import sys
+import threading
+import time
 import uuid
-from collections import defaultdict
-from contextlib import redirect_stdout
-from dataclasses import dataclass, field
-from datetime import datetime, timezone
-from hashlib import sha256
+import zlib
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, asynccontextmanager, contextmanager
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta, timezone
+from hashlib import file_digest, sha256
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple
+from types import ModuleType
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+)
 
 import httpx
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import FileResponse, HTMLResponse, Response, StreamingResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from pydantic import BaseModel, Field, ConfigDict
 from shared.utils import get_version
 from fastmcp.client.auth.oauth import OAuth as FastMCPOAuth
@@ -68,7 +101,314 @@ MCP_SCAN_STORAGE_ROOT.mkdir(parents=True, exist_ok=True)
 
 SCAN_TIMEOUT_SECONDS = int(os.environ.get("MCP_SCAN_TIMEOUT_SECONDS", "45"))
 
+# The backend's own wall-clock budget for the mcp-scan component (inspect
+# plus scan together) is the requested server timeout plus this grace period. Past the deadline the process group
+# gets SIGTERM, then SIGKILL after ``MCP_SCAN_KILL_GRACE_SECONDS``.
+SCAN_DEADLINE_GRACE_SECONDS = float(os.environ.get("MCP_SCAN_DEADLINE_GRACE_SECONDS", "30"))
+SCAN_KILL_GRACE_SECONDS = float(os.environ.get("MCP_SCAN_KILL_GRACE_SECONDS", "5"))
+
+# Upper bound on concurrently executing scan jobs (mcp-scan subprocess +
+# validator thread each). Extra jobs wait in a priority queue.
+SCAN_MAX_WORKERS = max(1, int(os.environ.get("MCP_SCAN_MAX_WORKERS", "4")))
+
+# Lower value runs first. Interactive repository onboarding jumps ahead of
+# bulk/API submitted scans.
+SCAN_PRIORITY_INTERACTIVE = 0
+SCAN_PRIORITY_BULK = 10
+
+# Jobs submitted while an identical scan (same fingerprint) is queued or
+# running attach to it instead of starting another one. Not used in
+# shared-state mode, where only ``maxAge`` reuse works across workers.
+SCAN_COALESCE = os.environ.get("MCP_SCAN_COALESCE", "1").lower() not in {"0", "false", "no"}
+
+# Run independent validator checks concurrently on separate testers. The
+# session chain (initialize -> tools -> invocations) always stays ordered.
+VALIDATOR_PARALLEL = os.environ.get("MCP_VALIDATOR_PARALLEL", "1").lower() not in {"0", "false", "no"}
+
+# "tester" drives mcp-validator's MCPHttpTester from a thread; "async" uses
+# the in-process asyncio engine over the shared outbound HTTP pool.
+VALIDATOR_ENGINE = os.environ.get("MCP_VALIDATOR_ENGINE", "tester").lower()
+VALIDATOR_REQUEST_TIMEOUT_SECONDS = float(os.environ.get("MCP_VALIDATOR_REQUEST_TIMEOUT_SECONDS", "30"))
+
+# Outbound HTTP (OAuth flows, token refreshes, the async validator) goes
+# through one keep-alive client pool opened for the application's lifetime.
+# Besides the global connection caps, at most ``MCP_HTTP_MAX_PER_HOST``
+# requests run against any one host at a time.
+HTTP_MAX_CONNECTIONS = int(os.environ.get("MCP_HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("MCP_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_MAX_PER_HOST = max(1, int(os.environ.get("MCP_HTTP_MAX_PER_HOST", "10")))
+HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.environ.get("MCP_HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+
+try:
+    import h2  # noqa: F401
+except ImportError:  # pragma: no cover - optional dependency
+    HTTP2_AVAILABLE = False
+else:
+    HTTP2_AVAILABLE = True
+
+# Finished results are encoded once with orjson when the ``fast-json`` extra
+# is installed, otherwise with the standard library encoder.
+orjson: ModuleType | None
+try:
+    orjson = importlib.import_module("orjson")
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Resident mcp-scan processes reused across jobs (0 disables the pool and
+# always spawns a one-shot ``uv run`` subprocess). Workers are recycled after
+# ``MCP_SCAN_WORKER_MAX_JOBS`` scans.
+MCP_SCAN_WARM_WORKERS = max(0, int(os.environ.get("MCP_SCAN_WARM_WORKERS", str(SCAN_MAX_WORKERS))))
+MCP_SCAN_WORKER_MAX_JOBS = max(1, int(os.environ.get("MCP_SCAN_WORKER_MAX_JOBS", "50")))
+# In shared-state mode each uvicorn worker has its own pool, so idle warm
+# workers are stopped after this long to keep the node-wide count close to
+# the scans actually running.
+MCP_SCAN_WORKER_IDLE_SECONDS = float(os.environ.get("MCP_SCAN_WORKER_IDLE_SECONDS", "300"))
+MCP_SCAN_WORKER_SCRIPT = Path(__file__).with_name("mcp_scan_worker.py")
+
+# Toxic-flow evidence lists at most this many edges (most frequent first);
+# the remainder is summarised per source node instead of enumerated.
+TOXIC_FLOW_MAX_EDGES = max(0, int(os.environ.get("MCP_TOXIC_FLOW_MAX_EDGES", "200")))
+
+# Normalised mcp-scan checks are cached on disk, keyed by a hash of the
+# server's signature plus the rubric version, and evicted least recently used
+# once the cache exceeds ``MCP_SCAN_CACHE_MAX_BYTES``. With the preflight on,
+# a cheap ``mcp-scan inspect`` fetches the signature first so a hit skips the
+# analysis entirely.
+SCAN_CACHE_ENABLED = os.environ.get("MCP_SCAN_CACHE", "1").lower() not in {"0", "false", "no"}
+SCAN_CACHE_PREFLIGHT = os.environ.get("MCP_SCAN_CACHE_PREFLIGHT", "1").lower() not in {"0", "false", "no"}
+SCAN_CACHE_MAX_BYTES = max(0, int(os.environ.get("MCP_SCAN_CACHE_MAX_BYTES", str(256 * 1024 * 1024))))
+SCAN_CACHE_ROOT = MCP_SCAN_STORAGE_ROOT / "cache"
+
+# Scan jobs persist in SQLite so they survive restarts. Finished jobs expire
+# after ``MCP_JOB_TTL_SECONDS``; only ``MCP_JOB_HOT_SET`` finished jobs stay
+# in memory (queued and running jobs always do).
+JOB_STORE_PATH = Path(os.environ.get("MCP_JOB_STORE_PATH", str(MCP_SCAN_STORAGE_ROOT / "jobs.sqlite3")))
+JOB_TTL_SECONDS = float(os.environ.get("MCP_JOB_TTL_SECONDS", str(7 * 24 * 3600)))
+JOB_HOT_SET_SIZE = max(0, int(os.environ.get("MCP_JOB_HOT_SET", "256")))
+JOB_SWEEP_INTERVAL_SECONDS = float(os.environ.get("MCP_JOB_SWEEP_INTERVAL_SECONDS", "600"))
+
+# Progress events kept per job for SSE replay (``Last-Event-ID``), and how
+# often an idle stream sends a keep-alive comment.
+JOB_EVENT_HISTORY = 1000
+SSE_KEEPALIVE_SECONDS = 15.0
+# Upper bound for ``GET /api/security/scans/{id}?wait=`` long-polls.
+JOB_LONG_POLL_MAX_SECONDS = 60.0
+
+# Shared-state mode lets several uvicorn workers on one node serve the API
+# together. Jobs are claimed from a queue in the job store, repositories and
+# OAuth callbacks are kept there too, so any worker can answer any request.
+# Claimed jobs whose worker stops heartbeating for ``MCP_SHARED_STALE_SECONDS``
+# are failed. ``MCP_SCAN_MAX_WORKERS`` then caps running jobs across all
+# workers rather than per process.
+SHARED_STATE = os.environ.get("MCP_SHARED_STATE", "0").lower() in {"1", "true", "yes"}
+SHARED_POLL_INTERVAL_SECONDS = float(os.environ.get("MCP_SHARED_POLL_INTERVAL_SECONDS", "0.5"))
+SHARED_STALE_SECONDS = float(os.environ.get("MCP_SHARED_STALE_SECONDS", "30"))
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
 OAUTH_CALLBACK_BASE_URL = os.environ.get("MCP_OAUTH_CALLBACK_BASE_URL", "http://localhost:8000").rstrip("/")
+# Cached OAuth tokens are refreshed this long before they expire, and are not
+# handed to new scans inside that window.
+OAUTH_REFRESH_MARGIN_SECONDS = float(os.environ.get("MCP_OAUTH_REFRESH_MARGIN_SECONDS", "120"))
+# A repository OAuth flow gives up if the user has not completed authorization
+# within this many seconds. Other scans of the server wait for the flow, so
+# it must not hold the server's OAuth lock indefinitely.
+OAUTH_AUTHORIZE_TIMEOUT_SECONDS = float(os.environ.get("MCP_OAUTH_AUTHORIZE_TIMEOUT_SECONDS", "600"))
+
+# API responses of at least ``MCP_RESPONSE_COMPRESSION_MIN_BYTES`` are sent
+# zstd- or gzip-compressed, whichever the client prefers; zstd needs the
+# ``zstd`` extra. SSE streams, 304s and range responses are left alone.
+RESPONSE_COMPRESSION = os.environ.get("MCP_RESPONSE_COMPRESSION", "1").lower() not in {"0", "false", "no"}
+RESPONSE_COMPRESSION_MIN_BYTES = max(0, int(os.environ.get("MCP_RESPONSE_COMPRESSION_MIN_BYTES", "1024")))
+
+# Scan artifacts (mcp-scan output) are compressed on disk once their job
+# ends: "zstd" (falls back to gzip without the extra), "gzip" or "none". Logs
+# stay uncompressed so ranged downloads (tailing a log) read by offset.
+ARTIFACT_COMPRESSION = os.environ.get("MCP_ARTIFACT_COMPRESSION", "zstd").lower()
+
+zstandard: ModuleType | None
+try:
+    zstandard = importlib.import_module("zstandard")
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+if ARTIFACT_COMPRESSION == "zstd" and zstandard is None:
+    ARTIFACT_COMPRESSION = "gzip"
+elif ARTIFACT_COMPRESSION not in {"zstd", "gzip"}:
+    ARTIFACT_COMPRESSION = "none"
+
+# Identical artifacts are stored once under ``blobs/`` by content hash and
+# hard-linked into each server dir. Every ``MCP_ARTIFACT_COMPACT_INTERVAL_SECONDS``
+# a compactor drops finished jobs' artifacts beyond the newest
+# ``MCP_ARTIFACT_KEEP_PER_SERVER`` per server, older than
+# ``MCP_ARTIFACT_MAX_AGE_SECONDS`` (defaults to the job TTL), and then oldest
+# first while the total exceeds ``MCP_ARTIFACT_MAX_BYTES``. 0 disables a limit.
+ARTIFACT_DEDUP = os.environ.get("MCP_ARTIFACT_DEDUP", "1").lower() not in {"0", "false", "no"}
+ARTIFACT_KEEP_PER_SERVER = max(0, int(os.environ.get("MCP_ARTIFACT_KEEP_PER_SERVER", "50")))
+ARTIFACT_MAX_AGE_SECONDS = float(os.environ.get("MCP_ARTIFACT_MAX_AGE_SECONDS", str(JOB_TTL_SECONDS)))
+ARTIFACT_MAX_BYTES = max(0, int(os.environ.get("MCP_ARTIFACT_MAX_BYTES", str(2 * 1024 * 1024 * 1024))))
+ARTIFACT_COMPACT_INTERVAL_SECONDS = float(os.environ.get("MCP_ARTIFACT_COMPACT_INTERVAL_SECONDS", "3600"))
+
+
+# ---------------------------------------------------------------------------
+# Response compression
+# ---------------------------------------------------------------------------
+
+
+_COMPRESSIBLE_CONTENT_TYPES = ("text/", "application/json", "application/javascript", "application/xml")
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    """Parse ``Accept-Encoding`` into ``{coding: q}``."""
+
+    accepted: Dict[str, float] = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def _negotiate_encoding(header: str, available: Iterable[str]) -> str | None:
+    """Best of ``available`` (in server preference order) the client accepts."""
+
+    accepted = _accepted_encodings(header)
+    best: str | None = None
+    best_quality = 0.0
+    for coding in available:
+        quality = accepted.get(coding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def _response_encodings() -> Tuple[str, ...]:
+    return ("zstd", "gzip") if zstandard is not None else ("gzip",)
+
+
+class _StreamCompressor:
+    """Incremental zstd or gzip encoder for one response body."""
+
+    def __init__(self, encoding: str) -> None:
+        self.encoding = encoding
+        if encoding == "zstd":
+            assert zstandard is not None
+            self._zstd = zstandard.ZstdCompressor(level=3).compressobj()
+        else:
+            self._gzip = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes, *, final: bool) -> bytes:
+        if self.encoding == "zstd":
+            assert zstandard is not None
+            flush_mode = zstandard.COMPRESSOBJ_FLUSH_FINISH if final else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            encoded: bytes = self._zstd.compress(data) + self._zstd.flush(flush_mode)
+            return encoded
+        return self._gzip.compress(data) + self._gzip.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """Negotiated zstd/gzip compression for API responses.
+
+    Bodies smaller than ``minimum_size`` and responses that must reach the
+    client untouched (SSE, 304, 206/``Content-Range``, anything already
+    carrying a ``Content-Encoding``) pass through. Streamed bodies are
+    flushed chunk by chunk so long responses still arrive incrementally.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = _negotiate_encoding(accept, _response_encodings()) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        compressor: _StreamCompressor | None = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                if self._compressible(message):
+                    start = message
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or start is None:
+                if start is not None:
+                    # Not a plain body (e.g. ``http.response.pathsend``).
+                    passthrough = True
+                    await send(start)
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = [(name, value) for name, value in start["headers"] if name != b"content-length"]
+                headers.append((b"vary", b"Accept-Encoding"))
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = _StreamCompressor(encoding)
+                headers.append((b"content-encoding", encoding.encode("ascii")))
+                # The encoded body is a different byte sequence, so a strong
+                # validator from the handler only holds weakly.
+                headers = [
+                    (name, b"W/" + value if name == b"etag" and value.startswith(b'"') else value)
+                    for name, value in headers
+                ]
+                body = compressor.compress(body, final=not more_body)
+                if not more_body:
+                    headers.append((b"content-length", str(len(body)).encode("ascii")))
+                await send({**start, "headers": headers})
+                await send({"type": "http.response.body", "body": body, "more_body": more_body})
+                return
+            body = compressor.compress(body, final=not more_body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _compressible(start: Message) -> bool:
+        status = start["status"]
+        if status < 200 or status in (204, 206, 304):
+            return False
+        content_type = ""
+        for name, value in start.get("headers", []):
+            if name in (b"content-encoding", b"content-range"):
+                return False
+            if name == b"content-type":
+                content_type = value.decode("latin-1").lower()
+        if content_type.startswith("text/event-stream"):
+            return False
+        return content_type.startswith(_COMPRESSIBLE_CONTENT_TYPES)
 
 
 # ---------------------------------------------------------------------------
@@ -76,7 +416,31 @@ OAUTH_CALLBACK_BASE_URL = os.environ.get("MCP_OAUTH_CALLBACK_BASE_URL", "http://
 # ---------------------------------------------------------------------------
 
 
-app = FastAPI(title="Backend API", version=get_version())
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    await asyncio.to_thread(jobs.lock_exclusive)
+    interrupted = await asyncio.to_thread(jobs.mark_interrupted)
+    if interrupted:
+        logger.warning("Marked %d scan job(s) interrupted by the previous shutdown", interrupted)
+    # Other workers, or a script sharing the storage root, may be mid-scan;
+    # only dirs past the grace period go.
+    swept = await asyncio.to_thread(artifact_store.sweep_temp_dirs, older_than=ArtifactStore.TMP_GRACE_SECONDS)
+    if swept:
+        logger.info("Removed %d temporary scan dir(s) left by an earlier run", swept)
+    http_pool.open()
+    sweeper = asyncio.create_task(_sweep_expired_jobs())
+    compactor = asyncio.create_task(_compact_artifacts())
+    if isinstance(scan_scheduler, SharedScanScheduler):
+        scan_scheduler.start()
+    yield
+    sweeper.cancel()
+    compactor.cancel()
+    await oauth_tokens.close()
+    await mcp_scan_worker_pool.close()
+    await http_pool.close()
+
+
+app = FastAPI(title="Backend API", version=get_version(), lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -84,7 +448,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "Content-Range", "Content-Disposition"],
 )
+if RESPONSE_COMPRESSION:
+    app.add_middleware(CompressionMiddleware, minimum_size=RESPONSE_COMPRESSION_MIN_BYTES)
 
 
 # ---------------------------------------------------------------------------
@@ -104,6 +471,10 @@ class ScanRequest(BaseModel):
     include: ScanInclude | None = None
     timeout_seconds: int | None = Field(default=None, ge=5, le=600)
     oauth_scopes: str | None = Field(default=None, alias="oauthScopes")
+    incremental: bool = False
+    # Accept the result of an identical scan finished at most this many
+    # seconds ago instead of rescanning.
+    max_age_seconds: float | None = Field(default=None, ge=0, alias="maxAge")
 
 
 class ScanJobCreated(BaseModel):
@@ -119,6 +490,8 @@ class ScanJobStatus(BaseModel):
     created_at: datetime = Field(alias="createdAt")
     started_at: datetime | None = Field(default=None, alias="startedAt")
     finished_at: datetime | None = Field(default=None, alias="finishedAt")
+    queue_position: int | None = Field(default=None, alias="queuePosition")
+    estimated_start_at: datetime | None = Field(default=None, alias="estimatedStartAt")
     result: Dict[str, Any] | None = None
     error: str | None = None
 
@@ -146,24 +519,1011 @@ class RepositoryResponse(BaseModel):
     lastScanJobId: str | None = None
 
 
+class RepositorySummary(BaseModel):
+    """``RepositoryResponse`` without check bodies, for leaderboards."""
+
+    model_config = ConfigDict(populate_by_name=True)
+    id: str
+    name: str
+    serverUrl: str
+    status: RepositoryStatus
+    score: float | None = None
+    totalChecks: int | None = None
+    passedChecks: int | None = None
+    criticalFailures: int | None = None
+    lastError: str | None = None
+    createdAt: datetime
+    updatedAt: datetime
+    lastScanJobId: str | None = None
+
+
+class JobEventLog:
+    """Ordered, replayable progress events of one job.
+
+    Published on the event loop; validator threads go through
+    ``publish_threadsafe``. A ``result`` event closes the log.
+    """
+
+    def __init__(self) -> None:
+        self.events: List[Tuple[int, str, Dict[str, Any]]] = []
+        self.closed = False
+        self._next_id = 1
+        self._changed = asyncio.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def publish(self, event: str, data: Dict[str, Any]) -> None:
+        if self.closed:
+            return
+        self._loop = asyncio.get_running_loop()
+        self.events.append((self._next_id, event, data))
+        self._next_id += 1
+        if len(self.events) > JOB_EVENT_HISTORY:
+            del self.events[0]
+        if event == "result":
+            self.closed = True
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def publish_threadsafe(self, event: str, data: Dict[str, Any]) -> None:
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self.publish, event, data)
+
+    def since(self, last_id: int) -> List[Tuple[int, str, Dict[str, Any]]]:
+        return [entry for entry in self.events if entry[0] > last_id]
+
+    async def wait(self, last_id: int, timeout: float) -> bool:
+        """Wait for an event after ``last_id``; False if ``timeout`` passed first."""
+
+        if self.closed or self.since(last_id):
+            return True
+        try:
+            async with asyncio.timeout(timeout):
+                await self._changed.wait()
+        except TimeoutError:
+            return False
+        return True
+
+
 @dataclass
 class ScanJob:
     job_id: str
     request: ScanRequest
     status: str = "pending"
+    priority: int = SCAN_PRIORITY_BULK
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     started_at: datetime | None = None
     finished_at: datetime | None = None
     result: Dict[str, Any] | None = None
     error: str | None = None
     artifacts: Dict[str, str] = field(default_factory=dict)
+    # ``result`` encoded once when the job finishes; see ``_set_job_result``.
+    result_json: bytes | None = field(default=None, repr=False)
+    # Identifies equivalent requests; see ``_scan_fingerprint``.
+    fingerprint: str = ""
+    # Bumped by ``_touch_job`` on every state change; the status ETag.
+    version: int = 0
+    changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    # Set on cancellation; polled by work running outside the event loop.
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    task: asyncio.Task[None] | None = field(default=None, repr=False)
+    events: JobEventLog = field(default_factory=JobEventLog, repr=False)
+
+    def __post_init__(self) -> None:
+        if not self.fingerprint:
+            self.fingerprint = _scan_fingerprint(self.request)
+
+
+TERMINAL_JOB_STATUSES = frozenset({"succeeded", "error", "timed_out", "cancelled"})
+
+
+def _dump_json_bytes(value: Any) -> bytes:
+    """Compact UTF-8 JSON, via orjson when it is installed."""
+
+    if orjson is not None:
+        encoded: bytes = orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+        return encoded
+    return json.dumps(value, default=str, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+async def _set_job_result(job: ScanJob, result: Dict[str, Any] | None) -> None:
+    """Store a final result on ``job`` together with its encoded bytes.
+
+    Results never change once a job is terminal, so status responses and the
+    job store reuse ``result_json`` instead of re-encoding the nested report.
+    """
+
+    job.result = result
+    job.result_json = None if result is None else await asyncio.to_thread(_dump_json_bytes, result)
+
+
+def _splice_json_field(document: bytes, name: str, raw: bytes) -> bytes:
+    """Append ``name`` with the pre-encoded JSON ``raw`` to a serialised object."""
+
+    if document == b"{}":
+        return b'{"%s":%s}' % (name.encode("utf-8"), raw)
+    return b'%s,"%s":%s}' % (document[:-1], name.encode("utf-8"), raw)
+
+
+def _scan_fingerprint(request: ScanRequest) -> str:
+    """Hash of everything that determines a scan's outcome.
+
+    Timeouts and ``maxAge`` are left out: they change how long a caller is
+    willing to wait, not what the scan finds.
+    """
 
+    include = request.include or ScanInclude()
+    material = {
+        "serverUrl": request.server_url,
+        "headers": sorted((key.lower(), value) for key, value in _normalize_headers(request.headers).items()),
+        "protocolVersion": request.protocol_version,
+        "include": include.model_dump(),
+        "oauthScopes": request.oauth_scopes,
+        "incremental": request.incremental,
+    }
+    return sha256(json.dumps(material, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class JobSnapshot:
+    """Immutable view of a ScanJob at one ``version``.
+
+    ``_touch_job`` publishes a new one on every state change, so status
+    readers never take ``jobs_lock``. ``artifacts`` and the top level of
+    ``result`` are copied, so later writes to the job do not show through;
+    the nested report is shared and must be treated as read-only.
+    """
+
+    job_id: str
+    version: int
+    status: str
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+    result: Dict[str, Any] | None
+    result_json: bytes | None
+    error: str | None
+    artifacts: Dict[str, str]
+
+    @classmethod
+    def of(cls, job: ScanJob) -> "JobSnapshot":
+        values = {item.name: getattr(job, item.name) for item in fields(cls)}
+        values["artifacts"] = dict(job.artifacts)
+        values["result"] = dict(job.result) if job.result is not None else None
+        return cls(**values)
+
+
+def _touch_job(job: ScanJob) -> None:
+    """Record a state change of ``job``, publish its snapshot and wake long-polling readers."""
+
+    job.version += 1
+    jobs.publish(job)
+    changed, job.changed = job.changed, asyncio.Event()
+    changed.set()
+
+
+def _to_timestamp(value: datetime | None) -> float | None:
+    return value.timestamp() if value is not None else None
+
+
+def _from_timestamp(value: float | None) -> datetime | None:
+    return datetime.fromtimestamp(value, timezone.utc) if value is not None else None
+
+
+_JOB_COLUMNS = (
+    "job_id", "status", "server_url", "priority", "created_at", "started_at",
+    "finished_at", "request", "error", "artifacts", "fingerprint", "version", "result",
+)
+_JOB_SELECT = ", ".join(_JOB_COLUMNS)
+# Shared-mode bookkeeping; never overwritten by ``JobStore.save``.
+_JOB_QUEUE_COLUMNS = (
+    ("owner", "TEXT"),
+    ("heartbeat_at", "REAL"),
+    ("cancel_requested", "INTEGER NOT NULL DEFAULT 0"),
+)
+
+
+def _open_store_db(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+    os.chmod(path, 0o600)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.execute("PRAGMA busy_timeout=5000")
+    return db
+
+
+class JobStore:
+    """SQLite-backed registry of scan jobs with a small in-memory hot set.
+
+    Behaves like the dict it replaced (``jobs[id] = job``, ``get``, ``pop``)
+    so callers keep working. Queued and running jobs are always held in
+    memory, because the executing task mutates them in place; finished jobs
+    are kept LRU up to ``hot_size`` and otherwise reloaded from disk.
+    Results are stored zlib-compressed. Callers persist state transitions
+    with ``save`` while holding ``jobs_lock``.
+
+    Every in-memory job also has a published ``JobSnapshot``. The snapshot
+    map is copied on write and swapped in whole, so ``snapshot`` reads it
+    without any lock.
+
+    With ``shared`` set, several processes use the same file as a job queue:
+    only jobs this process claimed are held in memory, everything else is
+    read from disk so status reflects whichever worker runs the job. Without
+    it, one process owns the file; see ``lock_exclusive``.
+    """
+
+    def __init__(self, path: Path, *, hot_size: int, ttl_seconds: float, shared: bool = False) -> None:
+        self.path = path
+        self.hot_size = 0 if shared else hot_size
+        self.ttl_seconds = ttl_seconds
+        self.shared = shared
+        self._hot: "OrderedDict[str, ScanJob]" = OrderedDict()
+        # Terminal jobs in ``_hot``, least recently used first.
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._owner_lock: TextIO | None = None
+        self._snapshots: Dict[str, JobSnapshot] = {}
+        # Serialises snapshot swaps only; never held across I/O.
+        self._publish_lock = threading.Lock()
+
+        self._db = _open_store_db(path)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS scan_jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                server_url TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                request TEXT NOT NULL,
+                error TEXT,
+                artifacts TEXT NOT NULL,
+                fingerprint TEXT NOT NULL DEFAULT '',
+                version INTEGER NOT NULL DEFAULT 0,
+                result BLOB
+            );
+            CREATE INDEX IF NOT EXISTS scan_jobs_status ON scan_jobs (status);
+            CREATE INDEX IF NOT EXISTS scan_jobs_server_url ON scan_jobs (server_url, created_at);
+            CREATE INDEX IF NOT EXISTS scan_jobs_finished_at ON scan_jobs (finished_at);
+            """
+        )
+        existing = {row[1] for row in self._db.execute("PRAGMA table_info(scan_jobs)")}
+        added = (
+            ("fingerprint", "TEXT NOT NULL DEFAULT ''"),
+            ("version", "INTEGER NOT NULL DEFAULT 0"),
+            *_JOB_QUEUE_COLUMNS,
+        )
+        for name, declaration in added:
+            if name not in existing:
+                self._db.execute(f"ALTER TABLE scan_jobs ADD COLUMN {name} {declaration}")
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS scan_jobs_fingerprint ON scan_jobs (fingerprint, finished_at)"
+        )
+
+    # -- dict-compatible surface ------------------------------------------------
+
+    def __setitem__(self, job_id: str, job: ScanJob) -> None:
+        with self._lock:
+            if not self.shared:
+                self._remember(job_id, job)
+            self._write(job)
+
+    def __contains__(self, job_id: object) -> bool:
+        if not isinstance(job_id, str):
+            return False
+        with self._lock:
+            if job_id in self._hot:
+                return True
+            row = self._db.execute("SELECT 1 FROM scan_jobs WHERE job_id = ?", (job_id,)).fetchone()
+            return row is not None
+
+    def get(self, job_id: str, default: ScanJob | None = None) -> ScanJob | None:
+        with self._lock:
+            job = self._hot.get(job_id)
+            if job is not None:
+                self._hot.move_to_end(job_id)
+                if job_id in self._finished:
+                    self._finished.move_to_end(job_id)
+                return job
+            row = self._db.execute(f"SELECT {_JOB_SELECT} FROM scan_jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return default
+            job = self._job_from_row(row, with_result=True)
+            if not self.shared:
+                self._remember(job_id, job)
+            return job
+
+    def pop(self, job_id: str, default: ScanJob | None = None) -> ScanJob | None:
+        job = self.get(job_id)
+        with self._lock:
+            self._hot.pop(job_id, None)
+            self._finished.pop(job_id, None)
+            self._unpublish([job_id])
+            self._db.execute("DELETE FROM scan_jobs WHERE job_id = ?", (job_id,))
+        return job if job is not None else default
+
+    # -- snapshots ---------------------------------------------------------------
+
+    def live(self, job_id: str) -> ScanJob | None:
+        """The in-memory job this process mutates, if any."""
+
+        return self._hot.get(job_id)
+
+    def snapshot(self, job_id: str) -> JobSnapshot | None:
+        """Latest published snapshot of an in-memory job; lock-free."""
+
+        return self._snapshots.get(job_id)
+
+    def load_snapshot(self, job_id: str) -> JobSnapshot | None:
+        """Like ``snapshot`` but falls back to the database."""
+
+        snapshot = self._snapshots.get(job_id)
+        if snapshot is not None:
+            return snapshot
+        job = self.get(job_id)
+        return JobSnapshot.of(job) if job is not None else None
+
+    def publish(self, job: ScanJob) -> None:
+        if self._hot.get(job.job_id) is not job:
+            return
+        with self._publish_lock:
+            snapshots = dict(self._snapshots)
+            snapshots[job.job_id] = JobSnapshot.of(job)
+            self._snapshots = snapshots
+
+    def _unpublish(self, job_ids: Iterable[str]) -> None:
+        with self._publish_lock:
+            snapshots = dict(self._snapshots)
+            for job_id in job_ids:
+                snapshots.pop(job_id, None)
+            self._snapshots = snapshots
+
+    # -- persistence -------------------------------------------------------------
+
+    def save(self, job: ScanJob) -> None:
+        """Persist ``job``; a no-op once it was popped or evicted."""
+
+        with self._lock:
+            if self._hot.get(job.job_id) is not job:
+                return
+            self._remember(job.job_id, job)
+            self._write(job)
+
+    def query(
+        self,
+        *,
+        status: str | None = None,
+        server_url: str | None = None,
+        limit: int = 50,
+    ) -> List[JobSnapshot]:
+        """Most recent jobs first, without their (possibly large) results."""
+
+        clauses: List[str] = []
+        params: List[Any] = []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if server_url is not None:
+            clauses.append("server_url = ?")
+            params.append(server_url)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        columns = ", ".join(_JOB_COLUMNS[:-1])
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {columns}, NULL AS result FROM scan_jobs {where} ORDER BY created_at DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [
+            self._snapshots.get(row[0]) or JobSnapshot.of(self._job_from_row(row, with_result=False))
+            for row in rows
+        ]
+
+    def latest_result(self, fingerprint: str, finished_after: float) -> ScanJob | None:
+        """The newest successful job for ``fingerprint`` finished after the cutoff."""
+
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {_JOB_SELECT} FROM scan_jobs "
+                "WHERE fingerprint = ? AND status = 'succeeded' AND finished_at >= ? "
+                "ORDER BY finished_at DESC LIMIT 1",
+                (fingerprint, finished_after),
+            ).fetchone()
+            if row is None:
+                return None
+            return self._hot.get(row[0]) or self._job_from_row(row, with_result=True)
+
+    def lock_exclusive(self) -> None:
+        """Take sole ownership of the store file; required outside shared mode.
+
+        A non-shared process treats every queued or running row as its own,
+        so a second one on the same file would fail the first one's jobs at
+        startup. The lock is released when the process exits.
+        """
+
+        if self.shared or self._owner_lock is not None:
+            return
+        handle = self.path.with_name(f"{self.path.name}.lock").open("a", encoding="utf-8")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            handle.close()
+            raise RuntimeError(
+                f"Job store {self.path} is in use by another backend process; "
+                "set MCP_SHARED_STATE=1 to run several workers on it"
+            ) from None
+        self._owner_lock = handle
+
+    def mark_interrupted(self) -> int:
+        """Fail jobs a previous process left queued or running.
+
+        In shared mode other workers may still be running theirs, so only
+        claimed jobs whose owner stopped heartbeating are failed. Otherwise
+        the caller holds ``lock_exclusive``, so no other process owns any.
+        """
+
+        if self.shared:
+            return len(self.fail_stale(time.time() - SHARED_STALE_SECONDS))
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE scan_jobs SET status = 'error', finished_at = ?, error = ?, version = version + 1 "
+                "WHERE status IN ('pending', 'running') AND job_id NOT IN (%s)"
+                % ",".join("?" * len(self._hot)),
+                (time.time(), "Interrupted by a backend restart", *self._hot),
+            )
+            return cursor.rowcount
+
+    def active_ids(self) -> set[str]:
+        """Ids of every queued or running job, in any worker."""
+
+        with self._lock:
+            rows = self._db.execute("SELECT job_id FROM scan_jobs WHERE status IN ('pending', 'running')").fetchall()
+        return {row[0] for row in rows}
+
+    def finished_times(self, job_ids: Iterable[str]) -> Dict[str, float]:
+        """``finished_at`` of each listed job that is finished and still stored."""
+
+        job_ids = list(job_ids)
+        finished: Dict[str, float] = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit.
+            for start in range(0, len(job_ids), 500):
+                batch = job_ids[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT job_id, finished_at FROM scan_jobs WHERE finished_at IS NOT NULL "
+                    f"AND job_id IN ({', '.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                finished.update((job_id, float(finished_at)) for job_id, finished_at in rows)
+        return finished
+
+    def evict_expired(self) -> int:
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM scan_jobs WHERE finished_at IS NOT NULL AND finished_at < ? RETURNING job_id",
+                (cutoff,),
+            )
+            expired = [row[0] for row in cursor.fetchall()]
+            for job_id in expired:
+                self._hot.pop(job_id, None)
+                self._finished.pop(job_id, None)
+            self._unpublish(expired)
+            return len(expired)
+
+    # -- shared queue --------------------------------------------------------------
+
+    def claim_next(self, owner: str, max_running: int) -> ScanJob | None:
+        """Atomically take the highest-priority unclaimed job for ``owner``.
+
+        Nothing is claimed while ``max_running`` jobs are already claimed
+        and unfinished across every worker sharing the file.
+        """
+
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    f"""
+                    UPDATE scan_jobs SET owner = ?, heartbeat_at = ?
+                    WHERE job_id = (
+                        SELECT job_id FROM scan_jobs
+                        WHERE status = 'pending' AND owner IS NULL AND cancel_requested = 0
+                        ORDER BY priority, created_at
+                        LIMIT 1
+                    ) AND owner IS NULL AND (
+                        SELECT COUNT(*) FROM scan_jobs
+                        WHERE status IN ('pending', 'running') AND owner IS NOT NULL
+                    ) < ?
+                    RETURNING {_JOB_SELECT}
+                    """,
+                    (owner, time.time(), max_running),
+                ).fetchone()
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            if row is None:
+                return None
+            job = self._job_from_row(row, with_result=True)
+            self._hot[job.job_id] = job
+            self.publish(job)
+            return job
+
+    def queue_position(self, job_id: str) -> int | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT priority, created_at FROM scan_jobs WHERE job_id = ? AND status = 'pending' AND owner IS NULL",
+                (job_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            (ahead,) = self._db.execute(
+                "SELECT COUNT(*) FROM scan_jobs WHERE status = 'pending' AND owner IS NULL "
+                "AND (priority < ? OR (priority = ? AND created_at < ?))",
+                (row[0], row[0], row[1]),
+            ).fetchone()
+            return int(ahead) + 1
+
+    def request_cancel(self, job_id: str) -> bool:
+        """Flag ``job_id`` for cancellation; returns True if it was still unclaimed."""
+
+        with self._lock:
+            self._db.execute("UPDATE scan_jobs SET cancel_requested = 1 WHERE job_id = ?", (job_id,))
+            cursor = self._db.execute(
+                "UPDATE scan_jobs SET status = 'cancelled', finished_at = ?, error = 'Job cancelled', "
+                "version = version + 1 "
+                "WHERE job_id = ? AND status = 'pending' AND owner IS NULL",
+                (time.time(), job_id),
+            )
+            return cursor.rowcount > 0
+
+    def heartbeat(self, owner: str, job_ids: Iterable[str]) -> None:
+        ids = list(job_ids)
+        if not ids:
+            return
+        with self._lock:
+            self._db.execute(
+                f"UPDATE scan_jobs SET heartbeat_at = ? WHERE owner = ? AND job_id IN ({','.join('?' * len(ids))})",
+                (time.time(), owner, *ids),
+            )
+
+    def cancel_requested(self, job_ids: Iterable[str]) -> List[str]:
+        ids = list(job_ids)
+        if not ids:
+            return []
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT job_id FROM scan_jobs WHERE cancel_requested = 1 AND job_id IN ({','.join('?' * len(ids))})",
+                ids,
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def finished(self, job_ids: Iterable[str]) -> List[str]:
+        """Which of ``job_ids`` are terminal or gone."""
+
+        ids = list(job_ids)
+        if not ids:
+            return []
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT job_id, status FROM scan_jobs WHERE job_id IN ({','.join('?' * len(ids))})",
+                ids,
+            ).fetchall()
+        active = {job_id for job_id, status in rows if status not in TERMINAL_JOB_STATUSES}
+        return [job_id for job_id in ids if job_id not in active]
+
+    def fail_stale(self, heartbeat_before: float) -> List[str]:
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE scan_jobs SET status = 'error', finished_at = ?, error = ?, version = version + 1 "
+                "WHERE status IN ('pending', 'running') AND owner IS NOT NULL AND heartbeat_at < ? "
+                "RETURNING job_id",
+                (time.time(), "Scan worker stopped responding", heartbeat_before),
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    # -- internals ---------------------------------------------------------------
+
+    def _remember(self, job_id: str, job: ScanJob) -> None:
+        self._hot[job_id] = job
+        self._hot.move_to_end(job_id)
+        self.publish(job)
+        if job.status not in TERMINAL_JOB_STATUSES:
+            self._finished.pop(job_id, None)
+            return
+
+        self._finished[job_id] = None
+        self._finished.move_to_end(job_id)
+        evicted: List[str] = []
+        while len(self._finished) > self.hot_size:
+            key, _ = self._finished.popitem(last=False)
+            self._hot.pop(key, None)
+            evicted.append(key)
+        if evicted:
+            self._unpublish(evicted)
+
+    def _write(self, job: ScanJob) -> None:
+        result = None
+        if job.result is not None:
+            result = zlib.compress(job.result_json or _dump_json_bytes(job.result), 6)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in _JOB_COLUMNS[1:])
+        self._db.execute(
+            f"INSERT INTO scan_jobs ({_JOB_SELECT}) VALUES ({', '.join('?' * len(_JOB_COLUMNS))}) "
+            f"ON CONFLICT (job_id) DO UPDATE SET {updates}",
+            (
+                job.job_id,
+                job.status,
+                job.request.server_url,
+                job.priority,
+                _to_timestamp(job.created_at),
+                _to_timestamp(job.started_at),
+                _to_timestamp(job.finished_at),
+                job.request.model_dump_json(by_alias=True),
+                job.error,
+                json.dumps(job.artifacts),
+                job.fingerprint,
+                job.version,
+                result,
+            ),
+        )
+
+    @staticmethod
+    def _job_from_row(row: Tuple[Any, ...], *, with_result: bool) -> ScanJob:
+        (
+            job_id, status, _, priority, created_at, started_at, finished_at,
+            request, error, artifacts, fingerprint, version, result,
+        ) = row
+        result_json = zlib.decompress(result) if with_result and result is not None else None
+        return ScanJob(
+            job_id=job_id,
+            request=ScanRequest.model_validate_json(request),
+            status=status,
+            priority=priority,
+            created_at=datetime.fromtimestamp(created_at, timezone.utc),
+            started_at=_from_timestamp(started_at),
+            finished_at=_from_timestamp(finished_at),
+            result=json.loads(result_json) if result_json is not None else None,
+            result_json=result_json,
+            error=error,
+            artifacts=json.loads(artifacts),
+            fingerprint=fingerprint,
+            version=version,
+        )
 
-jobs: Dict[str, ScanJob] = {}
+
+jobs = JobStore(JOB_STORE_PATH, hot_size=JOB_HOT_SET_SIZE, ttl_seconds=JOB_TTL_SECONDS, shared=SHARED_STATE)
 jobs_lock = asyncio.Lock()
+
+
+async def _sweep_expired_jobs() -> None:
+    while True:
+        try:
+            expired = await asyncio.to_thread(jobs.evict_expired)
+            if expired:
+                logger.info("Evicted %d expired scan job(s)", expired)
+        except sqlite3.Error:
+            logger.exception("Scan job sweep failed")
+        await asyncio.sleep(JOB_SWEEP_INTERVAL_SECONDS)
+
+
 active_tasks: set[asyncio.Task[Any]] = set()
 
 
+# ---------------------------------------------------------------------------
+# Outbound HTTP pool
+# ---------------------------------------------------------------------------
+
+
+class _HostSlotStream(httpx.AsyncByteStream):
+    """Response body that gives back its host slot once closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Any) -> None:
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+@dataclass
+class _HostSlots:
+    semaphore: asyncio.Semaphore
+    active: int = 0
+    waiting: int = 0
+    requests: int = 0
+
+
+class _HostLimitedTransport(httpx.AsyncBaseTransport):
+    """Wraps the connection pool with a concurrency cap per ``scheme://host:port``.
+
+    A slot is held from sending the request until the response body is
+    closed, so streamed responses count for as long as they are open. A
+    host's entry is dropped once it has nothing active or waiting, so the
+    table only holds hosts that are in use.
+    """
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport, per_host: int) -> None:
+        self.transport = transport
+        self.per_host = per_host
+        self.requests = 0
+        self._hosts: Dict[str, _HostSlots] = {}
+
+    def _drop_if_idle(self, host: str, slots: _HostSlots) -> None:
+        if slots.active == 0 and slots.waiting == 0 and self._hosts.get(host) is slots:
+            del self._hosts[host]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = f"{request.url.scheme}://{request.url.netloc.decode('ascii')}"
+        slots = self._hosts.get(host)
+        if slots is None:
+            slots = self._hosts[host] = _HostSlots(asyncio.Semaphore(self.per_host))
+
+        slots.waiting += 1
+        try:
+            await slots.semaphore.acquire()
+        except BaseException:
+            slots.waiting -= 1
+            self._drop_if_idle(host, slots)
+            raise
+        slots.waiting -= 1
+        slots.active += 1
+        slots.requests += 1
+        self.requests += 1
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                slots.active -= 1
+                slots.semaphore.release()
+                self._drop_if_idle(host, slots)
+
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        stream = response.stream
+        if not isinstance(stream, httpx.AsyncByteStream):
+            release()
+            raise TypeError("Outbound transport returned a synchronous response stream")
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_HostSlotStream(stream, release),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        # httpcore does not expose its pool publicly; report no connection
+        # counts rather than fail if a release moves it.
+        connections = getattr(getattr(self.transport, "_pool", None), "connections", None)
+        connection_stats: Dict[str, Any] | None = None
+        if connections is not None:
+            connections = list(connections)
+            connection_stats = {
+                "open": len(connections),
+                "idle": sum(1 for connection in connections if connection.is_idle()),
+            }
+        return {
+            "connections": connection_stats,
+            "requests": self.requests,
+            "hosts": {
+                host: {"active": slots.active, "waiting": slots.waiting, "requests": slots.requests}
+                for host, slots in self._hosts.items()
+            },
+        }
+
+
+class OutboundHttpPool:
+    """Application-lifetime ``httpx.AsyncClient`` for all outbound HTTP.
+
+    The lifespan opens and closes it; ``client`` also opens it on demand so
+    code running outside the app (scripts) still works. HTTP/2 is used when
+    ``h2`` is installed.
+    """
+
+    def __init__(self) -> None:
+        self._client: httpx.AsyncClient | None = None
+        self._transport: _HostLimitedTransport | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self.open()
+        assert self._client is not None
+        return self._client
+
+    def open(self) -> None:
+        self._transport = _HostLimitedTransport(
+            httpx.AsyncHTTPTransport(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+                ),
+            ),
+            HTTP_MAX_PER_HOST,
+        )
+        self._client = httpx.AsyncClient(transport=self._transport, timeout=httpx.Timeout(30.0))
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = None
+        self._transport = None
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {
+            "http2": HTTP2_AVAILABLE,
+            "limits": {
+                "maxConnections": HTTP_MAX_CONNECTIONS,
+                "maxKeepaliveConnections": HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                "maxPerHost": HTTP_MAX_PER_HOST,
+                "keepaliveExpirySeconds": HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            },
+        }
+        if self._transport is None or self._client is None or self._client.is_closed:
+            stats.update({"open": False, "connections": {"open": 0, "idle": 0}, "requests": 0, "hosts": {}})
+            return stats
+        stats["open"] = True
+        stats.update(self._transport.stats())
+        return stats
+
+
+http_pool = OutboundHttpPool()
+
+
+# ---------------------------------------------------------------------------
+# OAuth token cache
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class CachedOAuthToken:
+    access_token: str
+    # Epoch seconds; None when the provider did not say.
+    expires_at: float | None
+    # When the background refresh starts; the token is not handed out after.
+    refresh_at: float | None
+    # Provider that obtained the token; holds the refresh token and client
+    # registration needed to renew it.
+    auth: FastMCPOAuth = field(repr=False)
+    refresh_task: asyncio.Task[None] | None = field(default=None, repr=False)
+
+
+class OAuthTokenCache:
+    """Process-wide OAuth access tokens keyed by ``(server URL, scopes)``.
+
+    This is the first tier; FastMCP's per-server token files are the second.
+    Callers hold ``lock(server_url)`` while they look up or obtain a token,
+    so concurrent scans of one server share a single OAuth flow. Tokens that
+    carry an expiry and a refresh token are renewed in the background
+    ``refresh_margin`` seconds (at most half their lifetime) before they
+    expire, and are not handed out inside that window.
+    """
+
+    def __init__(self, refresh_margin: float) -> None:
+        self.refresh_margin = refresh_margin
+        self._entries: Dict[Tuple[str, str], CachedOAuthToken] = {}
+        # Per-server locks with their holder/waiter counts; dropped once unused.
+        self._locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+
+    @asynccontextmanager
+    async def lock(self, server_url: str) -> AsyncIterator[None]:
+        lock, users = self._locks.get(server_url) or (asyncio.Lock(), 0)
+        self._locks[server_url] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._locks[server_url]
+            if users > 1:
+                self._locks[server_url] = (lock, users - 1)
+            else:
+                del self._locks[server_url]
+
+    def get(self, server_url: str, scopes: str | None) -> str | None:
+        entry = self._entries.get((server_url, scopes or ""))
+        if entry is None or not self._usable(entry):
+            return None
+        return entry.access_token
+
+    def put(self, server_url: str, scopes: str | None, auth: FastMCPOAuth) -> str | None:
+        """Cache the token ``auth`` currently holds; returns it if usable."""
+
+        key = (server_url, scopes or "")
+        self._drop(key)
+        tokens = auth.context.current_tokens
+        if tokens is None or not tokens.access_token:
+            return None
+        if auth.context.token_expiry_time is None:
+            auth.context.update_token_expiry(tokens)
+        expires_at = auth.context.token_expiry_time
+        refresh_at = None
+        if expires_at is not None:
+            refresh_at = expires_at - min(self.refresh_margin, max(0.0, expires_at - time.time()) / 2)
+        entry = CachedOAuthToken(tokens.access_token, expires_at, refresh_at, auth)
+        if not self._usable(entry):
+            return None
+        self._entries[key] = entry
+        if refresh_at is not None and refresh_at > time.time() and auth.context.can_refresh_token():
+            entry.refresh_task = asyncio.create_task(self._refresh_before_expiry(key, entry))
+        return entry.access_token
+
+    async def close(self) -> None:
+        for key in list(self._entries):
+            self._drop(key)
+
+    def _usable(self, entry: CachedOAuthToken) -> bool:
+        now = time.time()
+        if entry.expires_at is not None and now >= entry.expires_at:
+            return False
+        return entry.refresh_at is None or now < entry.refresh_at
+
+    def _drop(self, key: Tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        task = entry.refresh_task
+        if task is not None and task is not asyncio.current_task() and not task.done():
+            task.cancel()
+
+    async def _refresh_before_expiry(self, key: Tuple[str, str], entry: CachedOAuthToken) -> None:
+        assert entry.refresh_at is not None
+        await asyncio.sleep(max(0.0, entry.refresh_at - time.time()))
+        server_url, scopes = key
+        async with self.lock(server_url):
+            if self._entries.get(key) is not entry:
+                return
+            auth = entry.auth
+            try:
+                # Writes the new token through to the FastMCP file cache too.
+                request = await auth._refresh_token()
+                request.extensions["timeout"] = httpx.Timeout(30.0).as_dict()
+                response = await http_pool.client.send(request)
+                refreshed = await auth._handle_refresh_response(response)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("OAuth token refresh failed for %s: %s", server_url, exc)
+                refreshed = False
+            if not refreshed:
+                self._drop(key)
+                return
+            logger.info("Refreshed OAuth token for %s", server_url)
+            self.put(server_url, scopes, auth)
+
+
+oauth_tokens = OAuthTokenCache(OAUTH_REFRESH_MARGIN_SECONDS)
+
+
+async def _load_stored_oauth_tokens(auth: FastMCPOAuth) -> None:
+    """Load FastMCP's stored token and client info into ``auth``.
+
+    mcp's ``_initialize`` leaves ``token_expiry_time`` unset, which makes a
+    token read from disk look valid forever; it is set from ``expires_in``.
+    """
+
+    await auth._initialize()
+    tokens = auth.context.current_tokens
+    if tokens is not None and auth.context.token_expiry_time is None:
+        auth.context.update_token_expiry(tokens)
+
+
 # ---------------------------------------------------------------------------
 # Repository storage
 # ---------------------------------------------------------------------------
@@ -205,9 +1565,264 @@ class RepositoryRecord:
     artifacts: Dict[str, str] | None = None
     auth_state: RepositoryAuthState | None = None
     last_scan_job_id: str | None = None
+    # Bumped by ``_update_repo``; the repository's ETag.
+    version: int = 0
+
+
+@dataclass(frozen=True)
+class RepositorySnapshot:
+    """Immutable view of a RepositoryRecord at one ``version``, without auth state."""
+
+    id: str
+    name: str
+    server_url: str
+    scopes: str | None
+    status: RepositoryStatus
+    created_at: datetime
+    updated_at: datetime
+    authorize_url: str | None = None
+    last_error: str | None = None
+    security_lint: Dict[str, Any] | None = None
+    providers: Dict[str, Any] | None = None
+    artifacts: Dict[str, str] | None = None
+    last_scan_job_id: str | None = None
+    version: int = 0
+
+    @classmethod
+    def of(cls, repo: RepositoryRecord) -> "RepositorySnapshot":
+        return cls(**{item.name: getattr(repo, item.name) for item in fields(cls)})
+
+
+_REPOSITORY_DATETIME_FIELDS = ("created_at", "updated_at")
+
+
+def _repository_order(repo: RepositorySnapshot) -> Tuple[float, str]:
+    return repo.created_at.timestamp(), repo.id
+
+
+def _repository_score(security_lint: Dict[str, Any] | None) -> float | None:
+    score = (security_lint or {}).get("score")
+    return float(score) if isinstance(score, (int, float)) else None
+
+
+class RepositoryStore:
+    """Registry of onboarded repositories.
+
+    Records whose onboarding flow runs in this process are held in memory
+    (they carry the live ``auth_state``). In shared-state mode every change
+    is also written to the job store's SQLite file, so other workers can
+    serve reads and relay OAuth callbacks to the owning worker.
+
+    Writers ``publish`` a ``RepositorySnapshot`` after every change. The
+    snapshot map is copied on write and swapped in whole, so readers use
+    ``snapshot``/``page`` without a lock (in shared-state mode those
+    read the database instead). ``version`` grows with every published
+    change; listings use it as an ETag.
+    """
+
+    def __init__(self, path: Path | None) -> None:
+        self._local: Dict[str, RepositoryRecord] = {}
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, RepositorySnapshot] = {}
+        self._publish_lock = threading.Lock()
+        self._version = 0
+        self._db: sqlite3.Connection | None = None
+        if path is not None:
+            self._db = _open_store_db(path)
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS repositories (
+                    repo_id TEXT PRIMARY KEY,
+                    record TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    seq INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS oauth_callbacks (
+                    repo_id TEXT PRIMARY KEY,
+                    code TEXT,
+                    state TEXT,
+                    error TEXT,
+                    received_at REAL NOT NULL
+                );
+                """
+            )
+            existing = {row[1] for row in self._db.execute("PRAGMA table_info(repositories)")}
+            if "seq" not in existing:
+                self._db.execute("ALTER TABLE repositories ADD COLUMN seq INTEGER NOT NULL DEFAULT 0")
+            # Listing filters run in SQL, so status and score live in columns.
+            if "status" not in existing:
+                self._db.execute("ALTER TABLE repositories ADD COLUMN status TEXT")
+                self._db.execute("ALTER TABLE repositories ADD COLUMN score REAL")
+                self._db.execute(
+                    "UPDATE repositories SET status = json_extract(record, '$.status'), "
+                    "score = CASE WHEN json_type(record, '$.security_lint.score') IN ('integer', 'real') "
+                    "THEN json_extract(record, '$.security_lint.score') END"
+                )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS repositories_created_at ON repositories (created_at, repo_id)"
+            )
+
+    @property
+    def shared(self) -> bool:
+        return self._db is not None
+
+    def __setitem__(self, repo_id: str, repo: RepositoryRecord) -> None:
+        self._local[repo_id] = repo
+        self.publish(repo)
+        self.save(repo)
+
+    def get(self, repo_id: str, default: RepositoryRecord | None = None) -> RepositoryRecord | None:
+        repo = self._local.get(repo_id)
+        if repo is not None or self._db is None:
+            return repo if repo is not None else default
+        with self._lock:
+            row = self._db.execute("SELECT record FROM repositories WHERE repo_id = ?", (repo_id,)).fetchone()
+        return self._from_record(row[0]) if row else default
+
+    def snapshot(self, repo_id: str) -> RepositorySnapshot | None:
+        if self._db is None:
+            return self._snapshots.get(repo_id)
+        with self._lock:
+            row = self._db.execute("SELECT record FROM repositories WHERE repo_id = ?", (repo_id,)).fetchone()
+        return RepositorySnapshot(**self._decode(row[0])) if row else None
+
+    def page(
+        self,
+        after: Tuple[float, str] | None = None,
+        statuses: Sequence[str] | None = None,
+        min_score: float | None = None,
+        max_score: float | None = None,
+        limit: int | None = None,
+    ) -> List[RepositorySnapshot]:
+        """Snapshots ordered by ``(created_at, id)``, starting after ``after``.
+
+        Only repositories in ``statuses`` and with a score inside the given
+        bounds are returned, at most ``limit`` of them. In shared-state mode
+        the filtering and the limit run in SQLite, so only the returned
+        records are decoded.
+        """
+
+        if self._db is None:
+            matches: List[RepositorySnapshot] = []
+            for repo in sorted(self._snapshots.values(), key=_repository_order):
+                if after is not None and _repository_order(repo) <= after:
+                    continue
+                if statuses and repo.status not in statuses:
+                    continue
+                if min_score is not None or max_score is not None:
+                    score = _repository_score(repo.security_lint)
+                    if score is None:
+                        continue
+                    if (min_score is not None and score < min_score) or (
+                        max_score is not None and score > max_score
+                    ):
+                        continue
+                matches.append(repo)
+                if limit is not None and len(matches) >= limit:
+                    break
+            return matches
+
+        clauses: List[str] = []
+        params: List[Any] = []
+        if after is not None:
+            clauses.append("(created_at > ? OR (created_at = ? AND repo_id > ?))")
+            params.extend((after[0], after[0], after[1]))
+        if statuses:
+            clauses.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if min_score is not None:
+            clauses.append("score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            clauses.append("score <= ?")
+            params.append(max_score)
+        sql = "SELECT record FROM repositories"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at, repo_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [RepositorySnapshot(**self._decode(record)) for (record,) in rows]
+
+    def publish(self, repo: RepositoryRecord) -> None:
+        with self._publish_lock:
+            snapshots = dict(self._snapshots)
+            snapshots[repo.id] = RepositorySnapshot.of(repo)
+            self._snapshots = snapshots
+            # After the swap: a reader that saw this version sees the records too.
+            self._version += 1
+
+    @property
+    def version(self) -> int:
+        if self._db is None:
+            return self._version
+        with self._lock:
+            (version,) = self._db.execute("SELECT COALESCE(MAX(seq), 0) FROM repositories").fetchone()
+        return int(version)
+
+    def save(self, repo: RepositoryRecord) -> None:
+        if self._db is None:
+            return
+        record = {
+            item.name: getattr(repo, item.name)
+            for item in fields(RepositoryRecord)
+            if item.name != "auth_state"
+        }
+        for name in _REPOSITORY_DATETIME_FIELDS:
+            record[name] = record[name].isoformat()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO repositories (repo_id, record, created_at, status, score, seq) "
+                "VALUES (?, ?, ?, ?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM repositories)) "
+                "ON CONFLICT (repo_id) DO UPDATE SET record = excluded.record, "
+                "status = excluded.status, score = excluded.score, seq = excluded.seq",
+                (
+                    repo.id,
+                    json.dumps(record),
+                    repo.created_at.timestamp(),
+                    repo.status,
+                    _repository_score(repo.security_lint),
+                ),
+            )
+
+    def relay_callback(self, repo_id: str, code: str | None, state: str | None, error: str | None) -> None:
+        """Hand an OAuth callback received here to the worker running the flow."""
 
+        if self._db is None:
+            raise RuntimeError("OAuth callback relay requires shared-state mode")
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO oauth_callbacks (repo_id, code, state, error, received_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (repo_id, code, state, error, time.time()),
+            )
 
-repositories: Dict[str, RepositoryRecord] = {}
+    def take_callback(self, repo_id: str) -> Tuple[str | None, str | None, str | None] | None:
+        if self._db is None:
+            return None
+        with self._lock:
+            row = self._db.execute(
+                "DELETE FROM oauth_callbacks WHERE repo_id = ? RETURNING code, state, error",
+                (repo_id,),
+            ).fetchone()
+        return tuple(row) if row else None
+
+    @staticmethod
+    def _decode(raw: str) -> Dict[str, Any]:
+        record: Dict[str, Any] = json.loads(raw)
+        for name in _REPOSITORY_DATETIME_FIELDS:
+            record[name] = datetime.fromisoformat(record[name])
+        return record
+
+    @classmethod
+    def _from_record(cls, raw: str) -> RepositoryRecord:
+        return RepositoryRecord(**cls._decode(raw))
+
+
+repositories = RepositoryStore(JOB_STORE_PATH if SHARED_STATE else None)
 repositories_lock = asyncio.Lock()
 
 
@@ -237,6 +1852,7 @@ async def _maybe_attach_oauth_headers(
     if _has_authorization_header(headers):
         return headers
 
+    job.events.publish("phase", {"phase": "oauth", "state": "started"})
     oauth_headers = await _obtain_oauth_headers(
         server_url=job.request.server_url,
         protocol_version=job.request.protocol_version,
@@ -244,6 +1860,7 @@ async def _maybe_attach_oauth_headers(
         base_headers=headers,
         cache_root=storage_dir,
     )
+    job.events.publish("phase", {"phase": "oauth", "state": "finished", "authorized": bool(oauth_headers)})
     if oauth_headers:
         headers.update(oauth_headers)
     return headers
@@ -256,6 +1873,22 @@ async def _obtain_oauth_headers(
     base_headers: Dict[str, str],
     cache_root: Path,
 ) -> Dict[str, str] | None:
+    async with oauth_tokens.lock(server_url):
+        access_token = oauth_tokens.get(server_url, scopes)
+        if access_token is None:
+            access_token = await _run_oauth_flow(server_url, protocol_version, scopes, base_headers, cache_root)
+    if access_token is None:
+        return None
+    return {"Authorization": f"Bearer {access_token}"}
+
+
+async def _run_oauth_flow(
+    server_url: str,
+    protocol_version: str | None,
+    scopes: str | None,
+    base_headers: Dict[str, str],
+    cache_root: Path,
+) -> str | None:
     oauth_cache = cache_root / "oauth"
     oauth_cache.mkdir(parents=True, exist_ok=True)
 
@@ -266,19 +1899,17 @@ async def _obtain_oauth_headers(
         token_storage_cache_dir=oauth_cache,
     )
 
-    await auth._initialize()
-    tokens = getattr(auth.context, "current_tokens", None)
-    if tokens and tokens.access_token:
+    await _load_stored_oauth_tokens(auth)
+    if auth.context.is_token_valid():
         logger.info("Using cached OAuth token for %s", server_url)
-        return {"Authorization": f"Bearer {tokens.access_token}"}
+        return oauth_tokens.put(server_url, scopes, auth)
 
     request_headers = dict(base_headers)
     if protocol_version:
         request_headers.setdefault("MCP-Protocol-Version", protocol_version)
 
     try:
-        async with httpx.AsyncClient(auth=auth, timeout=60.0) as client:
-            await client.get(server_url, headers=request_headers)
+        await http_pool.client.get(server_url, headers=request_headers, auth=auth, timeout=60.0)
     except Exception as exc:  # noqa: BLE001
         logger.warning("OAuth flow failed for %s: %s", server_url, exc)
         return None
@@ -286,23 +1917,50 @@ async def _obtain_oauth_headers(
     tokens = getattr(auth.context, "current_tokens", None)
     if tokens and tokens.access_token:
         logger.info("Obtained OAuth token for %s", server_url)
-        return {"Authorization": f"Bearer {tokens.access_token}"}
+        return oauth_tokens.put(server_url, scopes, auth)
 
     logger.warning("OAuth flow completed without token for %s", server_url)
     return None
 
 
-async def _update_repo(repo_id: str, **fields: Any) -> None:
+async def _repository_record(repo_id: str) -> RepositoryRecord | None:
+    if repositories.shared:
+        return await asyncio.to_thread(repositories.get, repo_id)
+    return repositories.get(repo_id)
+
+
+async def _update_repo(repo_id: str, **changes: Any) -> None:
     async with repositories_lock:
-        repo = repositories.get(repo_id)
+        repo = await _repository_record(repo_id)
         if repo is None:
             return
-        for key, value in fields.items():
+        for key, value in changes.items():
             setattr(repo, key, value)
         repo.updated_at = datetime.now(timezone.utc)
+        repo.version += 1
+        repositories.publish(repo)
+        await asyncio.to_thread(repositories.save, repo)
+
+
+def _repo_to_summary(repo: RepositorySnapshot) -> RepositorySummary:
+    lint = repo.security_lint or {}
+    return RepositorySummary(
+        id=repo.id,
+        name=repo.name,
+        serverUrl=repo.server_url,
+        status=repo.status,
+        score=lint.get("score"),
+        totalChecks=lint.get("totalChecks"),
+        passedChecks=lint.get("passedChecks"),
+        criticalFailures=lint.get("criticalFailures"),
+        lastError=repo.last_error,
+        createdAt=repo.created_at,
+        updatedAt=repo.updated_at,
+        lastScanJobId=repo.last_scan_job_id,
+    )
 
 
-def _repo_to_response(repo: RepositoryRecord) -> "RepositoryResponse":
+def _repo_to_response(repo: RepositorySnapshot) -> "RepositoryResponse":
     return RepositoryResponse(
         id=repo.id,
         name=repo.name,
@@ -323,6 +1981,19 @@ def _repo_to_response(repo: RepositoryRecord) -> "RepositoryResponse":
 async def _perform_repository_oauth(
     repo: RepositoryRecord,
     auth_state: RepositoryAuthState,
+) -> Dict[str, str] | None:
+    async with oauth_tokens.lock(repo.server_url):
+        access_token = oauth_tokens.get(repo.server_url, repo.scopes)
+        if access_token is None:
+            return await _run_repository_oauth_flow(repo, auth_state)
+    auth_state.authorize_event.set()
+    await _update_repo(repo.id, status="scanning", authorize_url=None)
+    return {"Authorization": f"Bearer {access_token}"}
+
+
+async def _run_repository_oauth_flow(
+    repo: RepositoryRecord,
+    auth_state: RepositoryAuthState,
 ) -> Dict[str, str] | None:
     if auth_state.storage_dir is None:
         auth_state.storage_dir = _job_storage_dir(repo.server_url)
@@ -349,25 +2020,39 @@ async def _perform_repository_oauth(
 
     async def callback_handler() -> tuple[str, str | None]:
         loop = asyncio.get_running_loop()
-        auth_state.code_future = loop.create_future()
-        return await auth_state.code_future
+        code_future: asyncio.Future[tuple[str, str | None]] = loop.create_future()
+        auth_state.code_future = code_future
+        relay: asyncio.Task[None] | None = None
+        if SHARED_STATE:
+            # The provider may redirect the browser to any worker; callbacks
+            # that land elsewhere are relayed through the shared store.
+            relay = asyncio.create_task(_await_relayed_callback(repo.id, code_future))
+        try:
+            async with asyncio.timeout(OAUTH_AUTHORIZE_TIMEOUT_SECONDS):
+                return await code_future
+        except TimeoutError:
+            raise RuntimeError(
+                f"Authorization was not completed within {OAUTH_AUTHORIZE_TIMEOUT_SECONDS:.0f}s"
+            ) from None
+        finally:
+            if relay is not None:
+                relay.cancel()
 
     auth.redirect_handler = redirect_handler  # type: ignore[assignment]
     auth.callback_handler = callback_handler  # type: ignore[assignment]
     auth_state.auth = auth
 
-    await auth._initialize()
+    await _load_stored_oauth_tokens(auth)
 
-    tokens = getattr(auth.context, "current_tokens", None)
-    if tokens and tokens.access_token:
+    if auth.context.is_token_valid():
+        access_token = oauth_tokens.put(repo.server_url, repo.scopes, auth)
         auth_state.authorize_event.set()
         await _update_repo(repo.id, status="scanning", authorize_url=None)
-        return {"Authorization": f"Bearer {tokens.access_token}"}
+        return {"Authorization": f"Bearer {access_token}"}
 
     headers: Dict[str, str] = {}
     try:
-        async with httpx.AsyncClient(auth=auth, timeout=90.0) as client:
-            await client.get(repo.server_url, headers=headers)
+        await http_pool.client.get(repo.server_url, headers=headers, auth=auth, timeout=90.0)
     except Exception as exc:  # noqa: BLE001
         auth_state.authorize_event.set()
         await _update_repo(repo.id, status="error", last_error=str(exc))
@@ -375,6 +2060,7 @@ async def _perform_repository_oauth(
 
     tokens = getattr(auth.context, "current_tokens", None)
     if tokens and tokens.access_token:
+        oauth_tokens.put(repo.server_url, repo.scopes, auth)
         await _update_repo(repo.id, status="scanning", authorize_url=None)
         auth_state.authorize_event.set()
         return {"Authorization": f"Bearer {tokens.access_token}"}
@@ -384,9 +2070,27 @@ async def _perform_repository_oauth(
     return None
 
 
+async def _await_relayed_callback(
+    repo_id: str,
+    code_future: asyncio.Future[tuple[str, str | None]],
+) -> None:
+    while not code_future.done():
+        relayed = await asyncio.to_thread(repositories.take_callback, repo_id)
+        if relayed is None:
+            await asyncio.sleep(SHARED_POLL_INTERVAL_SECONDS)
+            continue
+        code, state, error = relayed
+        if code_future.done():
+            return
+        if error or not code:
+            code_future.set_exception(RuntimeError(error or "OAuth callback without code"))
+        else:
+            code_future.set_result((code, state))
+
+
 async def _run_repository_flow(repo_id: str) -> None:
     async with repositories_lock:
-        repo = repositories.get(repo_id)
+        repo = await _repository_record(repo_id)
     if repo is None:
         return
 
@@ -411,16 +2115,16 @@ async def _run_repository_flow(repo_id: str) -> None:
         )
 
         job_id = uuid.uuid4().hex
-        job = ScanJob(job_id=job_id, request=request)
+        job = ScanJob(job_id=job_id, request=request, priority=SCAN_PRIORITY_INTERACTIVE)
 
         async with jobs_lock:
-            jobs[job_id] = job
+            await asyncio.to_thread(jobs.__setitem__, job_id, job)
 
         try:
-            await _run_scan_job(job_id)
+            await _submit_scan_job(job)
         finally:
             async with jobs_lock:
-                jobs.pop(job_id, None)
+                await asyncio.to_thread(jobs.pop, job_id, None)
 
         if job.status == "succeeded" and job.result:
             artifacts_copy = dict(job.artifacts)
@@ -479,37 +2183,97 @@ def _write_temp_config(
     return config_path
 
 
+SIGNATURE_ENTITY_KINDS = {
+    "prompts": "prompt",
+    "resources": "resource",
+    "resource_templates": "resource_template",
+    "tools": "tool",
+}
+
+
 def _flatten_signature(signature: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
     entities: List[Tuple[str, Dict[str, Any]]] = []
-    kind_map = {
-        "prompts": "prompt",
-        "resources": "resource",
-        "resource_templates": "resource_template",
-        "tools": "tool",
-    }
-    for kind, singular in kind_map.items():
+    for kind, singular in SIGNATURE_ENTITY_KINDS.items():
         for entity in signature.get(kind, []) or []:
             entities.append((singular, entity))
     return entities
 
 
-def _entity_from_reference(
-    servers: List[Dict[str, Any]], reference: Optional[Iterable[int]]
-) -> Optional[Dict[str, Any]]:
-    if reference is None:
+@dataclass(frozen=True)
+class SignatureEntity:
+    server_index: int
+    entity_index: int
+    kind: str
+    name: str
+    data: Dict[str, Any]
+
+
+class SignatureIndex:
+    """Flattened entity table for every server in one mcp-scan result.
+
+    mcp-scan references entities as ``[server_idx, entity_idx]`` into the
+    flattened signature (prompts, resources, resource templates, tools).
+    Build the index once per result and resolve references or names in O(1).
+    """
+
+    def __init__(self, servers: List[Dict[str, Any]]) -> None:
+        self._entities: List[List[SignatureEntity]] = []
+        self._by_name: List[Dict[Tuple[str, str], SignatureEntity]] = []
+        self._by_bare_name: List[Dict[str, SignatureEntity]] = []
+        self.metadata: List[Any] = []
+
+        for server_index, server in enumerate(servers):
+            signature = server.get("signature") if isinstance(server, dict) else None
+            self.metadata.append(signature.get("metadata") if isinstance(signature, dict) else None)
+            flattened = _flatten_signature(signature) if isinstance(signature, dict) else []
+            entities: List[SignatureEntity] = []
+            by_name: Dict[Tuple[str, str], SignatureEntity] = {}
+            by_bare_name: Dict[str, SignatureEntity] = {}
+            for entity_index, (kind, data) in enumerate(flattened):
+                entity = SignatureEntity(
+                    server_index=server_index,
+                    entity_index=entity_index,
+                    kind=kind,
+                    name=data.get("name", "unknown"),
+                    data=data,
+                )
+                entities.append(entity)
+                by_name.setdefault((kind, entity.name), entity)
+                by_bare_name.setdefault(entity.name, entity)
+            self._entities.append(entities)
+            self._by_name.append(by_name)
+            self._by_bare_name.append(by_bare_name)
+
+    def by_reference(self, reference: Optional[Iterable[int]]) -> SignatureEntity | None:
+        if reference is None:
+            return None
+        try:
+            server_idx, entity_idx = reference
+        except (TypeError, ValueError):
+            return None
+        if not isinstance(server_idx, int) or not isinstance(entity_idx, int):
+            return None
+        if not (0 <= server_idx < len(self._entities)):
+            return None
+        entities = self._entities[server_idx]
+        if 0 <= entity_idx < len(entities):
+            return entities[entity_idx]
         return None
 
-    server_idx, entity_idx = reference
-    try:
-        signature = servers[server_idx]["signature"]
-    except (IndexError, KeyError, TypeError):
-        return None
+    def by_name(self, server_index: int, name: str, kind: str | None = None) -> SignatureEntity | None:
+        if not (0 <= server_index < len(self._entities)):
+            return None
+        if kind is None:
+            return self._by_bare_name[server_index].get(name)
+        return self._by_name[server_index].get((kind, name))
 
-    flattened = _flatten_signature(signature)
-    if 0 <= entity_idx < len(flattened):
-        kind, entity = flattened[entity_idx]
-        return {"kind": kind, "data": entity}
-    return None
+    def entities(self, server_index: int | None = None) -> List[SignatureEntity]:
+        if server_index is not None:
+            return list(self._entities[server_index])
+        return [entity for entities in self._entities for entity in entities]
+
+    def count(self, kind: str) -> int:
+        return sum(1 for entities in self._entities for entity in entities if entity.kind == kind)
 
 
 CHECK_RUBRIC: Dict[str, Dict[str, Any]] = {
@@ -560,71 +2324,128 @@ DEFAULT_WEIGHT_BY_SEVERITY = {
 }
 
 
+# Declaration order is the sequential execution order. ``group`` marks checks
+# that need no initialized session ("independent") versus the ordered
+# initialize -> tools -> invocation chain ("session").
 VALIDATOR_CHECK_SPECS: Dict[str, Dict[str, Any]] = {
     "VAL-HTTP-OAUTH": {
         "name": "OAuth flow handling",
         "category": "authz",
         "severity": "critical",
+        "method": "test_oauth_flow",
+        "passNote": "OAuth flow validated",
+        "failNote": "OAuth flow failed",
+        "group": "independent",
     },
     "VAL-HTTP-WWW": {
         "name": "WWW-Authenticate header compliance",
         "category": "transport",
         "severity": "medium",
+        "method": "test_www_authenticate_flexibility",
+        "passNote": "WWW-Authenticate handling OK",
+        "failNote": "WWW-Authenticate check failed",
+        "group": "independent",
     },
     "VAL-HTTP-OPTIONS": {
         "name": "OPTIONS / CORS behaviour",
         "category": "transport",
         "severity": "low",
+        "method": "options_request",
+        "passNote": "OPTIONS handled",
+        "failNote": "OPTIONS check failed",
+        "group": "independent",
     },
     "VAL-HTTP-INIT": {
         "name": "Initialization handshake",
         "category": "protocol",
         "severity": "critical",
+        "method": "initialize",
+        "passNote": "Initialization succeeded",
+        "failNote": "Initialization failed",
+        "group": "session",
+        "resetBefore": True,
     },
     "VAL-HTTP-TOOLS": {
         "name": "Tools listing",
         "category": "tools",
         "severity": "high",
+        "method": "list_tools",
+        "passNote": "tools/list succeeded",
+        "failNote": "tools/list failed",
+        "group": "session",
+        "requires": "VAL-HTTP-INIT",
     },
     "VAL-HTTP-ASYNC": {
         "name": "Async tools support",
         "category": "runtime",
         "severity": "medium",
+        "method": "test_async_sleep_tool",
+        "passNote": "Async tools supported",
+        "failNote": "Async tools check failed",
+        "group": "session",
     },
     "VAL-HTTP-AVAILABLE": {
         "name": "Tool invocation success",
         "category": "tools",
         "severity": "medium",
+        "method": "test_available_tools",
+        "passNote": "Tool invocations succeeded",
+        "failNote": "Tool invocation failures",
+        "group": "session",
     },
     "VAL-HTTP-STRUCTURED": {
         "name": "Structured tool output",
         "category": "protocol",
         "severity": "medium",
+        "method": "test_structured_tool_output",
+        "passNote": "Structured output compliant",
+        "failNote": "Structured output missing",
+        "group": "session",
     },
     "VAL-HTTP-BATCH": {
         "name": "Batch request rejection",
         "category": "protocol",
         "severity": "medium",
+        "method": "test_batch_request_rejection",
+        "passNote": "Batch requests rejected",
+        "failNote": "Batch rejection failed",
+        "group": "session",
     },
     "VAL-HTTP-ELICIT": {
         "name": "Elicitation support",
         "category": "protocol",
         "severity": "low",
+        "method": "test_elicitation_support",
+        "passNote": "Elicitation supported",
+        "failNote": "Elicitation not supported",
+        "group": "session",
     },
     "VAL-HTTP-STATUS": {
         "name": "HTTP status handling",
         "category": "transport",
         "severity": "medium",
+        "method": "test_status_codes",
+        "passNote": "HTTP status handling OK",
+        "failNote": "Status code checks failed",
+        "group": "independent",
     },
     "VAL-HTTP-HEADERS": {
         "name": "Required headers",
         "category": "transport",
         "severity": "medium",
+        "method": "test_headers",
+        "passNote": "Headers validated",
+        "failNote": "Header checks failed",
+        "group": "independent",
     },
     "VAL-HTTP-PROTOCOL": {
         "name": "Protocol negotiation",
         "category": "protocol",
         "severity": "medium",
+        "method": "test_protocol_versions",
+        "passNote": "Protocol negotiation succeeded",
+        "failNote": "Protocol negotiation failed",
+        "group": "session",
     },
 }
 
@@ -633,9 +2454,13 @@ def _score_from_checks(checks: Dict[str, Dict[str, Any]]) -> Tuple[float, int, i
     total_weight = 0
     earned_weight = 0
     passed = 0
+    total = 0
     critical_failures: List[str] = []
 
     for check_id, check in checks.items():
+        if check.get("skipped"):
+            continue
+        total += 1
         weight = check.get("weight", 0)
         total_weight += weight
         if check.get("satisfied", False):
@@ -646,23 +2471,20 @@ def _score_from_checks(checks: Dict[str, Dict[str, Any]]) -> Tuple[float, int, i
                 critical_failures.append(check_id)
 
     score = (earned_weight / total_weight * 100) if total_weight else 100.0
-    return round(score, 1), len(checks), passed, critical_failures
+    return round(score, 1), total, passed, critical_failures
 
 
 def _build_scan_issue_evidence(
     code: str,
     issue: Dict[str, Any],
-    servers: List[Dict[str, Any]],
+    index: SignatureIndex,
 ) -> Dict[str, Any]:
-    entity_info = _entity_from_reference(servers, issue.get("reference"))
+    resolved = index.by_reference(issue.get("reference"))
     entity = None
     snippet = None
-    if entity_info:
-        entity = {
-            "kind": entity_info["kind"],
-            "name": entity_info["data"].get("name", "unknown"),
-        }
-        snippet = entity_info["data"].get("description")
+    if resolved:
+        entity = {"kind": resolved.kind, "name": resolved.name}
+        snippet = resolved.data.get("description")
 
     matches: List[str] = []
     extra = issue.get("extra_data") or {}
@@ -684,50 +2506,116 @@ def _build_scan_issue_evidence(
     return evidence
 
 
+class ToxicFlowGraph:
+    """Deduplicated flow graph for every occurrence of one TF issue code.
+
+    Each occurrence contributes edges from its untrusted-content tools to
+    its destructive tools. When one side is missing, every node of that
+    occurrence stands in for it, matching mcp-scan's own reporting. Edge
+    counts record how many occurrences share an edge.
+    """
+
+    def __init__(self, index: SignatureIndex) -> None:
+        self._index = index
+        self.nodes: Dict[str, None] = {}
+        self.adjacency: Dict[str, Dict[str, int]] = {}
+        self.edge_total = 0
+
+    def _names(self, refs: Iterable[Dict[str, Any]]) -> List[str]:
+        names: Dict[str, None] = {}
+        for ref in refs:
+            resolved = self._index.by_reference(ref.get("reference"))
+            if resolved:
+                names[resolved.name] = None
+        return list(names)
+
+    def add(self, issue: Dict[str, Any]) -> None:
+        extra = issue.get("extra_data") or {}
+        untrusted = self._names(extra.get("untrusted_content_tool") or [])
+        destructive = self._names(extra.get("destructive_tool") or [])
+        occurrence_nodes = list(dict.fromkeys(untrusted + destructive))
+        if not occurrence_nodes:
+            return
+        for name in occurrence_nodes:
+            self.nodes.setdefault(name, None)
+
+        for source in untrusted or occurrence_nodes:
+            targets = self.adjacency.setdefault(source, {})
+            for target in destructive or occurrence_nodes:
+                count = targets.get(target, 0)
+                if not count:
+                    self.edge_total += 1
+                targets[target] = count + 1
+
+    def edges(self, limit: int | None = None) -> List[Tuple[str, str, int]]:
+        """Edges by descending occurrence count, first-seen order on ties."""
+
+        every_edge = (
+            (source, target, count)
+            for source, targets in self.adjacency.items()
+            for target, count in targets.items()
+        )
+        if limit is None:
+            return sorted(every_edge, key=lambda edge: edge[2], reverse=True)
+        # Only the top ``limit`` edges are ever shown; avoid sorting the rest.
+        return heapq.nlargest(limit, every_edge, key=lambda edge: edge[2])
+
+    def to_evidence(self, max_edges: int = TOXIC_FLOW_MAX_EDGES) -> Dict[str, Any]:
+        shown = self.edges(max_edges)
+        adjacency: Dict[str, List[str]] = {}
+        for source, target, _ in shown:
+            adjacency.setdefault(source, []).append(target)
+
+        evidence: Dict[str, Any] = {
+            "nodes": list(self.nodes),
+            "edges": [(source, target) for source, target, _ in shown],
+            "edgeCounts": [count for _, _, count in shown],
+            "adjacency": adjacency,
+            "edgeTotal": self.edge_total,
+        }
+        omitted = self.edge_total - len(shown)
+        if omitted > 0:
+            shown_by_source: Dict[str, int] = defaultdict(int)
+            for source, _, _ in shown:
+                shown_by_source[source] += 1
+            evidence["overflow"] = {
+                "omittedEdges": omitted,
+                "maxEdges": max_edges,
+                "omittedBySource": {
+                    source: len(targets) - shown_by_source[source]
+                    for source, targets in self.adjacency.items()
+                    if len(targets) > shown_by_source[source]
+                },
+            }
+        return evidence
+
+
 def _build_toxic_flow_evidence(
     code: str,
-    issue: Dict[str, Any],
-    servers: List[Dict[str, Any]],
+    occurrences: List[Dict[str, Any]],
+    index: SignatureIndex,
 ) -> Dict[str, Any]:
-    nodes: List[str] = []
-    edges: List[Tuple[str, str]] = []
-    extra = issue.get("extra_data") or {}
-
-    def _names_from_refs(refs: List[Dict[str, Any]]) -> List[str]:
-        names: List[str] = []
-        for ref in refs:
-            reference = ref.get("reference")
-            entity_info = _entity_from_reference(servers, reference)
-            if entity_info:
-                names.append(entity_info["data"].get("name", "unknown"))
-        return names
-
-    untrusted_refs = extra.get("untrusted_content_tool") or []
-    destructive_refs = extra.get("destructive_tool") or []
-    nodes.extend(_names_from_refs(untrusted_refs))
-    nodes.extend(_names_from_refs(destructive_refs))
-
-    if nodes:
-        for destructive in _names_from_refs(destructive_refs) or nodes:
-            for untrusted in _names_from_refs(untrusted_refs) or nodes:
-                edges.append((untrusted, destructive))
+    graph = ToxicFlowGraph(index)
+    for issue in occurrences:
+        graph.add(issue)
 
+    exemplar = occurrences[0]
     return {
         "type": "toxicFlow",
-        "flowId": f"{code}-{issue.get('reference')}",
+        "flowId": f"{code}-{exemplar.get('reference')}",
         "kind": code,
-        "nodes": list(dict.fromkeys(nodes)),
-        "edges": edges,
+        **graph.to_evidence(),
+        "occurrences": len(occurrences),
         "detected": True,
-        "topExample": issue.get("message"),
-        "raw": issue,
+        "topExample": exemplar.get("message"),
+        "raw": exemplar,
     }
 
 
 def _build_check_entry(
     code: str,
     occurrences: List[Dict[str, Any]],
-    servers: List[Dict[str, Any]],
+    index: SignatureIndex,
 ) -> Dict[str, Any]:
     meta = CHECK_RUBRIC.get(code, {
         "name": f"MCP Scan issue {code}",
@@ -746,11 +2634,10 @@ def _build_check_entry(
             "summary": {"occurrences": 0},
         }
     else:
-        exemplar = occurrences[0]
         if code.startswith("TF"):
-            evidence = _build_toxic_flow_evidence(code, exemplar, servers)
+            evidence = _build_toxic_flow_evidence(code, occurrences, index)
         else:
-            evidence = _build_scan_issue_evidence(code, exemplar, servers)
+            evidence = _build_scan_issue_evidence(code, occurrences[0], index)
 
     weight = meta.get("weight") or DEFAULT_WEIGHT_BY_SEVERITY.get(meta.get("severity", "medium"), 3)
 
@@ -808,30 +2695,33 @@ def _viz_by_category(checks: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
     return output
 
 
-def _normalise_scan_output(
-    raw: Dict[str, Any],
-    job: ScanJob,
-    stdout_path: Path,
-) -> Dict[str, Any]:
-    if not raw:
-        raise ValueError("Empty scan output")
-
-    path, payload = next(iter(raw.items()))
-    issues: List[Dict[str, Any]] = payload.get("issues", [])
-    servers: List[Dict[str, Any]] = payload.get("servers", [])
+def _scan_checks_from_payload(payload: Dict[str, Any], index: SignatureIndex) -> Dict[str, Dict[str, Any]]:
+    """Build one check per rubric/issue code; the per-job summary is added later."""
 
     issue_map: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-    for issue in issues:
+    for issue in payload.get("issues", []):
         code = issue.get("code", "UNKNOWN")
         issue_map[code].append(issue)
 
     all_codes = set(issue_map.keys()) | set(CHECK_RUBRIC.keys())
     checks: Dict[str, Dict[str, Any]] = {}
     for code in sorted(all_codes):
-        checks[f"SCAN-{code}"] = _build_check_entry(code, issue_map.get(code, []), servers)
+        checks[f"SCAN-{code}"] = _build_check_entry(code, issue_map.get(code, []), index)
+    return checks
 
-    total_tools = sum(len(server.get("signature", {}).get("tools", []) or []) for server in servers)
 
+def _scan_security_result(
+    checks: Dict[str, Dict[str, Any]],
+    job: ScanJob,
+    *,
+    config_path: str,
+    issues_found: int,
+    tools_analyzed: int,
+    report_path: Path,
+    mode: List[str],
+    cache: Dict[str, Any] | None = None,
+    incremental: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
     summary_check = {
         "id": "SCAN-SUMMARY",
         "name": "MCP Scan summary",
@@ -845,12 +2735,12 @@ def _normalise_scan_output(
             "type": "scanReport",
             "issue": "SUMMARY",
             "summary": {
-                "configPath": path,
-                "issuesFound": len(issues),
-                "toolsAnalyzed": total_tools,
+                "configPath": config_path,
+                "issuesFound": issues_found,
+                "toolsAnalyzed": tools_analyzed,
                 "serverUrl": job.request.server_url,
             },
-            "reportPath": str(stdout_path),
+            "reportPath": str(report_path),
         },
     }
 
@@ -858,13 +2748,17 @@ def _normalise_scan_output(
 
     score, total_checks, passed_checks, critical_failures = _score_from_checks(checks)
 
-    providers = {
+    providers: Dict[str, Any] = {
         "mcpScan": {
             "version": os.environ.get("MCP_SCAN_VERSION", "external"),
-            "mode": ["scan"],
+            "mode": mode,
             "runId": job.job_id,
         }
     }
+    if cache is not None:
+        providers["mcpScan"]["cache"] = cache
+    if incremental is not None:
+        providers["mcpScan"]["incremental"] = incremental
 
     security_lint = {
         "score": score,
@@ -888,12 +2782,165 @@ def _normalise_scan_output(
     }
 
 
+def _normalise_scan_output(
+    raw: Dict[str, Any],
+    job: ScanJob,
+    stdout_path: Path,
+) -> Dict[str, Any]:
+    if not raw:
+        raise ValueError("Empty scan output")
+
+    path, payload = next(iter(raw.items()))
+    index = SignatureIndex(payload.get("servers", []))
+    checks = _scan_checks_from_payload(payload, index)
+    return _scan_security_result(
+        checks,
+        job,
+        config_path=path,
+        issues_found=len(payload.get("issues", [])),
+        tools_analyzed=index.count("tool"),
+        report_path=stdout_path,
+        mode=["scan"],
+    )
+
+
+class _JobLogSink:
+    """Line-buffered log file shared by every thread working on one job."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._file = path.open("w", encoding="utf-8", buffering=1)
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            return self._file.write(text)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+_stdout_sink: contextvars.ContextVar[_JobLogSink | None] = contextvars.ContextVar(
+    "stdout_sink", default=None
+)
+
+
+class _ContextRoutedStdout(io.TextIOBase):
+    """``sys.stdout`` stand-in that writes to the current context's job sink.
+
+    Code running outside a capture (uvicorn, other requests) falls through to
+    the real stdout, so capturing one job never swallows or mixes in output
+    from anything else in the process.
+    """
+
+    def __init__(self, fallback: TextIO) -> None:
+        self._fallback = fallback
+
+    def write(self, text: str) -> int:
+        sink = _stdout_sink.get()
+        if sink is None:
+            return self._fallback.write(text)
+        return sink.write(text)
+
+    def flush(self) -> None:
+        sink = _stdout_sink.get()
+        (sink or self._fallback).flush()
+
+    @property
+    def encoding(self) -> str:  # type: ignore[override]
+        return getattr(self._fallback, "encoding", "utf-8")
+
+    def isatty(self) -> bool:
+        return False
+
+    def fileno(self) -> int:
+        return self._fallback.fileno()
+
+
+_stdout_router_lock = threading.Lock()
+
+
+@contextmanager
+def _capture_stdout_to(path: Path) -> Iterator[None]:
+    """Stream ``print`` output from this context (and copies of it) to ``path``.
+
+    Threads started inside the block must run under
+    ``contextvars.copy_context()`` to inherit the capture.
+    """
+
+    with _stdout_router_lock:
+        if not isinstance(sys.stdout, _ContextRoutedStdout):
+            sys.stdout = _ContextRoutedStdout(sys.stdout)
+
+    sink = _JobLogSink(path)
+    token = _stdout_sink.set(sink)
+    try:
+        yield
+    finally:
+        _stdout_sink.reset(token)
+        sink.close()
+
+
+def _validator_check_groups() -> List[List[str]]:
+    """Split validator checks into groups that can run on separate testers.
+
+    Every independent check is its own group; the session checks form one
+    ordered chain.
+    """
+
+    groups: List[List[str]] = []
+    chain: List[str] = []
+    for check_id, spec in VALIDATOR_CHECK_SPECS.items():
+        if spec.get("group") == "independent":
+            groups.append([check_id])
+        else:
+            chain.append(check_id)
+    if chain:
+        groups.append(chain)
+    return groups
+
+
+def _run_validator_check(
+    tester: Any,
+    check_id: str,
+    passed_by_id: Dict[str, bool],
+) -> Tuple[str, bool, str, float]:
+    """Run one validator check, returning ``(id, passed, note, duration ms)``."""
+
+    spec = VALIDATOR_CHECK_SPECS[check_id]
+    started = time.perf_counter()
+    requires = spec.get("requires")
+    try:
+        if requires and not passed_by_id.get(requires, False):
+            passed = False
+        else:
+            passed = bool(getattr(tester, spec["method"])())
+    except Exception as exc:  # noqa: BLE001
+        passed = False
+        note = f"Exception: {exc}"
+    else:
+        note = spec["passNote"] if passed else spec["failNote"]
+    duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    return check_id, passed, note, duration_ms
+
+
 def _validator_check_entry(
     check_id: str,
-    passed: bool,
+    passed: bool | None,
     message: str,
     log_path: Path,
+    duration_ms: float | None = None,
 ) -> Dict[str, Any]:
+    """Check entry for one validator outcome; ``passed=None`` means not run.
+
+    Skipped checks carry no weight and are left out of the score totals.
+    """
+
     meta = VALIDATOR_CHECK_SPECS.get(
         check_id,
         {
@@ -905,13 +2952,18 @@ def _validator_check_entry(
 
     severity = meta.get("severity", "medium")
     weight = meta.get("weight") or DEFAULT_WEIGHT_BY_SEVERITY.get(severity, 3)
+    skipped = passed is None
+    if skipped:
+        weight = 0
+
+    details: Dict[str, Any] = {"message": message}
+    if duration_ms is not None:
+        details["durationMs"] = duration_ms
 
     evidence = {
         "type": "validatorAssertion",
         "testId": check_id,
-        "details": {
-            "message": message,
-        },
+        "details": details,
         "logRef": str(log_path),
     }
 
@@ -922,7 +2974,8 @@ def _validator_check_entry(
         "category": meta.get("category", "protocol"),
         "severity": severity,
         "weight": weight,
-        "satisfied": passed,
+        "satisfied": passed is not False,
+        "skipped": skipped,
         "scoreContribution": weight if passed else 0,
         "evidence": evidence,
         "raw": {
@@ -943,157 +2996,76 @@ def _run_mcp_validator_component(
     except ModuleNotFoundError as exc:  # pragma: no cover - guarded by existence check
         raise RuntimeError("mcp-validator package is unavailable") from exc
 
-    log_buffer = io.StringIO()
-    tester = MCPHttpTester(job.request.server_url, debug=False)
-
-    if job.request.protocol_version:
-        tester.protocol_version = job.request.protocol_version
-
-    if job.request.headers:
-        tester.request_session.headers.update(job.request.headers)
-
-    check_results: List[Tuple[str, bool, str]] = []
-
-    def _record(check_id: str, result: bool, note: str) -> None:
-        check_results.append((check_id, result, note))
-
-    with redirect_stdout(log_buffer):
-        try:
-            oauth = tester.test_oauth_flow()
-        except Exception as exc:  # noqa: BLE001
-            oauth = False
-            note = f"Exception: {exc}"
-        else:
-            note = "OAuth flow validated" if oauth else "OAuth flow failed"
-        _record("VAL-HTTP-OAUTH", oauth, note)
-
-        try:
-            www = tester.test_www_authenticate_flexibility()
-        except Exception as exc:  # noqa: BLE001
-            www = False
-            note = f"Exception: {exc}"
-        else:
-            note = "WWW-Authenticate handling OK" if www else "WWW-Authenticate check failed"
-        _record("VAL-HTTP-WWW", www, note)
-
-        try:
-            options_ok = tester.options_request()
-        except Exception as exc:  # noqa: BLE001
-            options_ok = False
-            note = f"Exception: {exc}"
-        else:
-            note = "OPTIONS handled" if options_ok else "OPTIONS check failed"
-        _record("VAL-HTTP-OPTIONS", options_ok, note)
-
-        tester.reset_server()
-
-        try:
-            init_ok = tester.initialize()
-        except Exception as exc:  # noqa: BLE001
-            init_ok = False
-            note = f"Exception: {exc}"
-        else:
-            note = "Initialization succeeded" if init_ok else "Initialization failed"
-        _record("VAL-HTTP-INIT", init_ok, note)
-
-        try:
-            tools_ok = tester.list_tools() if init_ok else False
-        except Exception as exc:  # noqa: BLE001
-            tools_ok = False
-            note = f"Exception: {exc}"
-        else:
-            note = "tools/list succeeded" if tools_ok else "tools/list failed"
-        _record("VAL-HTTP-TOOLS", tools_ok, note)
-
-        try:
-            async_ok = tester.test_async_sleep_tool()
-        except Exception as exc:  # noqa: BLE001
-            async_ok = False
-            note = f"Exception: {exc}"
-        else:
-            note = "Async tools supported" if async_ok else "Async tools check failed"
-        _record("VAL-HTTP-ASYNC", async_ok, note)
-
-        try:
-            available_ok = tester.test_available_tools()
-        except Exception as exc:  # noqa: BLE001
-            available_ok = False
-            note = f"Exception: {exc}"
-        else:
-            note = "Tool invocations succeeded" if available_ok else "Tool invocation failures"
-        _record("VAL-HTTP-AVAILABLE", available_ok, note)
-
-        try:
-            structured_ok = tester.test_structured_tool_output()
-        except Exception as exc:  # noqa: BLE001
-            structured_ok = False
-            note = f"Exception: {exc}"
-        else:
-            note = "Structured output compliant" if structured_ok else "Structured output missing"
-        _record("VAL-HTTP-STRUCTURED", structured_ok, note)
-
-        try:
-            batch_ok = tester.test_batch_request_rejection()
-        except Exception as exc:  # noqa: BLE001
-            batch_ok = False
-            note = f"Exception: {exc}"
-        else:
-            note = "Batch requests rejected" if batch_ok else "Batch rejection failed"
-        _record("VAL-HTTP-BATCH", batch_ok, note)
-
-        try:
-            elicitation_ok = tester.test_elicitation_support()
-        except Exception as exc:  # noqa: BLE001
-            elicitation_ok = False
-            note = f"Exception: {exc}"
-        else:
-            note = "Elicitation supported" if elicitation_ok else "Elicitation not supported"
-        _record("VAL-HTTP-ELICIT", elicitation_ok, note)
+    log_path = storage_dir / f"validator_{job.job_id}.log"
+    job.artifacts["validatorLog"] = str(log_path)
 
-        try:
-            status_ok = tester.test_status_codes()
-        except Exception as exc:  # noqa: BLE001
-            status_ok = False
-            note = f"Exception: {exc}"
+    def _make_tester() -> Any:
+        tester = MCPHttpTester(job.request.server_url, debug=False)
+        if job.request.protocol_version:
+            tester.protocol_version = job.request.protocol_version
+        if job.request.headers:
+            tester.request_session.headers.update(job.request.headers)
+        return tester
+
+    check_results: List[Tuple[str, bool, str, float]] = []
+    results_lock = threading.Lock()
+
+    def _run_group(check_ids: List[str]) -> None:
+        tester = _make_tester()
+        passed_by_id: Dict[str, bool] = {}
+        for check_id in check_ids:
+            _raise_if_cancelled(job)
+            if VALIDATOR_CHECK_SPECS[check_id].get("resetBefore"):
+                tester.reset_server()
+            outcome = _run_validator_check(tester, check_id, passed_by_id)
+            passed_by_id[check_id] = outcome[1]
+            with results_lock:
+                check_results.append(outcome)
+            job.events.publish_threadsafe(
+                "check",
+                {"component": "mcpValidator", "check": _validator_check_entry(*outcome[:3], log_path, outcome[3])},
+            )
+        _raise_if_cancelled(job)
+
+    with _capture_stdout_to(log_path):
+        if VALIDATOR_PARALLEL:
+            groups = _validator_check_groups()
+            with ThreadPoolExecutor(
+                max_workers=len(groups),
+                thread_name_prefix=f"validator-{job.job_id[:8]}",
+            ) as pool:
+                futures = [
+                    pool.submit(contextvars.copy_context().run, _run_group, group)
+                    for group in groups
+                ]
+            for future in futures:
+                future.result()
         else:
-            note = "HTTP status handling OK" if status_ok else "Status code checks failed"
-        _record("VAL-HTTP-STATUS", status_ok, note)
+            _run_group(list(VALIDATOR_CHECK_SPECS))
 
-        try:
-            headers_ok = tester.test_headers()
-        except Exception as exc:  # noqa: BLE001
-            headers_ok = False
-            note = f"Exception: {exc}"
-        else:
-            note = "Headers validated" if headers_ok else "Header checks failed"
-        _record("VAL-HTTP-HEADERS", headers_ok, note)
+    provider = {
+        "version": os.environ.get("MCP_VALIDATOR_VERSION", "local"),
+        "runId": job.job_id,
+    }
+    return _validator_component_result(job, check_results, log_path, provider)
 
-        try:
-            protocol_ok = tester.test_protocol_versions()
-        except Exception as exc:  # noqa: BLE001
-            protocol_ok = False
-            note = f"Exception: {exc}"
-        else:
-            note = "Protocol negotiation succeeded" if protocol_ok else "Protocol negotiation failed"
-        _record("VAL-HTTP-PROTOCOL", protocol_ok, note)
 
-    log_text = log_buffer.getvalue()
-    log_path = storage_dir / f"validator_{job.job_id}.log"
-    log_path.write_text(log_text, encoding="utf-8")
-    job.artifacts["validatorLog"] = str(log_path)
+def _validator_component_result(
+    job: ScanJob,
+    check_results: Sequence[Tuple[str, bool | None, str, float]],
+    log_path: Path,
+    provider: Dict[str, Any],
+) -> Dict[str, Any]:
+    order = {check_id: index for index, check_id in enumerate(VALIDATOR_CHECK_SPECS)}
+    check_results = sorted(check_results, key=lambda outcome: order.get(outcome[0], len(order)))
 
     checks: Dict[str, Dict[str, Any]] = {}
-    for check_id, passed, note in check_results:
-        checks[check_id] = _validator_check_entry(check_id, passed, note, log_path)
+    for check_id, passed, note, duration_ms in check_results:
+        checks[check_id] = _validator_check_entry(check_id, passed, note, log_path, duration_ms)
 
     score, total_checks, passed_checks, critical_failures = _score_from_checks(checks)
 
-    providers = {
-        "mcpValidator": {
-            "version": os.environ.get("MCP_VALIDATOR_VERSION", "local"),
-            "runId": job.job_id,
-        }
-    }
+    providers = {"mcpValidator": provider}
 
     security_lint = {
         "score": score,
@@ -1154,183 +3126,2771 @@ def _combine_security_results(components: List[Dict[str, Any]]) -> Dict[str, Any
 
 
 # ---------------------------------------------------------------------------
-# Job execution
+# Async validator engine
 # ---------------------------------------------------------------------------
 
 
-async def _execute_mcp_scan_component(
-    job: ScanJob,
-    storage_dir: Path,
-    timeout: int,
-) -> Dict[str, Any]:
-    request = job.request
-    headers = _normalize_headers(request.headers)
-    headers = await _maybe_attach_oauth_headers(job, headers, storage_dir)
-    job.request.headers = headers
+DEFAULT_PROTOCOL_VERSION = "2025-06-18"
+UNSUPPORTED_PROTOCOL_PROBE = "1900-01-01"
+JSONRPC_ACCEPT = "application/json, text/event-stream"
+ASYNC_VALIDATOR_MAX_TOOL_CALLS = 5
+ASYNC_VALIDATOR_MAX_TOOL_PAGES = 10
 
-    with TemporaryDirectory(dir=MCP_SCAN_STORAGE_ROOT, prefix="tmp-") as tmp:
-        tmp_path = Path(tmp)
-        config_path = _write_temp_config(
-            tmp_path,
-            request.server_url,
-            headers,
-            request.protocol_version,
-        )
 
-        stdout_path = storage_dir / f"scan_{job.job_id}.json"
-        stderr_path = storage_dir / f"scan_{job.job_id}.log"
+@dataclass
+class _RpcReply:
+    status: int
+    headers: httpx.Headers
+    message: Any
+
+    @property
+    def result(self) -> Dict[str, Any] | None:
+        result = self.message.get("result") if isinstance(self.message, dict) else None
+        return result if isinstance(result, dict) else None
+
+    @property
+    def error(self) -> Dict[str, Any] | None:
+        error = self.message.get("error") if isinstance(self.message, dict) else None
+        return error if isinstance(error, dict) else None
+
+
+async def _read_sse_message(response: httpx.Response, request_id: int | None) -> Any:
+    """Return the first SSE message answering ``request_id`` (or the first one)."""
+
+    data_lines: List[str] = []
+    async for line in response.aiter_lines():
+        if line.startswith("data:"):
+            data_lines.append(line[5:].lstrip())
+            continue
+        if line or not data_lines:
+            continue
+        try:
+            message = json.loads("\n".join(data_lines))
+        except json.JSONDecodeError:
+            message = None
+        data_lines = []
+        if request_id is None or (isinstance(message, dict) and message.get("id") == request_id):
+            return message
+    return None
 
-        cmd = [
-            "uv",
-            "run",
-            "-m",
-            "src.mcp_scan.run",
-            "scan",
-            str(config_path),
-            "--json",
-            "--server-timeout",
-            str(timeout),
-            "--storage-file",
-            str(storage_dir),
-        ]
 
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=aio_subprocess.PIPE,
-            stderr=aio_subprocess.PIPE,
-            cwd=str(MCP_SCAN_ROOT),
-        )
+def _resource_metadata_url(challenge: str | None, server_url: str) -> str:
+    """Protected resource metadata URL from a challenge, else the RFC 9728 default."""
 
-        stdout_data, stderr_data = await process.communicate()
+    if challenge:
+        for part in challenge.split(","):
+            key, _, value = part.strip().partition("=")
+            if key.strip().lower().endswith("resource_metadata") and value:
+                return value.strip().strip('"')
 
-        stdout_path.write_bytes(stdout_data)
-        stderr_path.write_bytes(stderr_data)
-        job.artifacts["scanJson"] = str(stdout_path)
-        job.artifacts["scanLog"] = str(stderr_path)
+    parsed = httpx.URL(server_url)
+    path = parsed.path.rstrip("/")
+    return str(parsed.copy_with(path=f"/.well-known/oauth-protected-resource{path}", query=None))
 
-        if process.returncode != 0:
-            raise RuntimeError(
-                f"mcp-scan exited with {process.returncode}: {stderr_data.decode(errors='ignore')}"
-            )
 
-        raw_output = json.loads(stdout_data.decode("utf-8"))
-        return _normalise_scan_output(raw_output, job, stdout_path)
+def _safe_to_invoke(tool: Dict[str, Any]) -> bool:
+    """Only read-only tools without required arguments are ever invoked."""
 
+    annotations = tool.get("annotations") or {}
+    schema = tool.get("inputSchema") or {}
+    return annotations.get("readOnlyHint") is True and not schema.get("required")
 
-async def _run_scan_job(job_id: str) -> None:
-    async with jobs_lock:
-        job = jobs[job_id]
-        job.status = "running"
-        job.started_at = datetime.now(timezone.utc)
 
-    request = job.request
-    include = request.include or ScanInclude()
+class AsyncValidatorEngine:
+    """Asyncio-native implementation of the ``VALIDATOR_CHECK_SPECS`` checks.
 
-    storage_dir = _job_storage_dir(request.server_url)
-    timeout = request.timeout_seconds or SCAN_TIMEOUT_SECONDS
+    Speaks MCP Streamable HTTP directly over a shared ``httpx.AsyncClient``,
+    so a validator run is a coroutine on the event loop rather than a thread
+    with its own requests session. Grouping follows ``_validator_check_groups``:
+    independent checks never touch the session established by the chain.
+    """
 
-    component_results: List[Dict[str, Any]] = []
+    _CHECKS = {
+        "VAL-HTTP-OAUTH": "_check_oauth",
+        "VAL-HTTP-WWW": "_check_www_authenticate",
+        "VAL-HTTP-OPTIONS": "_check_options",
+        "VAL-HTTP-INIT": "_check_initialize",
+        "VAL-HTTP-TOOLS": "_check_tools",
+        "VAL-HTTP-ASYNC": "_check_async_tools",
+        "VAL-HTTP-AVAILABLE": "_check_available_tools",
+        "VAL-HTTP-STRUCTURED": "_check_structured_output",
+        "VAL-HTTP-BATCH": "_check_batch_rejection",
+        "VAL-HTTP-ELICIT": "_check_elicitation",
+        "VAL-HTTP-STATUS": "_check_status_codes",
+        "VAL-HTTP-HEADERS": "_check_headers",
+        "VAL-HTTP-PROTOCOL": "_check_protocol_negotiation",
+    }
 
-    try:
-        if include.mcpScan:
-            scan_result = await _execute_mcp_scan_component(job, storage_dir, timeout)
-            component_results.append(scan_result)
+    def __init__(self, job: ScanJob, client: httpx.AsyncClient, log: _JobLogSink) -> None:
+        self.job = job
+        self.client = client
+        self.timeout = VALIDATOR_REQUEST_TIMEOUT_SECONDS
+        self.url = job.request.server_url
+        self.headers = dict(job.request.headers or {})
+        self.protocol_version = job.request.protocol_version or DEFAULT_PROTOCOL_VERSION
+        self._log_sink = log
+        self._ids = itertools.count(1)
+        self.session_id: str | None = None
+        self.negotiated_version: str | None = None
+        self.tools: List[Dict[str, Any]] = []
+        self.tool_results: Dict[str, Dict[str, Any]] = {}
+
+    async def run(self) -> List[Tuple[str, bool | None, str, float]]:
+        results: List[Tuple[str, bool | None, str, float]] = []
+
+        async def _run_group(check_ids: List[str]) -> None:
+            passed_by_id: Dict[str, bool] = {}
+            for check_id in check_ids:
+                _raise_if_cancelled(self.job)
+                outcome = await self._run_check(check_id, passed_by_id)
+                passed_by_id[check_id] = outcome[1] is not False
+                results.append(outcome)
+                self.job.events.publish(
+                    "check",
+                    {
+                        "component": "mcpValidator",
+                        "check": _validator_check_entry(*outcome[:3], self._log_sink.path, outcome[3]),
+                    },
+                )
+
+        groups = _validator_check_groups() if VALIDATOR_PARALLEL else [list(VALIDATOR_CHECK_SPECS)]
+        try:
+            await asyncio.gather(*(_run_group(group) for group in groups))
+        finally:
+            await self._terminate_session(self.session_id)
+        return results
+
+    async def _run_check(
+        self,
+        check_id: str,
+        passed_by_id: Dict[str, bool],
+    ) -> Tuple[str, bool | None, str, float]:
+        spec = VALIDATOR_CHECK_SPECS[check_id]
+        started = time.perf_counter()
+        requires = spec.get("requires")
+        passed: bool | None
+        try:
+            if requires and not passed_by_id.get(requires, False):
+                passed, note = False, None
+            else:
+                passed, note = await getattr(self, self._CHECKS[check_id])()
+        except Exception as exc:  # noqa: BLE001
+            passed, note = False, f"Exception: {exc}"
+        if note is None:
+            note = spec["passNote"] if passed else spec["failNote"]
+        duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        verdict = "SKIP" if passed is None else "PASS" if passed else "FAIL"
+        self._log(f"{check_id} {verdict} ({duration_ms} ms): {note}")
+        return check_id, passed, note, duration_ms
+
+    # -- transport ---------------------------------------------------------
+
+    def _log(self, line: str) -> None:
+        self._log_sink.write(f"[{datetime.now(timezone.utc).isoformat()}] {line}\n")
+
+    def _headers(
+        self,
+        *,
+        authenticated: bool = True,
+        session_id: str | None = None,
+    ) -> Dict[str, str]:
+        headers = {
+            key: value
+            for key, value in self.headers.items()
+            if authenticated or key.lower() != "authorization"
+        }
+        headers["Accept"] = JSONRPC_ACCEPT
+        headers["Content-Type"] = "application/json"
+        if session_id:
+            headers["Mcp-Session-Id"] = session_id
+            if self.negotiated_version:
+                headers["MCP-Protocol-Version"] = self.negotiated_version
+        return headers
 
-        if include.mcpValidator:
-            validator_result = await asyncio.to_thread(
-                _run_mcp_validator_component,
-                job,
-                storage_dir,
-            )
-            component_results.append(validator_result)
+    async def _send(self, payload: Any, headers: Dict[str, str], request_id: int | None) -> _RpcReply:
+        async with self.client.stream(
+            "POST", self.url, json=payload, headers=headers, timeout=self.timeout
+        ) as response:
+            content_type = response.headers.get("content-type", "")
+            if "text/event-stream" in content_type:
+                message = await _read_sse_message(response, request_id)
+            else:
+                body = await response.aread()
+                try:
+                    message = json.loads(body) if body.strip() else None
+                except json.JSONDecodeError:
+                    message = None
+        method = payload.get("method") if isinstance(payload, dict) else "batch"
+        self._log(f"POST {method} -> HTTP {response.status_code}")
+        return _RpcReply(response.status_code, response.headers, message)
+
+    async def _rpc(
+        self,
+        method: str,
+        params: Dict[str, Any],
+        *,
+        authenticated: bool = True,
+        session: bool = True,
+    ) -> _RpcReply:
+        request_id = next(self._ids)
+        payload = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+        headers = self._headers(
+            authenticated=authenticated,
+            session_id=self.session_id if session else None,
+        )
+        return await self._send(payload, headers, request_id)
+
+    async def _notify(self, method: str) -> int:
+        payload = {"jsonrpc": "2.0", "method": method}
+        response = await self.client.post(
+            self.url,
+            json=payload,
+            headers=self._headers(session_id=self.session_id),
+            timeout=self.timeout,
+        )
+        self._log(f"POST {method} -> HTTP {response.status_code}")
+        return response.status_code
 
-        if not component_results:
-            raise ValueError("At least one scan component must be selected")
+    async def _terminate_session(self, session_id: str | None) -> None:
+        if not session_id:
+            return
+        try:
+            await self.client.delete(self.url, headers=self._headers(session_id=session_id), timeout=self.timeout)
+        except httpx.HTTPError:
+            pass
 
-        combined = _combine_security_results(component_results)
+    def _initialize_params(self, version: str | None = None) -> Dict[str, Any]:
+        return {
+            "protocolVersion": version or self.protocol_version,
+            "capabilities": {"elicitation": {}},
+            "clientInfo": {"name": "mcptesting-backend", "version": get_version()},
+        }
 
-    except Exception as exc:  # noqa: BLE001
-        async with jobs_lock:
-            job.status = "error"
-            job.finished_at = datetime.now(timezone.utc)
-            job.error = str(exc)
-        return
+    async def _call_tool(self, name: str, arguments: Dict[str, Any]) -> _RpcReply:
+        return await self._rpc("tools/call", {"name": name, "arguments": arguments})
+
+    # -- independent checks ------------------------------------------------
+
+    async def _check_oauth(self) -> Tuple[bool | None, str | None]:
+        probe = await self._rpc("initialize", self._initialize_params(), authenticated=False, session=False)
+        await self._terminate_session(probe.headers.get("mcp-session-id"))
+        if probe.status != 401:
+            if probe.status < 400:
+                return None, "Server accepts unauthenticated sessions; OAuth not required"
+            return False, f"Unexpected HTTP {probe.status} without credentials"
+
+        metadata_url = _resource_metadata_url(probe.headers.get("www-authenticate"), self.url)
+        response = await self.client.get(metadata_url, headers={"Accept": "application/json"}, timeout=self.timeout)
+        if response.status_code != 200:
+            return False, f"Protected resource metadata unavailable (HTTP {response.status_code})"
+        if not (response.json() or {}).get("authorization_servers"):
+            return False, "Protected resource metadata lists no authorization servers"
+        return True, None
+
+    async def _check_www_authenticate(self) -> Tuple[bool | None, str | None]:
+        probe = await self._rpc("initialize", self._initialize_params(), authenticated=False, session=False)
+        await self._terminate_session(probe.headers.get("mcp-session-id"))
+        if probe.status != 401:
+            return None, "No 401 challenge issued; header not required"
+        challenge = probe.headers.get("www-authenticate")
+        if not challenge:
+            return False, "401 response without WWW-Authenticate"
+        if not challenge.lower().startswith("bearer"):
+            return False, f"Unexpected challenge scheme: {challenge.split()[0]}"
+        return True, None
+
+    async def _check_options(self) -> Tuple[bool, str | None]:
+        headers = {
+            **self.headers,
+            "Origin": "http://localhost",
+            "Access-Control-Request-Method": "POST",
+        }
+        response = await self.client.options(self.url, headers=headers, timeout=self.timeout)
+        if 200 <= response.status_code < 300:
+            return True, None
+        return False, f"OPTIONS answered with HTTP {response.status_code}"
+
+    async def _check_status_codes(self) -> Tuple[bool, str | None]:
+        malformed = await self.client.post(
+            self.url, content=b"{not json", headers=self._headers(), timeout=self.timeout
+        )
+        if not 400 <= malformed.status_code < 500:
+            return False, f"Malformed JSON answered with HTTP {malformed.status_code}"
+
+        invalid = await self._send({"jsonrpc": "2.0", "id": 0}, self._headers(), 0)
+        if invalid.status < 400 and invalid.error is None:
+            return False, "Request without a method was accepted"
+        return True, None
+
+    async def _check_headers(self) -> Tuple[bool, str | None]:
+        reply = await self._rpc("initialize", self._initialize_params(), session=False)
+        session_id = reply.headers.get("mcp-session-id")
+        await self._terminate_session(session_id)
+        if reply.status >= 400:
+            return False, f"initialize answered with HTTP {reply.status}"
+
+        content_type = reply.headers.get("content-type", "")
+        if not content_type.startswith(("application/json", "text/event-stream")):
+            return False, f"Unexpected Content-Type: {content_type or 'missing'}"
+        if session_id and not all(0x21 <= ord(char) <= 0x7E for char in session_id):
+            return False, "Mcp-Session-Id contains non-visible ASCII characters"
+        return True, None
+
+    # -- session chain -----------------------------------------------------
+
+    async def _check_initialize(self) -> Tuple[bool, str | None]:
+        reply = await self._rpc("initialize", self._initialize_params(), session=False)
+        result = reply.result
+        if reply.status >= 400 or result is None:
+            return False, f"initialize failed (HTTP {reply.status})"
+
+        self.session_id = reply.headers.get("mcp-session-id")
+        self.negotiated_version = result.get("protocolVersion")
+        status = await self._notify("notifications/initialized")
+        if status >= 400:
+            return False, f"notifications/initialized answered with HTTP {status}"
+        return True, None
+
+    async def _check_tools(self) -> Tuple[bool, str | None]:
+        tools: List[Dict[str, Any]] = []
+        cursor: str | None = None
+        for _ in range(ASYNC_VALIDATOR_MAX_TOOL_PAGES):
+            reply = await self._rpc("tools/list", {"cursor": cursor} if cursor else {})
+            result = reply.result
+            if result is None or not isinstance(result.get("tools"), list):
+                return False, f"tools/list failed (HTTP {reply.status})"
+            tools.extend(result["tools"])
+            cursor = result.get("nextCursor")
+            if not cursor:
+                break
+        self.tools = tools
+        return True, f"tools/list returned {len(tools)} tools"
+
+    async def _check_async_tools(self) -> Tuple[bool | None, str | None]:
+        sleep_tool = next(
+            (
+                tool
+                for tool in self.tools
+                if "sleep" in tool.get("name", "").lower() and _safe_to_invoke(tool)
+            ),
+            None,
+        )
+        if sleep_tool is None:
+            return None, "No read-only, argument-free sleep tool exposed; check not run"
+
+        replies = await asyncio.gather(
+            self._call_tool(sleep_tool["name"], {}),
+            self._call_tool(sleep_tool["name"], {}),
+        )
+        if all(reply.result is not None and not reply.result.get("isError") for reply in replies):
+            return True, None
+        return False, None
+
+    async def _check_available_tools(self) -> Tuple[bool | None, str | None]:
+        candidates = [tool for tool in self.tools if _safe_to_invoke(tool)]
+        candidates = candidates[:ASYNC_VALIDATOR_MAX_TOOL_CALLS]
+        if not candidates:
+            return None, "No read-only, argument-free tools to invoke"
+
+        replies = await asyncio.gather(*(self._call_tool(tool["name"], {}) for tool in candidates))
+        failures: List[str] = []
+        for tool, reply in zip(candidates, replies):
+            result = reply.result
+            if result is None or result.get("isError"):
+                failures.append(tool["name"])
+            else:
+                self.tool_results[tool["name"]] = result
+        if failures:
+            return False, f"Tool invocation failures: {', '.join(failures)}"
+        return True, f"Invoked {len(candidates)} read-only tools"
+
+    async def _check_structured_output(self) -> Tuple[bool | None, str | None]:
+        declared = [tool["name"] for tool in self.tools if tool.get("outputSchema")]
+        if not declared:
+            return None, "No tools declare outputSchema"
+        verified = [name for name in declared if name in self.tool_results]
+        missing = [name for name in verified if "structuredContent" not in self.tool_results[name]]
+        if missing:
+            return False, f"structuredContent missing for: {', '.join(missing)}"
+        if not verified:
+            return None, "outputSchema declared but no tool was safe to invoke"
+        return True, None
+
+    async def _check_batch_rejection(self) -> Tuple[bool, str | None]:
+        payload = [
+            {"jsonrpc": "2.0", "id": next(self._ids), "method": "ping"},
+            {"jsonrpc": "2.0", "id": next(self._ids), "method": "ping"},
+        ]
+        reply = await self._send(payload, self._headers(session_id=self.session_id), None)
+        if reply.status >= 400 or reply.error is not None:
+            return True, None
+        return False, "Server processed a JSON-RPC batch"
+
+    async def _check_elicitation(self) -> Tuple[bool | None, str | None]:
+        # Elicitation is a server-initiated request sent mid tool call; nothing
+        # the validator may safely invoke is known to trigger one, so the
+        # capability cannot be probed from the client side.
+        return None, "Elicitation is only observable from a server-initiated request; check not run"
+
+    async def _check_protocol_negotiation(self) -> Tuple[bool, str | None]:
+        reply = await self._rpc(
+            "initialize",
+            self._initialize_params(UNSUPPORTED_PROTOCOL_PROBE),
+            session=False,
+        )
+        await self._terminate_session(reply.headers.get("mcp-session-id"))
+        result = reply.result
+        if result is not None:
+            offered = result.get("protocolVersion")
+            if offered and offered != UNSUPPORTED_PROTOCOL_PROBE:
+                return True, f"Server offered {offered} for an unsupported version"
+            return False, "Server accepted an unsupported protocol version"
+        if reply.error is not None or 400 <= reply.status < 500:
+            return True, "Server rejected an unsupported protocol version"
+        return False, f"Unexpected HTTP {reply.status}"
+
+
+async def _run_async_validator_component(job: ScanJob, storage_dir: Path) -> Dict[str, Any]:
+    log_path = storage_dir / f"validator_{job.job_id}.log"
+    job.artifacts["validatorLog"] = str(log_path)
+
+    sink = _JobLogSink(log_path)
+    try:
+        engine = AsyncValidatorEngine(job, http_pool.client, sink)
+        check_results = await engine.run()
+    finally:
+        sink.close()
+
+    provider = {
+        "version": get_version(),
+        "engine": "async",
+        "http2": HTTP2_AVAILABLE,
+        "runId": job.job_id,
+    }
+    return _validator_component_result(job, check_results, log_path, provider)
 
-    async with jobs_lock:
-        job.status = "succeeded"
-        job.finished_at = datetime.now(timezone.utc)
-        job.result = combined
+
+async def _run_validator(job: ScanJob, storage_dir: Path) -> Dict[str, Any]:
+    if VALIDATOR_ENGINE == "async":
+        return await _run_async_validator_component(job, storage_dir)
+    return await asyncio.to_thread(_run_mcp_validator_component, job, storage_dir)
 
 
 # ---------------------------------------------------------------------------
-# Routes
+# Artifact storage
 # ---------------------------------------------------------------------------
 
 
-class HealthResponse(BaseModel):
-    status: str
-    version: str
-    service: str
+# Stored form of an artifact: the logical path in ``job.artifacts`` plus one
+# of these suffixes. Artifacts keep their logical path everywhere (results,
+# the incremental pointer); readers resolve the stored file on open.
+ARTIFACT_ENCODINGS: Tuple[Tuple[str, str | None], ...] = (("", None), (".zst", "zstd"), (".gz", "gzip"))
+ARTIFACT_CHUNK_SIZE = 64 * 1024
+# Artifacts never change once their job has finished.
+ARTIFACT_CACHE_CONTROL = "private, max-age=86400, immutable"
 
 
-@app.get("/", response_model=HealthResponse)
-async def root() -> HealthResponse:
-    return HealthResponse(status="healthy", version=get_version(), service="backend")
+def _stored_artifact(path: Path) -> Tuple[Path, str | None] | None:
+    """The file backing a logical artifact path and its content encoding."""
 
+    for suffix, encoding in ARTIFACT_ENCODINGS:
+        candidate = path.with_name(path.name + suffix)
+        if candidate.is_file():
+            return candidate, encoding
+    return None
 
-@app.get("/api/hello")
-async def hello(name: str = "World") -> Dict[str, str]:
-    return {"message": f"Hello, {name}!"}
 
+@contextmanager
+def _open_stored_artifact(stored: Path, encoding: str | None) -> Iterator[io.BufferedIOBase]:
+    """Open a stored artifact file, decoding ``encoding`` while reading."""
 
-@app.post("/api/security/scans", response_model=ScanJobCreated, status_code=202)
-async def create_scan_job(payload: ScanRequest) -> ScanJobCreated:
-    job_id = uuid.uuid4().hex
-    job = ScanJob(job_id=job_id, request=payload)
+    with stored.open("rb") as raw:
+        if encoding == "zstd":
+            if zstandard is None:
+                raise OSError(f"{stored.name} is zstd-compressed but zstandard is not installed")
+            with zstandard.ZstdDecompressor().stream_reader(raw) as stream:
+                yield stream
+        elif encoding == "gzip":
+            with gzip.GzipFile(fileobj=raw, mode="rb") as stream:
+                yield stream
+        else:
+            yield raw
 
-    async with jobs_lock:
-        jobs[job_id] = job
 
-    task = asyncio.create_task(_run_scan_job(job_id))
-    active_tasks.add(task)
-    task.add_done_callback(active_tasks.discard)
+@contextmanager
+def _open_artifact(path: Path) -> Iterator[io.BufferedIOBase]:
+    """Open an artifact by its logical path, decompressing it if it is stored compressed."""
 
-    return ScanJobCreated(job_id=job_id, status=job.status)
+    for suffix, encoding in ARTIFACT_ENCODINGS:
+        with ExitStack() as stack:
+            try:
+                stream = stack.enter_context(_open_stored_artifact(path.with_name(path.name + suffix), encoding))
+            except FileNotFoundError:
+                continue
+            yield stream
+            return
+    raise FileNotFoundError(str(path))
+
+
+def _artifact_size(stored: Path, encoding: str | None) -> int:
+    """Decoded length of a stored artifact.
+
+    zstd frames written by ``_compress_artifact`` record it in their header
+    and gzip keeps it (mod 2**32, far above any scan log) in its trailer, so
+    compressed artifacts are only decoded to measure them as a last resort.
+    """
+
+    if encoding is None:
+        return stored.stat().st_size
+    with stored.open("rb") as handle:
+        if encoding == "zstd" and zstandard is not None:
+            try:
+                size: int = zstandard.frame_content_size(handle.read(18))
+            except zstandard.ZstdError:
+                size = -1
+            if size >= 0:
+                return size
+        elif encoding == "gzip":
+            handle.seek(-4, os.SEEK_END)
+            return int.from_bytes(handle.read(4), "little")
+    size = 0
+    with _open_stored_artifact(stored, encoding) as stream:
+        while chunk := stream.read(ARTIFACT_CHUNK_SIZE):
+            size += len(chunk)
+    return size
+
+
+def _iter_artifact_range(stored: Path, encoding: str | None, start: int, length: int) -> Iterator[bytes]:
+    """Decoded bytes ``start`` to ``start + length`` of a stored artifact, chunk by chunk."""
+
+    with _open_stored_artifact(stored, encoding) as stream:
+        while start > 0:
+            skipped = len(stream.read(min(start, ARTIFACT_CHUNK_SIZE)))
+            if not skipped:
+                return
+            start -= skipped
+        while length > 0:
+            chunk = stream.read(min(length, ARTIFACT_CHUNK_SIZE))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def _read_artifact_text(path: Path) -> str:
+    with _open_artifact(path) as stream:
+        return stream.read().decode("utf-8")
+
+
+def _compress_artifact(path: Path, encoding: str) -> Path | None:
+    """Replace an uncompressed artifact with its compressed form, returning the new file."""
+
+    suffix = ".zst" if encoding == "zstd" else ".gz"
+    target = path.with_name(path.name + suffix)
+    tmp_path = target.with_name(f".{target.name}.{uuid.uuid4().hex}")
+    try:
+        with path.open("rb") as source, tmp_path.open("wb") as sink:
+            if encoding == "zstd":
+                # Recording the size lets ``_artifact_size`` skip decoding.
+                size = os.fstat(source.fileno()).st_size
+                assert zstandard is not None
+                zstandard.ZstdCompressor(level=10).copy_stream(source, sink, size=size)
+            else:
+                with gzip.GzipFile(fileobj=sink, mode="wb", compresslevel=6, mtime=0) as stream:
+                    shutil.copyfileobj(source, stream)
+        shutil.copystat(path, tmp_path)
+        os.replace(tmp_path, target)
+    except FileNotFoundError:
+        tmp_path.unlink(missing_ok=True)
+        return None
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    # The compressed copy is in place before the original goes, so readers
+    # going through ``_open_artifact`` always find one of them.
+    path.unlink(missing_ok=True)
+    return target
 
 
-@app.get("/api/security/scans/{job_id}", response_model=ScanJobStatus)
-async def get_scan_job(job_id: str) -> ScanJobStatus:
-    async with jobs_lock:
-        job = jobs.get(job_id)
-        if job is None:
-            raise HTTPException(status_code=404, detail="Job not found")
+def _artifact_compression(path: Path) -> str:
+    """Encoding to store ``path`` with; logs stay plain so Range reads can seek."""
 
-        return ScanJobStatus(
-            job_id=job.job_id,
-            status=job.status,
-            created_at=job.created_at,
-            started_at=job.started_at,
-            finished_at=job.finished_at,
-            result=job.result,
-            error=job.error,
-        )
+    return "none" if path.suffix == ".log" else ARTIFACT_COMPRESSION
 
 
-@app.delete("/api/security/scans/{job_id}", status_code=204)
-async def delete_scan_job(job_id: str) -> JSONResponse:
-    async with jobs_lock:
-        job = jobs.pop(job_id, None)
-    if job is None:
-        raise HTTPException(status_code=404, detail="Job not found")
+def _store_job_artifacts(job: ScanJob) -> None:
+    """Compress and deduplicate a job's artifacts once nothing writes to them."""
 
-    return JSONResponse(status_code=204, content=None)
+    for artifact in set(job.artifacts.values()):
+        path = Path(artifact)
+        compression = _artifact_compression(path)
+        try:
+            stored = _compress_artifact(path, compression) if compression != "none" else path
+            if stored is not None:
+                artifact_store.intern(stored)
+        except OSError as exc:
+            logger.warning("Could not store artifact %s: %s", artifact, exc)
 
 
-@app.post("/api/repos", response_model=RepositoryResponse)
-async def create_repository(payload: RepositoryCreateRequest) -> RepositoryResponse:
-    repo_id = uuid.uuid4().hex
-    now = datetime.now(timezone.utc)
-    repo = RepositoryRecord(
+# ---------------------------------------------------------------------------
+# Artifact retention
+# ---------------------------------------------------------------------------
+
+
+# ``<kind>_<job id>.<ext>`` plus an optional compression suffix, as written
+# into the per-server dirs by the scan components.
+_ARTIFACT_NAME = re.compile(r"^[a-z]+_(?P<job_id>[0-9a-f]{32})\.(?:json|log)(?:\.zst|\.gz)?$")
+_SERVER_DIR_NAME = re.compile(r"^[0-9a-f]{16}$")
+# Leftovers of interrupted atomic writes (``.<name>.<uuid>``).
+_PARTIAL_FILE_NAME = re.compile(r"^\..+\.[0-9a-f]{32}$")
+
+
+@dataclass
+class ArtifactGroup:
+    """Every stored artifact of one job in one server dir."""
+
+    server_dir: Path
+    job_id: str
+    files: List[Tuple[Path, os.stat_result]] = field(default_factory=list)
+    # From the job store; None once the job has expired from it.
+    finished_at: float | None = None
+
+    @property
+    def age(self) -> float:
+        """When the job finished, or its newest file's mtime for an expired job."""
+
+        if self.finished_at is not None:
+            return self.finished_at
+        return max(stat.st_mtime for _, stat in self.files)
+
+
+class ArtifactStore:
+    """Deduplication and retention for scan artifacts under the storage root.
+
+    ``intern`` hard-links a finished artifact to a content-addressed blob in
+    ``blobs/``, so identical output takes disk space once. A blob left with
+    no other link is garbage. Hard links share one mtime, so retention
+    orders jobs by their ``finished_at`` in the job store instead.
+
+    ``digest`` returns a stored file's SHA-256, which downloads use as their
+    ETag. ``intern`` remembers the digests it computes, so a file is only
+    hashed again after a restart or when deduplication is off.
+
+    ``compact`` applies the retention policy per job: a job's artifacts are
+    kept or dropped together. It only considers ``<kind>_<job>`` files in
+    per-server dirs. The scan cache, OAuth state, the job database and
+    mcp-scan's own storage files are never touched. Neither are the
+    artifacts of queued or running jobs or a server's incremental baseline
+    (``latest_scan.json``).
+    """
+
+    # Partial files and ``tmp-*`` dirs older than this belong to nothing
+    # that is still running.
+    TMP_GRACE_SECONDS = 3600.0
+    DIGEST_CACHE_SIZE = 4096
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        keep_per_server: int,
+        max_age_seconds: float,
+        max_bytes: int,
+        dedup: bool = True,
+    ) -> None:
+        self.root = root
+        self.blob_root = root / "blobs"
+        self.keep_per_server = keep_per_server
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self.dedup = dedup
+        self._lock = threading.Lock()
+        self.deduplicated = 0
+        self.bytes_deduplicated = 0
+        # (device, inode, size, mtime) -> SHA-256; hard links share the key.
+        self._digests: OrderedDict[Tuple[int, int, int, int], str] = OrderedDict()
+
+    def digest(self, path: Path, stat: os.stat_result) -> str:
+        """SHA-256 of the stored file ``path`` whose ``stat`` is given."""
+
+        key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(key)
+            if digest is not None:
+                self._digests.move_to_end(key)
+                return digest
+        with path.open("rb") as handle:
+            digest = file_digest(handle, "sha256").hexdigest()
+        self._remember_digest(stat, digest)
+        return digest
+
+    def _remember_digest(self, stat: os.stat_result, digest: str) -> None:
+        with self._lock:
+            self._digests[(stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)] = digest
+            while len(self._digests) > self.DIGEST_CACHE_SIZE:
+                self._digests.popitem(last=False)
+
+    def intern(self, path: Path) -> None:
+        """Replace ``path`` with a link to the blob holding the same bytes."""
+
+        if not self.dedup:
+            return
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return
+        if stat.st_nlink > 1:
+            return
+        with path.open("rb") as handle:
+            digest = file_digest(handle, "sha256").hexdigest()
+        suffix = next((suffix for suffix, _ in ARTIFACT_ENCODINGS if suffix and path.name.endswith(suffix)), "")
+        blob = self.blob_root / digest[:2] / f"{digest}{suffix}"
+
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+        try:
+            os.link(blob, tmp_path)
+        except FileNotFoundError:
+            # First copy of these bytes: it becomes the blob.
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            blob_tmp = blob.with_name(f".{blob.name}.{uuid.uuid4().hex}")
+            os.link(path, blob_tmp)
+            os.replace(blob_tmp, blob)
+            self._remember_digest(stat, digest)
+            return
+        try:
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._remember_digest(path.stat(), digest)
+        with self._lock:
+            self.deduplicated += 1
+            self.bytes_deduplicated += stat.st_size
+
+    def sweep_temp_dirs(self, *, older_than: float | None = None) -> int:
+        """Remove ``tmp-*`` scan dirs left behind by a process that died mid-scan."""
+
+        cutoff = None if older_than is None else time.time() - older_than
+        removed = 0
+        for path in self.root.glob("tmp-*"):
+            try:
+                if not path.is_dir() or (cutoff is not None and path.stat().st_mtime >= cutoff):
+                    continue
+            except FileNotFoundError:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+        return removed
+
+    def compact(
+        self,
+        active_jobs: Callable[[], set[str]],
+        finished_at: Callable[[Iterable[str]], Dict[str, float]],
+    ) -> Dict[str, Any]:
+        """Backfill compression and deduplication, then apply retention.
+
+        ``active_jobs`` is called after the directory scan, so a job created
+        while it runs cannot be mistaken for a finished one. ``finished_at``
+        maps job ids to when they finished.
+        """
+
+        groups = self._scan_groups()
+        protected = active_jobs() | self._baseline_jobs()
+        for group in groups:
+            if group.job_id not in protected:
+                self._backfill(group)
+
+        groups = [group for group in self._scan_groups() if group.files]
+        finished = finished_at({group.job_id for group in groups})
+        for group in groups:
+            group.finished_at = finished.get(group.job_id)
+        evicted = self._select_evictions(groups, protected)
+        files_removed = 0
+        for group in evicted:
+            for path, _ in group.files:
+                path.unlink(missing_ok=True)
+                files_removed += 1
+        blobs_removed, bytes_freed = self._collect_blobs()
+        return {
+            "jobsEvicted": len(evicted),
+            "filesRemoved": files_removed,
+            "blobsRemoved": blobs_removed,
+            "bytesFreed": bytes_freed,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"deduplicated": self.deduplicated, "bytesDeduplicated": self.bytes_deduplicated}
+
+    def _server_dirs(self) -> List[Path]:
+        if not self.root.is_dir():
+            return []
+        return [path for path in self.root.iterdir() if _SERVER_DIR_NAME.match(path.name) and path.is_dir()]
+
+    def _scan_groups(self) -> List[ArtifactGroup]:
+        groups: Dict[Tuple[Path, str], ArtifactGroup] = {}
+        stale_before = time.time() - self.TMP_GRACE_SECONDS
+        for server_dir in self._server_dirs():
+            for path in server_dir.iterdir():
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                if _PARTIAL_FILE_NAME.match(path.name):
+                    if stat.st_mtime < stale_before:
+                        path.unlink(missing_ok=True)
+                    continue
+                match = _ARTIFACT_NAME.match(path.name)
+                if match is None:
+                    continue
+                key = (server_dir, match["job_id"])
+                group = groups.get(key)
+                if group is None:
+                    group = groups[key] = ArtifactGroup(server_dir, match["job_id"])
+                group.files.append((path, stat))
+        return list(groups.values())
+
+    def _baseline_jobs(self) -> set[str]:
+        baselines: set[str] = set()
+        for server_dir in self._server_dirs():
+            try:
+                pointer = json.loads((server_dir / LATEST_SCAN_POINTER).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if isinstance(pointer, dict) and pointer.get("jobId"):
+                baselines.add(pointer["jobId"])
+        return baselines
+
+    def _backfill(self, group: ArtifactGroup) -> None:
+        for path, stat in group.files:
+            try:
+                stored: Path | None = path
+                compression = _artifact_compression(path)
+                if compression != "none" and not path.name.endswith((".zst", ".gz")):
+                    stored = _compress_artifact(path, compression)
+                elif stat.st_nlink > 1:
+                    continue
+                if stored is not None:
+                    self.intern(stored)
+            except OSError as exc:
+                logger.warning("Could not compact artifact %s: %s", path, exc)
+
+    def _select_evictions(self, groups: List[ArtifactGroup], protected: set[str]) -> List[ArtifactGroup]:
+        evicted: Dict[int, ArtifactGroup] = {}
+
+        by_server: Dict[Path, List[ArtifactGroup]] = defaultdict(list)
+        for group in groups:
+            by_server[group.server_dir].append(group)
+        if self.keep_per_server:
+            for server_groups in by_server.values():
+                server_groups.sort(key=lambda group: group.age, reverse=True)
+                for group in server_groups[self.keep_per_server:]:
+                    evicted[id(group)] = group
+        if self.max_age_seconds > 0:
+            cutoff = time.time() - self.max_age_seconds
+            for group in groups:
+                if group.age < cutoff:
+                    evicted[id(group)] = group
+        for group in groups:
+            if group.job_id in protected:
+                evicted.pop(id(group), None)
+
+        if self.max_bytes:
+            # Hard links share an inode; its bytes are freed with the last one.
+            inodes: Dict[Tuple[int, int], List[int]] = {}
+            for group in groups:
+                for _, stat in group.files:
+                    entry = inodes.setdefault((stat.st_dev, stat.st_ino), [stat.st_size, 0])
+                    entry[1] += 1
+
+            def release(group: ArtifactGroup) -> int:
+                freed = 0
+                for _, stat in group.files:
+                    entry = inodes[(stat.st_dev, stat.st_ino)]
+                    entry[1] -= 1
+                    if entry[1] == 0:
+                        freed += entry[0]
+                return freed
+
+            total = sum(size for size, _ in inodes.values())
+            for group in evicted.values():
+                total -= release(group)
+            for group in sorted(groups, key=lambda group: group.age):
+                if total <= self.max_bytes:
+                    break
+                if id(group) in evicted or group.job_id in protected:
+                    continue
+                evicted[id(group)] = group
+                total -= release(group)
+
+        return list(evicted.values())
+
+    def _collect_blobs(self) -> Tuple[int, int]:
+        removed = freed = 0
+        stale_before = time.time() - self.TMP_GRACE_SECONDS
+        for path in self.blob_root.glob("*/*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            partial = path.name.startswith(".")
+            if (partial and stat.st_mtime < stale_before) or (not partial and stat.st_nlink == 1):
+                path.unlink(missing_ok=True)
+                removed += 1
+                freed += stat.st_size
+        return removed, freed
+
+
+artifact_store = ArtifactStore(
+    MCP_SCAN_STORAGE_ROOT,
+    keep_per_server=ARTIFACT_KEEP_PER_SERVER,
+    max_age_seconds=ARTIFACT_MAX_AGE_SECONDS,
+    max_bytes=ARTIFACT_MAX_BYTES,
+    dedup=ARTIFACT_DEDUP,
+)
+
+
+async def _compact_artifacts() -> None:
+    while True:
+        try:
+            summary = await asyncio.to_thread(artifact_store.compact, jobs.active_ids, jobs.finished_times)
+            if summary["jobsEvicted"] or summary["blobsRemoved"]:
+                logger.info("Artifact compaction: %s", summary)
+        except (OSError, sqlite3.Error):
+            logger.exception("Artifact compaction failed")
+        await asyncio.sleep(ARTIFACT_COMPACT_INTERVAL_SECONDS)
+
+
+# ---------------------------------------------------------------------------
+# Scan result cache
+# ---------------------------------------------------------------------------
+
+
+# Bump whenever check or evidence construction changes in a way the rubric
+# tables do not capture; stale entries then simply stop matching.
+SCAN_RUBRIC_VERSION = 1
+
+
+def _rubric_fingerprint() -> str:
+    material = json.dumps(
+        {
+            "version": SCAN_RUBRIC_VERSION,
+            "rubric": CHECK_RUBRIC,
+            "weights": DEFAULT_WEIGHT_BY_SEVERITY,
+            "toxicFlowMaxEdges": TOXIC_FLOW_MAX_EDGES,
+        },
+        sort_keys=True,
+    )
+    return sha256(material.encode("utf-8")).hexdigest()[:16]
+
+
+RUBRIC_FINGERPRINT = _rubric_fingerprint()
+
+
+def _signature_cache_key(raw: Dict[str, Any]) -> str | None:
+    """Hash every server signature in an mcp-scan/inspect result.
+
+    Returns ``None`` when the result cannot be cached: no servers, or a server
+    that failed to report a signature.
+    """
+
+    if not raw:
+        return None
+    _, payload = next(iter(raw.items()))
+    if payload.get("error"):
+        return None
+    signatures = []
+    for server in payload.get("servers", []):
+        signature = server.get("signature") if isinstance(server, dict) else None
+        if not isinstance(signature, dict) or server.get("error"):
+            return None
+        signatures.append(signature)
+    if not signatures:
+        return None
+    canonical = json.dumps(signatures, sort_keys=True, separators=(",", ":"))
+    return sha256(f"{RUBRIC_FINGERPRINT}:{canonical}".encode("utf-8")).hexdigest()
+
+
+class ScanResultCache:
+    """Disk-backed LRU of normalised mcp-scan checks.
+
+    Entries are JSON files named by their key. Reads bump the file mtime, and
+    writes that push the directory over ``max_bytes`` evict the oldest entries.
+    Blocking I/O; call from a worker thread.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._bytes: int | None = None
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def _scan_entries(self) -> List[Tuple[float, int, Path]]:
+        entries: List[Tuple[float, int, Path]] = []
+        if not self.root.exists():
+            return entries
+        for path in self.root.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def get(self, key: str) -> Dict[str, Any] | None:
+        path = self._path(key)
+        entry: Dict[str, Any] | None
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            if not isinstance(entry, dict):
+                raise ValueError("scan cache entry is not a JSON object")
+            os.utime(path)
+        except FileNotFoundError:
+            entry = None
+        except (OSError, ValueError):
+            logger.warning("Dropping unreadable scan cache entry %s", path)
+            path.unlink(missing_ok=True)
+            entry = None
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        if self.max_bytes <= 0:
+            return
+        data = json.dumps(entry, separators=(",", ":")).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self.stores += 1
+            if self._bytes is None:
+                self._bytes = sum(size for _, size, _ in self._scan_entries())
+            else:
+                self._bytes += len(data)
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        entries = sorted(self._scan_entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+        self._bytes = total
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._scan_entries()
+            self._bytes = sum(size for _, size, _ in entries)
+            lookups = self.hits + self.misses
+            return {
+                "enabled": SCAN_CACHE_ENABLED,
+                "preflight": SCAN_CACHE_PREFLIGHT,
+                "rubricVersion": SCAN_RUBRIC_VERSION,
+                "rubricFingerprint": RUBRIC_FINGERPRINT,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 3) if lookups else None,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "entries": len(entries),
+                "bytes": self._bytes,
+                "maxBytes": self.max_bytes,
+            }
+
+
+scan_result_cache = ScanResultCache(SCAN_CACHE_ROOT, SCAN_CACHE_MAX_BYTES)
+
+
+def _scan_cache_entry(
+    key: str,
+    checks: Dict[str, Dict[str, Any]],
+    *,
+    issues_found: int,
+    tools_analyzed: int,
+) -> Dict[str, Any]:
+    return {
+        "key": key,
+        "rubricVersion": SCAN_RUBRIC_VERSION,
+        "storedAt": datetime.now(timezone.utc).isoformat(),
+        "issuesFound": issues_found,
+        "toolsAnalyzed": tools_analyzed,
+        "checks": {check_id: check for check_id, check in checks.items() if check_id != "SCAN-SUMMARY"},
+    }
+
+
+def _scan_result_from_cache(
+    entry: Dict[str, Any],
+    job: ScanJob,
+    *,
+    config_path: str,
+    report_path: Path,
+    mode: List[str],
+) -> Dict[str, Any]:
+    return _scan_security_result(
+        entry["checks"],
+        job,
+        config_path=config_path,
+        issues_found=entry.get("issuesFound", 0),
+        tools_analyzed=entry.get("toolsAnalyzed", 0),
+        report_path=report_path,
+        mode=mode,
+        cache={"hit": True, "key": entry["key"], "storedAt": entry.get("storedAt")},
+    )
+
+
+# ---------------------------------------------------------------------------
+# Incremental rescans
+# ---------------------------------------------------------------------------
+
+
+# Per-server pointer (inside ``_job_storage_dir``) to the last successful
+# mcp-scan output, used as the baseline for incremental rescans.
+LATEST_SCAN_POINTER = "latest_scan.json"
+
+EntityKey = Tuple[int, str, str]
+
+
+def _entity_key(entity: SignatureEntity) -> EntityKey:
+    return (entity.server_index, entity.kind, entity.name)
+
+
+def _entity_label(entity: SignatureEntity) -> Dict[str, str]:
+    return {"kind": entity.kind, "name": entity.name}
+
+
+def _entity_fingerprint(entity: SignatureEntity) -> str:
+    return sha256(json.dumps(entity.data, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SignatureDiff:
+    unchanged: List[SignatureEntity] = field(default_factory=list)
+    added: List[SignatureEntity] = field(default_factory=list)
+    modified: List[SignatureEntity] = field(default_factory=list)
+    removed: List[SignatureEntity] = field(default_factory=list)
+    metadata_changed: bool = False
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.modified or self.removed or self.metadata_changed)
+
+    def summary(self, base_job_id: str | None, *, scan_skipped: bool) -> Dict[str, Any]:
+        return {
+            "baseJobId": base_job_id,
+            "scanSkipped": scan_skipped,
+            "metadataChanged": self.metadata_changed,
+            "reused": [_entity_label(entity) for entity in self.unchanged],
+            "reanalysed": [_entity_label(entity) for entity in self.added + self.modified],
+            "removed": [_entity_label(entity) for entity in self.removed],
+        }
+
+
+def _diff_signatures(previous: SignatureIndex, current: SignatureIndex) -> SignatureDiff:
+    """Compare entities by (server, kind, name) and content fingerprint."""
+
+    diff = SignatureDiff(metadata_changed=previous.metadata != current.metadata)
+    previous_entities = {_entity_key(entity): entity for entity in previous.entities()}
+    seen: set[EntityKey] = set()
+    for entity in current.entities():
+        key = _entity_key(entity)
+        if key in seen:
+            continue
+        seen.add(key)
+        prior = previous_entities.get(key)
+        if prior is None:
+            diff.added.append(entity)
+        elif _entity_fingerprint(prior) != _entity_fingerprint(entity):
+            diff.modified.append(entity)
+        else:
+            diff.unchanged.append(entity)
+    diff.removed = [entity for key, entity in previous_entities.items() if key not in seen]
+    return diff
+
+
+def _load_incremental_base(storage_dir: Path) -> Tuple[str | None, Dict[str, Any]] | None:
+    """Return ``(job_id, payload)`` of the last stored scan for this server."""
+
+    try:
+        pointer = json.loads((storage_dir / LATEST_SCAN_POINTER).read_text(encoding="utf-8"))
+        raw = json.loads(_read_artifact_text(Path(pointer["scanJson"])))
+        _, payload = next(iter(raw.items()))
+    except (OSError, ValueError, KeyError, StopIteration, AttributeError) as exc:
+        logger.info("No usable incremental baseline in %s: %s", storage_dir, exc)
+        return None
+    return pointer.get("jobId"), payload
+
+
+def _record_incremental_base(storage_dir: Path, job: ScanJob, scan_json: Path) -> None:
+    pointer = {
+        "jobId": job.job_id,
+        "scanJson": str(scan_json),
+        "updatedAt": datetime.now(timezone.utc).isoformat(),
+    }
+    path = storage_dir / LATEST_SCAN_POINTER
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+    tmp_path.write_text(json.dumps(pointer), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _remap_reference(reference: Any, previous: SignatureIndex, current: SignatureIndex) -> Any:
+    """Translate a ``[server_idx, entity_idx]`` reference between signatures.
+
+    Server-level references (no entity index) pass through; references to
+    entities that no longer exist map to ``None``.
+    """
+
+    if isinstance(reference, (list, tuple)) and len(reference) == 2 and reference[1] is None:
+        return list(reference)
+    entity = previous.by_reference(reference)
+    if entity is None:
+        return None
+    moved = current.by_name(entity.server_index, entity.name, entity.kind)
+    if moved is None:
+        return None
+    return [moved.server_index, moved.entity_index]
+
+
+def _remap_issue(
+    issue: Dict[str, Any],
+    previous: SignatureIndex,
+    current: SignatureIndex,
+) -> Dict[str, Any] | None:
+    remapped = copy.deepcopy(issue)
+    if remapped.get("reference") is not None:
+        remapped["reference"] = _remap_reference(remapped["reference"], previous, current)
+        if remapped["reference"] is None:
+            return None
+
+    extra = remapped.get("extra_data")
+    if isinstance(extra, dict):
+        for value in extra.values():
+            if not isinstance(value, list):
+                continue
+            for item in value:
+                if isinstance(item, dict) and item.get("reference") is not None:
+                    item["reference"] = _remap_reference(item["reference"], previous, current)
+                    if item["reference"] is None:
+                        return None
+    return remapped
+
+
+# ---------------------------------------------------------------------------
+# Job execution
+# ---------------------------------------------------------------------------
+
+
+class WarmWorkerUnavailable(RuntimeError):
+    """Raised when no resident mcp-scan worker can take a job."""
+
+
+class WarmWorkerDied(WarmWorkerUnavailable):
+    """Raised when a resident mcp-scan worker was lost in the middle of a scan."""
+
+
+class ScanTimeoutError(RuntimeError):
+    """Raised when an mcp-scan run exceeds the backend's wall-clock deadline."""
+
+
+class ScanCancelledError(RuntimeError):
+    """Raised from worker threads once their job has been cancelled."""
+
+
+def _raise_if_cancelled(job: ScanJob) -> None:
+    if job.cancel_event.is_set():
+        raise ScanCancelledError(f"Job {job.job_id} was cancelled")
+
+
+def _signal_process_group(process: aio_subprocess.Process, sig: int) -> None:
+    if process.returncode is not None:
+        return
+    try:
+        os.killpg(process.pid, sig)
+    except ProcessLookupError:
+        pass
+
+
+async def _terminate_process_group(process: aio_subprocess.Process) -> None:
+    """SIGTERM the process group, escalating to SIGKILL after a grace period."""
+
+    if process.returncode is not None:
+        return
+    _signal_process_group(process, signal.SIGTERM)
+    try:
+        await asyncio.wait_for(process.wait(), SCAN_KILL_GRACE_SECONDS)
+    except asyncio.TimeoutError:
+        _signal_process_group(process, signal.SIGKILL)
+        await process.wait()
+
+
+@dataclass
+class _WarmScanWorker:
+    process: aio_subprocess.Process
+    jobs_run: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class McpScanWorkerPool:
+    """Pool of long-lived mcp-scan processes speaking ``mcp_scan_worker.py``.
+
+    Idle workers are health-checked with a ping before reuse and recycled
+    after ``max_jobs`` scans. If a worker cannot be started the pool backs off
+    and callers fall back to the one-shot subprocess path.
+    """
+
+    START_TIMEOUT_SECONDS = 60.0
+    PING_TIMEOUT_SECONDS = 5.0
+    HEALTH_CHECK_AFTER_SECONDS = 30.0
+    SPAWN_BACKOFF_SECONDS = 60.0
+
+    def __init__(self, size: int, max_jobs: int) -> None:
+        self.size = size
+        self.max_jobs = max_jobs
+        self._idle: List[_WarmScanWorker] = []
+        self._slots = asyncio.Semaphore(max(size, 1))
+        self._disabled_until = 0.0
+
+    async def run(self, argv: List[str], stdout_path: Path, stderr_path: Path) -> int:
+        """Run one mcp-scan invocation on a warm worker and return its exit code."""
+
+        if self.size <= 0:
+            raise WarmWorkerUnavailable("warm worker pool disabled")
+        if time.monotonic() < self._disabled_until:
+            raise WarmWorkerUnavailable("warm worker pool backing off after spawn failure")
+
+        async with self._slots:
+            worker = await self._checkout()
+            try:
+                reply = await self._call(
+                    worker,
+                    {
+                        "op": "scan",
+                        "argv": argv,
+                        "stdout": str(stdout_path),
+                        "stderr": str(stderr_path),
+                    },
+                )
+            except WarmWorkerUnavailable as exc:
+                await self._discard(worker)
+                raise WarmWorkerDied(str(exc)) from exc
+            except BaseException:
+                await self._discard(worker)
+                raise
+            self._checkin(worker)
+
+        if not reply.get("ok"):
+            raise RuntimeError(f"mcp-scan worker rejected job: {reply.get('error')}")
+        return int(reply.get("returncode", 1))
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for worker in idle:
+            await self._discard(worker)
+
+    async def retire_idle(self, idle_seconds: float) -> int:
+        """Stop idle workers unused for ``idle_seconds``; returns how many."""
+
+        cutoff = time.monotonic() - idle_seconds
+        retired = [worker for worker in self._idle if worker.last_used < cutoff]
+        if not retired:
+            return 0
+        self._idle = [worker for worker in self._idle if worker.last_used >= cutoff]
+        for worker in retired:
+            await self._discard(worker)
+        return len(retired)
+
+    async def _checkout(self) -> _WarmScanWorker:
+        while self._idle:
+            worker = self._idle.pop()
+            if await self._healthy(worker):
+                return worker
+            await self._discard(worker)
+        return await self._spawn()
+
+    def _checkin(self, worker: _WarmScanWorker) -> None:
+        worker.jobs_run += 1
+        worker.last_used = time.monotonic()
+        if worker.jobs_run >= self.max_jobs or worker.process.returncode is not None:
+            task = asyncio.create_task(self._discard(worker))
+            active_tasks.add(task)
+            task.add_done_callback(active_tasks.discard)
+            return
+        self._idle.append(worker)
+
+    async def _healthy(self, worker: _WarmScanWorker) -> bool:
+        if worker.process.returncode is not None:
+            return False
+        if time.monotonic() - worker.last_used < self.HEALTH_CHECK_AFTER_SECONDS:
+            return True
+        try:
+            reply = await self._call(worker, {"op": "ping"}, timeout=self.PING_TIMEOUT_SECONDS)
+        except (WarmWorkerUnavailable, asyncio.TimeoutError, OSError):
+            return False
+        return bool(reply.get("ok"))
+
+    async def _spawn(self) -> _WarmScanWorker:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "uv",
+                "run",
+                "python",
+                "-u",
+                str(MCP_SCAN_WORKER_SCRIPT),
+                stdin=aio_subprocess.PIPE,
+                stdout=aio_subprocess.PIPE,
+                cwd=str(MCP_SCAN_ROOT),
+                start_new_session=True,
+            )
+        except OSError as exc:
+            self._disabled_until = time.monotonic() + self.SPAWN_BACKOFF_SECONDS
+            raise WarmWorkerUnavailable(f"could not start mcp-scan worker: {exc}") from exc
+
+        worker = _WarmScanWorker(process=process)
+        try:
+            ready = await self._read_reply(worker, timeout=self.START_TIMEOUT_SECONDS)
+        except (WarmWorkerUnavailable, asyncio.TimeoutError) as exc:
+            await self._discard(worker)
+            self._disabled_until = time.monotonic() + self.SPAWN_BACKOFF_SECONDS
+            raise WarmWorkerUnavailable(f"mcp-scan worker failed to start: {exc!r}") from exc
+
+        if not ready.get("ok"):
+            await self._discard(worker)
+            self._disabled_until = time.monotonic() + self.SPAWN_BACKOFF_SECONDS
+            raise WarmWorkerUnavailable(f"mcp-scan worker failed to start: {ready.get('error')}")
+
+        logger.info("Started warm mcp-scan worker pid=%s", process.pid)
+        return worker
+
+    async def _call(
+        self,
+        worker: _WarmScanWorker,
+        payload: Dict[str, Any],
+        timeout: float | None = None,
+    ) -> Dict[str, Any]:
+        stdin = worker.process.stdin
+        if stdin is None:
+            raise WarmWorkerUnavailable("worker stdin closed")
+        try:
+            stdin.write(json.dumps(payload).encode("utf-8") + b"\n")
+            await stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as exc:
+            raise WarmWorkerUnavailable(f"worker pipe closed: {exc}") from exc
+        return await self._read_reply(worker, timeout=timeout)
+
+    async def _read_reply(self, worker: _WarmScanWorker, timeout: float | None) -> Dict[str, Any]:
+        stdout = worker.process.stdout
+        if stdout is None:
+            raise WarmWorkerUnavailable("worker stdout closed")
+        line = await asyncio.wait_for(stdout.readline(), timeout)
+        if not line:
+            raise WarmWorkerUnavailable(f"worker exited with {worker.process.returncode}")
+        try:
+            reply = json.loads(line)
+        except ValueError as exc:
+            raise WarmWorkerUnavailable(f"worker sent an unreadable reply: {line[:200]!r}") from exc
+        if not isinstance(reply, dict):
+            raise WarmWorkerUnavailable(f"worker sent an unexpected reply: {line[:200]!r}")
+        return reply
+
+    async def _discard(self, worker: _WarmScanWorker) -> None:
+        await _terminate_process_group(worker.process)
+
+
+mcp_scan_worker_pool = McpScanWorkerPool(MCP_SCAN_WARM_WORKERS, MCP_SCAN_WORKER_MAX_JOBS)
+
+
+async def _run_mcp_scan_oneshot(argv: List[str], stdout_path: Path, stderr_path: Path) -> int:
+    cmd = ["uv", "run", "-m", "src.mcp_scan.run", *argv]
+
+    # Output streams straight to the artifact files so whatever the child
+    # wrote survives a deadline kill.
+    with stdout_path.open("wb") as stdout_file, stderr_path.open("wb") as stderr_file:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=aio_subprocess.DEVNULL,
+            stdout=stdout_file,
+            stderr=stderr_file,
+            cwd=str(MCP_SCAN_ROOT),
+            start_new_session=True,
+        )
+        try:
+            await process.wait()
+        except BaseException:
+            await _terminate_process_group(process)
+            raise
+
+    return process.returncode if process.returncode is not None else 1
+
+
+async def _run_mcp_scan_cli(
+    argv: List[str],
+    stdout_path: Path,
+    stderr_path: Path,
+    deadline_at: float,
+    job: ScanJob,
+) -> Dict[str, Any]:
+    """Run one mcp-scan command until the loop time ``deadline_at`` and return its JSON output."""
+
+    phase = f"mcpScan.{argv[0]}"
+    job.events.publish("phase", {"phase": phase, "state": "started"})
+    remaining = max(0.0, deadline_at - asyncio.get_running_loop().time())
+    try:
+        async with asyncio.timeout_at(deadline_at):
+            try:
+                returncode = await mcp_scan_worker_pool.run(argv, stdout_path, stderr_path)
+            except WarmWorkerDied as exc:
+                # The retry runs inside the same timeout block, so it only
+                # gets whatever is left of the deadline.
+                logger.warning("mcp-scan worker died during job %s, retrying one-shot: %s", job.job_id, exc)
+                job.events.publish("phase", {"phase": phase, "state": "retrying", "reason": str(exc)})
+                returncode = await _run_mcp_scan_oneshot(argv, stdout_path, stderr_path)
+            except WarmWorkerUnavailable as exc:
+                logger.info("Falling back to one-shot mcp-scan for job %s: %s", job.job_id, exc)
+                returncode = await _run_mcp_scan_oneshot(argv, stdout_path, stderr_path)
+    except TimeoutError as exc:
+        raise ScanTimeoutError(
+            f"mcp-scan {argv[0]} exceeded the {remaining:.0f}s left of the scan deadline and was killed"
+        ) from exc
+
+    job.events.publish("phase", {"phase": phase, "state": "finished", "returncode": returncode})
+    if returncode != 0:
+        stderr_text = stderr_path.read_text(encoding="utf-8", errors="ignore")
+        raise RuntimeError(f"mcp-scan exited with {returncode}: {stderr_text}")
+
+    output = json.loads(stdout_path.read_text(encoding="utf-8"))
+    if not isinstance(output, dict):
+        raise ValueError(f"mcp-scan {argv[0]} printed {type(output).__name__}, expected a JSON object")
+    return output
+
+
+async def _inspect_signature(
+    job: ScanJob,
+    storage_dir: Path,
+    common_argv: List[str],
+    deadline_at: float,
+) -> Dict[str, Any] | None:
+    """Fetch the server signature with ``mcp-scan inspect`` (no analysis).
+
+    Inspect failures are not fatal: the caller falls back to a full scan.
+    Deadline overruns still are, since the scan would hang the same way.
+    """
+
+    stdout_path = storage_dir / f"inspect_{job.job_id}.json"
+    stderr_path = storage_dir / f"inspect_{job.job_id}.log"
+    job.artifacts["inspectJson"] = str(stdout_path)
+    job.artifacts["inspectLog"] = str(stderr_path)
+
+    try:
+        raw_output = await _run_mcp_scan_cli(["inspect", *common_argv], stdout_path, stderr_path, deadline_at, job)
+    except ScanTimeoutError:
+        raise
+    except (RuntimeError, ValueError) as exc:
+        logger.info("mcp-scan inspect failed for job %s: %s", job.job_id, exc)
+        return None
+    return raw_output or None
+
+
+async def _execute_mcp_scan_component(
+    job: ScanJob,
+    storage_dir: Path,
+    timeout: int,
+) -> Dict[str, Any]:
+    request = job.request
+    headers = _normalize_headers(request.headers)
+    base = await asyncio.to_thread(_load_incremental_base, storage_dir) if request.incremental else None
+
+    with TemporaryDirectory(dir=MCP_SCAN_STORAGE_ROOT, prefix="tmp-") as tmp:
+        tmp_path = Path(tmp)
+        config_path = _write_temp_config(
+            tmp_path,
+            request.server_url,
+            headers,
+            request.protocol_version,
+        )
+
+        common_argv = [
+            str(config_path),
+            "--json",
+            "--server-timeout",
+            str(timeout),
+            "--storage-file",
+            str(storage_dir),
+        ]
+        # One budget for the whole component: inspect and scan each only get
+        # whatever the steps before them left over.
+        deadline_at = asyncio.get_running_loop().time() + timeout + SCAN_DEADLINE_GRACE_SECONDS
+        stdout_path = storage_dir / f"scan_{job.job_id}.json"
+        stderr_path = storage_dir / f"scan_{job.job_id}.log"
+
+        inspected: Dict[str, Any] | None = None
+        if (SCAN_CACHE_ENABLED and SCAN_CACHE_PREFLIGHT) or base is not None:
+            inspected = await _inspect_signature(job, storage_dir, common_argv, deadline_at)
+
+        base_job_id: str | None = None
+        previous_index: SignatureIndex | None = None
+        if base is not None:
+            base_job_id, base_payload = base
+            previous_index = SignatureIndex(base_payload.get("servers", []))
+
+        if base is not None and previous_index is not None and inspected is not None:
+            inspected_path, inspected_payload = next(iter(inspected.items()))
+            current_servers = inspected_payload.get("servers", [])
+            current_index = SignatureIndex(current_servers)
+            diff = _diff_signatures(previous_index, current_index)
+
+            if not diff.changed:
+                # Nothing to re-analyse: carry the baseline's findings over
+                # onto the fresh signature and record them as this job's scan.
+                # This is the only path that reuses earlier findings.
+                issues = [
+                    remapped
+                    for remapped in (
+                        _remap_issue(issue, previous_index, current_index)
+                        for issue in base_payload.get("issues", [])
+                    )
+                    if remapped is not None
+                ]
+                stdout_path.write_text(
+                    json.dumps({inspected_path: {**inspected_payload, "issues": issues}}, indent=2),
+                    encoding="utf-8",
+                )
+                job.artifacts["scanJson"] = str(stdout_path)
+                _record_incremental_base(storage_dir, job, stdout_path)
+                return _scan_security_result(
+                    _scan_checks_from_payload({"issues": issues}, current_index),
+                    job,
+                    config_path=inspected_path,
+                    issues_found=len(issues),
+                    tools_analyzed=current_index.count("tool"),
+                    report_path=stdout_path,
+                    mode=["inspect", "incremental"],
+                    incremental=diff.summary(base_job_id, scan_skipped=True),
+                )
+
+        preflight_key: str | None = None
+        if inspected is not None and SCAN_CACHE_ENABLED:
+            preflight_key = _signature_cache_key(inspected)
+        if inspected is not None and preflight_key is not None:
+            entry = await asyncio.to_thread(scan_result_cache.get, preflight_key)
+            if entry is not None:
+                return _scan_result_from_cache(
+                    entry,
+                    job,
+                    config_path=next(iter(inspected)),
+                    report_path=Path(job.artifacts["inspectJson"]),
+                    mode=["inspect", "cache"],
+                )
+
+        job.artifacts["scanJson"] = str(stdout_path)
+        job.artifacts["scanLog"] = str(stderr_path)
+
+        raw_output = await _run_mcp_scan_cli(["scan", *common_argv], stdout_path, stderr_path, deadline_at, job)
+        _record_incremental_base(storage_dir, job, stdout_path)
+
+        key = _signature_cache_key(raw_output) if SCAN_CACHE_ENABLED else None
+        if key is None and previous_index is None:
+            return _normalise_scan_output(raw_output, job, stdout_path)
+
+        path, payload = next(iter(raw_output.items()))
+        index = SignatureIndex(payload.get("servers", []))
+        incremental: Dict[str, Any] | None = None
+        if previous_index is not None:
+            # mcp-scan only analyses whole servers, so its findings are used
+            # as they are; the summary just records what changed since the base.
+            diff = _diff_signatures(previous_index, index)
+            incremental = diff.summary(base_job_id, scan_skipped=False)
+        elif key is not None and key != preflight_key:
+            entry = await asyncio.to_thread(scan_result_cache.get, key)
+            if entry is not None:
+                return _scan_result_from_cache(
+                    entry,
+                    job,
+                    config_path=path,
+                    report_path=stdout_path,
+                    mode=["scan", "cache"],
+                )
+
+        checks = _scan_checks_from_payload(payload, index)
+        issues_found = len(payload.get("issues", []))
+        cache_info: Dict[str, Any] | None = None
+        if key is not None:
+            entry = _scan_cache_entry(
+                key,
+                checks,
+                issues_found=issues_found,
+                tools_analyzed=index.count("tool"),
+            )
+            try:
+                await asyncio.to_thread(scan_result_cache.put, key, entry)
+            except OSError as exc:
+                logger.warning("Could not store scan cache entry for job %s: %s", job.job_id, exc)
+            cache_info = {"hit": False, "key": key}
+
+        return _scan_security_result(
+            checks,
+            job,
+            config_path=path,
+            issues_found=issues_found,
+            tools_analyzed=index.count("tool"),
+            report_path=stdout_path,
+            mode=["scan", "incremental"] if incremental is not None else ["scan"],
+            cache=cache_info,
+            incremental=incremental,
+        )
+
+
+def _merge_component_outcomes(
+    job: ScanJob,
+    outcomes: Dict[str, Dict[str, Any] | BaseException],
+) -> Dict[str, Any]:
+    """Combine per-component results, isolating failures.
+
+    A failed component is reported under ``componentErrors`` and the job still
+    succeeds with the other component's checks (``partial`` is set). Only when
+    every component failed is an error raised, preferring a timeout so the job
+    ends as ``timed_out``.
+    """
+
+    if job.cancel_event.is_set():
+        raise ScanCancelledError(f"Job {job.job_id} was cancelled")
+
+    results: List[Dict[str, Any]] = []
+    failures: Dict[str, BaseException] = {}
+    for name, outcome in outcomes.items():
+        if isinstance(outcome, BaseException):
+            logger.warning("Component %s failed for job %s: %s", name, job.job_id, outcome)
+            failures[name] = outcome
+        else:
+            results.append(outcome)
+
+    if not results:
+        if len(failures) == 1:
+            raise next(iter(failures.values()))
+        for failure in failures.values():
+            if isinstance(failure, ScanTimeoutError):
+                raise failure
+        raise RuntimeError("; ".join(f"{name}: {exc}" for name, exc in failures.items()))
+
+    combined = _combine_security_results(results)
+    if failures:
+        combined["partial"] = True
+        combined["componentErrors"] = {name: str(exc) for name, exc in failures.items()}
+    return combined
+
+
+async def _finish_job(
+    job: ScanJob,
+    status: str,
+    *,
+    result: Dict[str, Any] | None = None,
+    error: str | None = None,
+) -> bool:
+    """Move ``job`` into a terminal state unless it already reached one.
+
+    Returns whether this call made the transition.
+    """
+
+    async with jobs_lock:
+        if job.status in TERMINAL_JOB_STATUSES:
+            return False
+        job.status = status
+        job.finished_at = datetime.now(timezone.utc)
+        await _set_job_result(job, result)
+        job.error = error
+        _touch_job(job)
+        await asyncio.to_thread(jobs.save, job)
+    job.events.publish(
+        "result",
+        {"status": status, "finishedAt": job.finished_at.isoformat(), "error": error, "result": result},
+    )
+    return True
+
+
+async def _publish_component(
+    job: ScanJob,
+    name: str,
+    component: Awaitable[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Await one component, announcing its partial result on the job's event log."""
+
+    job.events.publish("component", {"component": name, "state": "started"})
+    try:
+        result = await component
+    except Exception as exc:
+        job.events.publish("component", {"component": name, "state": "failed", "error": str(exc)})
+        raise
+    job.events.publish(
+        "component",
+        {"component": name, "state": "finished", "securityLint": result.get("securityLint")},
+    )
+    return result
+
+
+async def _mark_running(job: ScanJob) -> None:
+    async with jobs_lock:
+        if job.status in TERMINAL_JOB_STATUSES:
+            return
+        job.status = "running"
+        job.started_at = datetime.now(timezone.utc)
+        _touch_job(job)
+        await asyncio.to_thread(jobs.save, job)
+    job.events.publish("state", {"status": "running", "startedAt": job.started_at.isoformat()})
+
+
+async def _run_scan_job(job_id: str) -> None:
+    try:
+        async with jobs_lock:
+            job = await asyncio.to_thread(jobs.get, job_id)
+        # A cancelled leader still runs while coalesced jobs wait on its result.
+        if job is None or (job.status in TERMINAL_JOB_STATUSES and not scan_flights.has_followers(job_id)):
+            return
+
+        await _mark_running(job)
+        for follower in scan_flights.followers(job_id):
+            await _mark_running(follower)
+
+        try:
+            status, result, error = await _execute_scan_job(job)
+        except asyncio.CancelledError:
+            await _settle_scan_job(job, "cancelled", error="Job cancelled")
+            raise
+        await _settle_scan_job(job, status, result=result, error=error)
+    finally:
+        # Settling lands the flight; anything left here means the scan never
+        # got that far, and its followers must not wait forever.
+        for follower, waiter in scan_flights.land(job_id):
+            await _finish_job(follower, "error", error="The scan this job was coalesced onto did not run")
+            if not waiter.done():
+                waiter.set_result(None)
+
+
+async def _execute_scan_job(job: ScanJob) -> Tuple[str, Dict[str, Any] | None, str | None]:
+    """Run the selected components; returns ``(status, result, error)``."""
+
+    request = job.request
+    include = request.include or ScanInclude()
+
+    storage_dir = _job_storage_dir(request.server_url)
+    timeout = request.timeout_seconds or SCAN_TIMEOUT_SECONDS
+
+    try:
+        # Reject an empty selection before any OAuth flow is started.
+        if not (include.mcpScan or include.mcpValidator):
+            raise ValueError("At least one scan component must be selected")
+
+        # Both components need the same (possibly OAuth-augmented) headers,
+        # so resolve them once before fanning out.
+        headers = _normalize_headers(request.headers)
+        request.headers = await _maybe_attach_oauth_headers(job, headers, storage_dir)
+
+        components: Dict[str, Awaitable[Dict[str, Any]]] = {}
+        if include.mcpScan:
+            components["mcpScan"] = _publish_component(
+                job, "mcpScan", _execute_mcp_scan_component(job, storage_dir, timeout)
+            )
+        if include.mcpValidator:
+            components["mcpValidator"] = _publish_component(
+                job, "mcpValidator", _run_validator(job, storage_dir)
+            )
+
+        outcomes = await asyncio.gather(*components.values(), return_exceptions=True)
+        combined = _merge_component_outcomes(job, dict(zip(components, outcomes)))
+
+    except ScanCancelledError:
+        return "cancelled", None, "Job cancelled"
+    except ScanTimeoutError as exc:
+        return "timed_out", None, str(exc)
+    except Exception as exc:  # noqa: BLE001
+        return "error", None, str(exc)
+    finally:
+        await asyncio.to_thread(_store_job_artifacts, job)
+
+    return "succeeded", combined, None
+
+
+async def _settle_scan_job(
+    job: ScanJob,
+    status: str,
+    *,
+    result: Dict[str, Any] | None = None,
+    error: str | None = None,
+) -> None:
+    """Finish ``job`` and every job coalesced onto it with the same outcome."""
+
+    await _finish_job(job, status, result=result, error=error)
+    for follower, waiter in scan_flights.land(job.job_id):
+        follower.artifacts = dict(job.artifacts)
+        await _finish_job(
+            follower,
+            status,
+            result=_shared_result(result, "coalescedWith", job.job_id),
+            error=error,
+        )
+        if not waiter.done():
+            waiter.set_result(None)
+
+
+async def _cancel_job(job: ScanJob) -> bool:
+    """Cancel a queued or running job and stop everything it started.
+
+    Queued jobs are dropped from the scheduler. Running jobs have their task
+    cancelled, which kills the mcp-scan process group; validator threads see
+    ``cancel_event`` between checks and exit early. A job that coalesced
+    jobs are following only ends its own view; the scan carries on for them.
+    Returns ``False`` if the job reached a terminal state on its own first.
+    """
+
+    flight = scan_flights.detach(job.job_id)
+    if flight is not None:
+        cancelled = await _finish_job(job, "cancelled", error="Job cancelled")
+        leader = flight.leader
+        if leader.status in TERMINAL_JOB_STATUSES and not flight.followers:
+            # The leader was cancelled earlier and nobody is waiting any more.
+            _abandon_scan(leader)
+            if leader.task is not None and not leader.task.done():
+                leader.task.cancel()
+        return cancelled
+    if scan_flights.has_followers(job.job_id):
+        # Coalesced jobs still need the scan: end only this job's view of it.
+        return await _finish_job(job, "cancelled", error="Job cancelled")
+
+    async with jobs_lock:
+        if job.status in TERMINAL_JOB_STATUSES:
+            return False
+        _abandon_scan(job)
+    cancelled = await _finish_job(job, "cancelled", error="Job cancelled")
+    if job.task is not None and not job.task.done():
+        job.task.cancel()
+    return cancelled
+
+
+def _abandon_scan(job: ScanJob) -> None:
+    """Signal ``job``'s work to stop and drop it from the queue and its flight."""
+
+    job.cancel_event.set()
+    scan_scheduler.discard(job.job_id)
+    scan_flights.land(job.job_id)
+
+
+class ScanScheduler:
+    """Bounded pool of workers draining a priority queue of scan jobs.
+
+    Entries are ordered by ``(priority, submission order)``. Jobs discarded
+    while still queued are skipped lazily when a worker pops them. Queue
+    positions are part of a job's ETag, so every job whose position moves
+    is touched.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._queue: asyncio.PriorityQueue[Tuple[int, int, str]] = asyncio.PriorityQueue()
+        self._pending: Dict[str, Tuple[int, int]] = {}
+        self._waiters: Dict[str, asyncio.Future[None]] = {}
+        self._workers: List[asyncio.Task[None]] = []
+        self._sequence = itertools.count()
+        self._busy = 0
+        # Moving average of job wall-clock, used for start time estimates.
+        self._average_duration = float(SCAN_TIMEOUT_SECONDS)
+
+    def submit(self, job: ScanJob) -> asyncio.Future[None]:
+        """Queue ``job`` and return a future resolved once it has finished."""
+
+        self._ensure_workers()
+        key = (job.priority, next(self._sequence))
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._pending[job.job_id] = key
+        self._waiters[job.job_id] = waiter
+        self._queue.put_nowait((key[0], key[1], job.job_id))
+        self._positions_moved(key)
+        return waiter
+
+    def discard(self, job_id: str) -> bool:
+        """Drop a job that has not started yet. Returns False if it is not queued."""
+
+        key = self._pending.pop(job_id, None)
+        if key is None:
+            return False
+        self._positions_moved(key)
+        self._resolve(job_id)
+        return True
+
+    def reprioritise(self, job_id: str, priority: int) -> bool:
+        """Move a queued job up to ``priority``; False if not queued or already there.
+
+        The old queue entry is left behind and skipped like a discarded one.
+        """
+
+        key = self._pending.get(job_id)
+        if key is None or key[0] <= priority:
+            return False
+        moved = (priority, key[1])
+        self._pending[job_id] = moved
+        self._queue.put_nowait((moved[0], moved[1], job_id))
+        self._positions_moved(moved)
+        job = jobs.live(job_id)
+        if job is not None:
+            _touch_job(job)
+        return True
+
+    def queue_position(self, job_id: str) -> int | None:
+        """1-based position among queued jobs, or None if not queued."""
+
+        key = self._pending.get(job_id)
+        if key is None:
+            return None
+        return 1 + sum(1 for other in self._pending.values() if other < key)
+
+    def estimated_start(self, position: int | None) -> datetime | None:
+        """Expected start of the job at queue ``position``."""
+
+        if position is None:
+            return None
+
+        now = datetime.now(timezone.utc)
+        ahead = position - 1
+        idle = max(self.max_workers - self._busy, 0)
+        if ahead < idle:
+            return now
+        waves = (ahead - idle) // self.max_workers + 1
+        return now + timedelta(seconds=waves * self._average_duration)
+
+    def _ensure_workers(self) -> None:
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        while len(self._workers) < self.max_workers:
+            self._workers.append(asyncio.create_task(self._worker()))
+
+    def _resolve(self, job_id: str) -> None:
+        waiter = self._waiters.pop(job_id, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def _positions_moved(self, key: Tuple[int, int]) -> None:
+        """Touch queued jobs behind ``key``, whose position just changed."""
+
+        for job_id, other in self._pending.items():
+            if other > key:
+                job = jobs.live(job_id)
+                if job is not None:
+                    _touch_job(job)
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, job_id = await self._queue.get()
+            try:
+                key = self._pending.pop(job_id, None)
+                if key is None:
+                    continue
+                self._positions_moved(key)
+
+                self._busy += 1
+                started = time.monotonic()
+                try:
+                    await self._run(job_id)
+                finally:
+                    self._busy -= 1
+                    elapsed = time.monotonic() - started
+                    self._average_duration = 0.8 * self._average_duration + 0.2 * elapsed
+                    self._resolve(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        # The job runs in its own task so cancelling it never takes the
+        # worker down with it.
+        job = await asyncio.to_thread(jobs.get, job_id)
+        task = asyncio.create_task(_run_scan_job(job_id))
+        if job is not None:
+            job.task = task
+        await asyncio.wait({task})
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Scan worker failed on job %s", job_id, exc_info=task.exception())
+
+
+class SharedScanScheduler(ScanScheduler):
+    """ScanScheduler that drains the job store's queue shared by all workers.
+
+    ``submit`` only wakes the local workers: the job row written on creation
+    is the queue entry, and whichever worker claims it first runs it. A
+    monitor task heartbeats this worker's claims, applies cancellations
+    requested through other workers, and resolves submit futures for jobs
+    that finished elsewhere.
+    """
+
+    def __init__(self, max_workers: int, store: JobStore, owner: str) -> None:
+        super().__init__(max_workers)
+        self._store = store
+        self._owner = owner
+        self._wakeup = asyncio.Event()
+        self._running: set[str] = set()
+        self._submitted: Dict[str, ScanJob] = {}
+        self._monitor: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        self._ensure_workers()
+
+    def submit(self, job: ScanJob) -> asyncio.Future[None]:
+        self._ensure_workers()
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters[job.job_id] = waiter
+        self._submitted[job.job_id] = job
+        self._wakeup.set()
+        return waiter
+
+    def discard(self, job_id: str) -> bool:
+        if not self._store.request_cancel(job_id):
+            return False
+        self._resolve(job_id)
+        return True
+
+    def queue_position(self, job_id: str) -> int | None:
+        return self._store.queue_position(job_id)
+
+    def _ensure_workers(self) -> None:
+        super()._ensure_workers()
+        if self._monitor is None or self._monitor.done():
+            self._monitor = asyncio.create_task(self._monitor_claims())
+
+    def _resolve(self, job_id: str) -> None:
+        submitted = self._submitted.pop(job_id, None)
+        if submitted is None:
+            super()._resolve(job_id)
+            return
+        task = asyncio.create_task(self._refresh_and_resolve(job_id, submitted))
+        active_tasks.add(task)
+        task.add_done_callback(active_tasks.discard)
+
+    async def _refresh_and_resolve(self, job_id: str, submitted: ScanJob) -> None:
+        # The job ran on a copy loaded from the store (possibly in another
+        # worker); bring the submitter's object up to date first.
+        try:
+            latest = await asyncio.to_thread(self._store.get, job_id)
+            if latest is not None:
+                for name in ("status", "started_at", "finished_at", "result", "result_json", "error", "artifacts"):
+                    setattr(submitted, name, getattr(latest, name))
+        finally:
+            super()._resolve(job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await asyncio.to_thread(self._store.claim_next, self._owner, self.max_workers)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    async with asyncio.timeout(SHARED_POLL_INTERVAL_SECONDS):
+                        await self._wakeup.wait()
+                except TimeoutError:
+                    pass
+                continue
+
+            self._busy += 1
+            self._running.add(job.job_id)
+            started = time.monotonic()
+            try:
+                await self._run(job.job_id)
+            finally:
+                self._busy -= 1
+                self._running.discard(job.job_id)
+                elapsed = time.monotonic() - started
+                self._average_duration = 0.8 * self._average_duration + 0.2 * elapsed
+                self._resolve(job.job_id)
+
+    async def _monitor_claims(self) -> None:
+        last_heartbeat = 0.0
+        last_stale_check = 0.0
+        while True:
+            await asyncio.sleep(SHARED_POLL_INTERVAL_SECONDS)
+            try:
+                now = time.monotonic()
+                running = list(self._running)
+                if now - last_heartbeat >= SHARED_STALE_SECONDS / 3:
+                    await asyncio.to_thread(self._store.heartbeat, self._owner, running)
+                    last_heartbeat = now
+                if now - last_stale_check >= SHARED_STALE_SECONDS:
+                    stale = await asyncio.to_thread(self._store.fail_stale, time.time() - SHARED_STALE_SECONDS)
+                    if stale:
+                        logger.warning("Failed %d scan job(s) abandoned by a stopped worker", len(stale))
+                    last_stale_check = now
+
+                for job_id in await asyncio.to_thread(self._store.cancel_requested, running):
+                    job = await asyncio.to_thread(self._store.get, job_id)
+                    if job is not None and job.status not in TERMINAL_JOB_STATUSES:
+                        await _cancel_job(job)
+
+                remote = [job_id for job_id in self._waiters if job_id not in self._running]
+                for job_id in await asyncio.to_thread(self._store.finished, remote):
+                    self._resolve(job_id)
+
+                await mcp_scan_worker_pool.retire_idle(MCP_SCAN_WORKER_IDLE_SECONDS)
+            except sqlite3.Error:
+                logger.exception("Shared scan queue monitor failed")
+
+
+if SHARED_STATE:
+    scan_scheduler: ScanScheduler = SharedScanScheduler(SCAN_MAX_WORKERS, jobs, WORKER_ID)
+else:
+    scan_scheduler = ScanScheduler(SCAN_MAX_WORKERS)
+
+
+# ---------------------------------------------------------------------------
+# Scan coalescing
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class ScanFlight:
+    leader: ScanJob
+    # Follower job id -> (job, future resolved once it has been settled).
+    followers: Dict[str, Tuple[ScanJob, asyncio.Future[None]]] = field(default_factory=dict)
+
+
+class ScanFlights:
+    """Queued and running scans by fingerprint, for singleflight coalescing.
+
+    The first job for a fingerprint leads and goes through the scheduler as
+    usual. Jobs submitted while it is in flight follow it: they take no
+    scheduler slot and are finished with a copy of the leader's outcome by
+    ``_settle_scan_job``.
+    """
+
+    def __init__(self) -> None:
+        self._by_fingerprint: Dict[str, ScanFlight] = {}
+        self._by_leader: Dict[str, ScanFlight] = {}
+        self._by_follower: Dict[str, ScanFlight] = {}
+
+    def lead(self, job: ScanJob) -> None:
+        flight = ScanFlight(job)
+        self._by_fingerprint[job.fingerprint] = flight
+        self._by_leader[job.job_id] = flight
+
+    def follow(self, job: ScanJob) -> asyncio.Future[None] | None:
+        """Attach ``job`` to an in-flight scan; None if there is none."""
+
+        flight = self._by_fingerprint.get(job.fingerprint)
+        if flight is None:
+            return None
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        flight.followers[job.job_id] = (job, waiter)
+        self._by_follower[job.job_id] = flight
+        return waiter
+
+    def leader_of(self, follower_id: str) -> ScanJob | None:
+        flight = self._by_follower.get(follower_id)
+        return flight.leader if flight is not None else None
+
+    def followers(self, leader_id: str) -> List[ScanJob]:
+        flight = self._by_leader.get(leader_id)
+        return [job for job, _ in flight.followers.values()] if flight is not None else []
+
+    def has_followers(self, leader_id: str) -> bool:
+        flight = self._by_leader.get(leader_id)
+        return flight is not None and bool(flight.followers)
+
+    def detach(self, job_id: str) -> ScanFlight | None:
+        """Remove follower ``job_id``; returns the flight it followed."""
+
+        flight = self._by_follower.pop(job_id, None)
+        if flight is None:
+            return None
+        _, waiter = flight.followers.pop(job_id)
+        if not waiter.done():
+            waiter.set_result(None)
+        return flight
+
+    def land(self, leader_id: str) -> List[Tuple[ScanJob, asyncio.Future[None]]]:
+        """End the flight led by ``leader_id`` and hand back its followers."""
+
+        flight = self._by_leader.pop(leader_id, None)
+        if flight is None:
+            return []
+        if self._by_fingerprint.get(flight.leader.fingerprint) is flight:
+            del self._by_fingerprint[flight.leader.fingerprint]
+        for follower_id in flight.followers:
+            self._by_follower.pop(follower_id, None)
+        return list(flight.followers.values())
+
+
+scan_flights = ScanFlights()
+
+
+def _shared_result(result: Dict[str, Any] | None, key: str, source_job_id: str) -> Dict[str, Any] | None:
+    """Copy of another job's result, tagged with where it came from."""
+
+    if result is None:
+        return None
+    return {**result, key: source_job_id}
+
+
+def _submit_scan_job(job: ScanJob) -> asyncio.Future[None]:
+    """Schedule ``job``, or attach it to an identical scan already in flight."""
+
+    if SCAN_COALESCE and not SHARED_STATE:
+        waiter = scan_flights.follow(job)
+        if waiter is not None:
+            logger.info("Coalesced scan job %s onto an identical in-flight scan", job.job_id)
+            # A queued leader runs at its most urgent follower's priority.
+            leader = scan_flights.leader_of(job.job_id)
+            if leader is not None and scan_scheduler.reprioritise(leader.job_id, job.priority):
+                leader.priority = job.priority
+            return waiter
+        scan_flights.lead(job)
+    return scan_scheduler.submit(job)
+
+
+async def _reuse_recent_result(job: ScanJob, max_age_seconds: float) -> bool:
+    """Finish ``job`` with an identical scan's result if one is recent enough."""
+
+    recent = await asyncio.to_thread(jobs.latest_result, job.fingerprint, time.time() - max_age_seconds)
+    if recent is None or recent.result is None:
+        return False
+    now = datetime.now(timezone.utc)
+    job.status = "succeeded"
+    job.started_at = now
+    job.finished_at = now
+    await _set_job_result(job, _shared_result(recent.result, "reusedFrom", recent.job_id))
+    job.artifacts = dict(recent.artifacts)
+    _touch_job(job)
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Routes
+# ---------------------------------------------------------------------------
+
+
+class HealthResponse(BaseModel):
+    status: str
+    version: str
+    service: str
+
+
+@app.get("/", response_model=HealthResponse)
+async def root() -> HealthResponse:
+    return HealthResponse(status="healthy", version=get_version(), service="backend")
+
+
+@app.get("/api/hello")
+async def hello(name: str = "World") -> Dict[str, str]:
+    return {"message": f"Hello, {name}!"}
+
+
+@app.post("/api/security/scans", response_model=ScanJobCreated, status_code=202)
+async def create_scan_job(payload: ScanRequest) -> ScanJobCreated:
+    job_id = uuid.uuid4().hex
+    job = ScanJob(job_id=job_id, request=payload)
+
+    if payload.max_age_seconds is not None and await _reuse_recent_result(job, payload.max_age_seconds):
+        async with jobs_lock:
+            await asyncio.to_thread(jobs.__setitem__, job_id, job)
+        job.events.publish("result", _final_job_event(job))
+        return ScanJobCreated(job_id=job_id, status=job.status)
+
+    async with jobs_lock:
+        await asyncio.to_thread(jobs.__setitem__, job_id, job)
+
+    _submit_scan_job(job)
+    (queue_position,) = await _queue_positions([job_id])
+    job.events.publish("state", {"status": job.status, "queuePosition": queue_position})
+
+    return ScanJobCreated(job_id=job_id, status=job.status)
+
+
+@app.get("/api/security/scans", response_model=List[ScanJobStatus])
+async def list_scan_jobs(
+    status: str | None = None,
+    server_url: str | None = Query(default=None, alias="serverUrl"),
+    limit: int = Query(default=50, ge=1, le=500),
+) -> List[ScanJobStatus]:
+    """Recent jobs, newest first. Results are omitted; fetch a job for its result."""
+
+    matched = await asyncio.to_thread(jobs.query, status=status, server_url=server_url, limit=limit)
+    pending = [job.job_id for job in matched if job.status == "pending"]
+    positions = dict(zip(pending, await _queue_positions(pending)))
+    return [
+        ScanJobStatus(
+            job_id=job.job_id,
+            status=job.status,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+            queue_position=positions.get(job.job_id),
+            estimated_start_at=scan_scheduler.estimated_start(positions.get(job.job_id)),
+            error=job.error,
+        )
+        for job in matched
+    ]
+
+
+async def _job_snapshot(job_id: str) -> JobSnapshot | None:
+    snapshot = jobs.snapshot(job_id)
+    if snapshot is None:
+        snapshot = await asyncio.to_thread(jobs.load_snapshot, job_id)
+    return snapshot
+
+
+async def _queue_positions(job_ids: List[str]) -> List[int | None]:
+    """Queue positions of ``job_ids``; the shared queue is read in a thread."""
+
+    if isinstance(scan_scheduler, SharedScanScheduler):
+        return await asyncio.to_thread(lambda: [scan_scheduler.queue_position(job_id) for job_id in job_ids])
+    return [scan_scheduler.queue_position(job_id) for job_id in job_ids]
+
+
+def _job_etag(job: JobSnapshot, queue_position: int | None) -> str:
+    return f'W/"{job.job_id}-{job.version}-{queue_position or 0}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison, as ``If-None-Match`` calls for."""
+
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+async def _wait_for_job_change(
+    job: JobSnapshot,
+    if_none_match: str | None,
+    timeout: float,
+) -> JobSnapshot | None:
+    """Block until ``job`` differs from what the client has, or ``timeout`` passes.
+
+    Without ``If-None-Match`` the client's view is the current version, so
+    this returns on the next state change. Jobs run by this process are
+    awaited on their change event; jobs owned by another worker (shared-state
+    mode) are re-read from the store.
+    """
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    seen_version = job.version
+
+    async def unchanged(current: JobSnapshot) -> bool:
+        if if_none_match:
+            (queue_position,) = await _queue_positions([current.job_id])
+            return _etag_matches(if_none_match, _job_etag(current, queue_position))
+        return current.version == seen_version
+
+    while job.status not in TERMINAL_JOB_STATUSES and await unchanged(job):
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        live = jobs.live(job.job_id)
+        if live is not None:
+            try:
+                async with asyncio.timeout(remaining):
+                    await live.changed.wait()
+            except TimeoutError:
+                break
+        else:
+            await asyncio.sleep(min(SHARED_POLL_INTERVAL_SECONDS, remaining))
+        latest = await _job_snapshot(job.job_id)
+        if latest is None:
+            return None
+        job = latest
+    return job
+
+
+@app.get("/api/security/scans/{job_id}", response_model=ScanJobStatus)
+async def get_scan_job(
+    job_id: str,
+    response: Response,
+    wait: float = Query(default=0, ge=0, le=JOB_LONG_POLL_MAX_SECONDS),
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+) -> ScanJobStatus | Response:
+    """Job status and result.
+
+    Responses carry an ``ETag``; a matching ``If-None-Match`` gets a 304.
+    With ``wait`` set, an active job is held for up to that many seconds
+    until its state changes. A finished result is spliced in from the bytes
+    encoded when the job completed rather than re-validated and re-encoded.
+    """
+
+    job = await _job_snapshot(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if wait:
+        job = await _wait_for_job_change(job, if_none_match, wait)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+    (queue_position,) = await _queue_positions([job_id])
+    etag = _job_etag(job, queue_position)
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    status = ScanJobStatus(
+        job_id=job.job_id,
+        status=job.status,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        queue_position=queue_position,
+        estimated_start_at=scan_scheduler.estimated_start(queue_position),
+        result=None if job.result_json is not None else job.result,
+        error=job.error,
+    )
+    if job.result_json is None:
+        return status
+    document = status.model_dump_json(by_alias=True, exclude={"result"}).encode("utf-8")
+    return Response(
+        content=_splice_json_field(document, "result", job.result_json),
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
+
+
+def _sse_event(event_id: int, event: str, data: Dict[str, Any]) -> str:
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _final_job_event(job: ScanJob) -> Dict[str, Any]:
+    return {
+        "status": job.status,
+        "finishedAt": job.finished_at.isoformat() if job.finished_at else None,
+        "error": job.error,
+        "result": job.result,
+    }
+
+
+async def _job_event_stream(job: ScanJob, last_id: int, request: Request) -> AsyncIterator[str]:
+    log = job.events
+    if not log.events and job.status in TERMINAL_JOB_STATUSES:
+        # Finished before this process saw it (reloaded from the store).
+        if last_id < 1:
+            yield _sse_event(1, "result", _final_job_event(job))
+        return
+
+    if not log.events:
+        # Running on another worker (shared-state mode) or submitted without
+        # announcing itself: follow state transitions through the store.
+        event_id, last_status = last_id, None
+        while not await request.is_disconnected():
+            current = await asyncio.to_thread(jobs.get, job.job_id)
+            if current is None:
+                return
+            if current.status != last_status:
+                last_status = current.status
+                event_id += 1
+                if current.status in TERMINAL_JOB_STATUSES:
+                    yield _sse_event(event_id, "result", _final_job_event(current))
+                    return
+                yield _sse_event(event_id, "state", {"status": current.status})
+            await asyncio.sleep(SHARED_POLL_INTERVAL_SECONDS)
+        return
+
+    while True:
+        for event_id, event, data in log.since(last_id):
+            yield _sse_event(event_id, event, data)
+            last_id = event_id
+            if event == "result":
+                return
+        if log.closed or await request.is_disconnected():
+            return
+        if not await log.wait(last_id, SSE_KEEPALIVE_SECONDS):
+            yield ": keep-alive\n\n"
+
+
+@app.get("/api/security/scans/{job_id}/events")
+async def stream_scan_job_events(
+    job_id: str,
+    request: Request,
+    last_event_id: str | None = Header(default=None, alias="Last-Event-ID"),
+) -> StreamingResponse:
+    """Server-Sent Events for one job: state, phase, partial checks, then the result."""
+
+    async with jobs_lock:
+        job = await asyncio.to_thread(jobs.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    try:
+        last_id = int(last_event_id) if last_event_id else 0
+    except ValueError:
+        last_id = 0
+
+    return StreamingResponse(
+        _job_event_stream(job, last_id, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _parse_byte_range(header: str, size: int) -> Tuple[int, int] | None:
+    """Parse a single ``bytes=`` range into inclusive ``(start, end)``.
+
+    Multiple ranges and malformed headers return ``None`` (serve the whole
+    artifact); a well-formed range outside the artifact raises 416.
+    """
+
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash:
+        return None
+    try:
+        if not first:
+            suffix = int(last)
+            if suffix <= 0:
+                raise ValueError(last)
+            start, end = max(0, size - suffix), size - 1
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+            if end < start and last:
+                return None
+    except ValueError:
+        return None
+    if start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="Range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+@app.get("/api/security/scans/{job_id}/artifacts/{name}")
+async def get_scan_artifact(
+    job_id: str,
+    name: str,
+    accept_encoding: str | None = Header(default=None, alias="Accept-Encoding"),
+    byte_range: str | None = Header(default=None, alias="Range"),
+    if_range: str | None = Header(default=None, alias="If-Range"),
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+) -> Response:
+    """Download one of a finished job's artifacts (``scanJson``, ``scanLog``, ``validatorLog``, ...).
+
+    Files are streamed, never read whole. An artifact stored compressed goes
+    out as stored when the client accepts that encoding; other clients and
+    all ``Range`` requests get the decoded bytes. Logs are stored plain, so
+    their ranges are served by offset. Responses carry an ``ETag`` from the
+    stored content's SHA-256 and may be cached, since artifacts never change.
+    """
+
+    job = await _job_snapshot(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    logical = job.artifacts.get(name)
+    if logical is None:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+    if job.status not in TERMINAL_JOB_STATUSES:
+        raise HTTPException(status_code=409, detail="Artifacts are available once the job has finished")
+
+    try:
+        stored = await asyncio.to_thread(_stored_artifact, Path(logical))
+        if stored is None:
+            raise FileNotFoundError(logical)
+        path, encoding = stored
+        stat = await asyncio.to_thread(path.stat)
+        digest = await asyncio.to_thread(artifact_store.digest, path, stat)
+    except FileNotFoundError:
+        raise HTTPException(status_code=410, detail="Artifact is no longer stored") from None
+
+    filename = Path(logical).name
+    headers = {
+        "Cache-Control": ARTIFACT_CACHE_CONTROL,
+        "Content-Disposition": f'inline; filename="{filename}"',
+        "Accept-Ranges": "bytes",
+    }
+    if encoding is not None:
+        headers["Vary"] = "Accept-Encoding"
+    media_type = "application/json" if filename.endswith(".json") else "text/plain; charset=utf-8"
+
+    send_stored = encoding is None or (
+        byte_range is None and _negotiate_encoding(accept_encoding or "", (encoding,)) is not None
+    )
+    etag = f'"{digest}-{encoding}"' if send_stored and encoding is not None else f'"{digest}"'
+    headers["ETag"] = etag
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    if send_stored:
+        # FileResponse handles Range itself and hands the path to servers
+        # that support ``http.response.pathsend``.
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        return FileResponse(path, media_type=media_type, headers=headers, stat_result=stat)
+
+    size = await asyncio.to_thread(_artifact_size, path, encoding)
+    requested = None
+    if byte_range is not None and (if_range is None or if_range == etag):
+        requested = _parse_byte_range(byte_range, size)
+    start, end = requested or (0, size - 1)
+    headers["Content-Length"] = str(end - start + 1)
+    if requested is not None:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        _iter_artifact_range(path, encoding, start, end - start + 1),
+        status_code=206 if requested is not None else 200,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+@app.delete("/api/security/scans/{job_id}", status_code=204)
+async def delete_scan_job(job_id: str) -> Response:
+    """Cancel an active job (it stays visible as ``cancelled``) or remove a finished one."""
+
+    async with jobs_lock:
+        job = await asyncio.to_thread(jobs.get, job_id)
+        if job is not None and job.status in TERMINAL_JOB_STATUSES:
+            await asyncio.to_thread(jobs.pop, job_id, None)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if job.status not in TERMINAL_JOB_STATUSES and not await _cancel_job(job):
+        # It finished on its own before the cancellation landed; remove it
+        # like any other finished job.
+        async with jobs_lock:
+            await asyncio.to_thread(jobs.pop, job_id, None)
+
+    return Response(status_code=204)
+
+
+@app.get("/api/security/cache")
+async def get_scan_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters and disk usage of the scan result cache."""
+
+    return await asyncio.to_thread(scan_result_cache.stats)
+
+
+@app.get("/api/http/stats")
+async def get_http_pool_stats() -> Dict[str, Any]:
+    """Connection and per-host utilisation of the outbound HTTP pool."""
+
+    return http_pool.stats()
+
+
+@app.post("/api/repos", response_model=RepositoryResponse)
+async def create_repository(payload: RepositoryCreateRequest) -> RepositoryResponse:
+    repo_id = uuid.uuid4().hex
+    now = datetime.now(timezone.utc)
+    repo = RepositoryRecord(
         id=repo_id,
         name=payload.name,
         server_url=payload.serverUrl,
@@ -1348,9 +5908,11 @@ async def create_repository(payload: RepositoryCreateRequest) -> RepositoryRespo
     )
 
     async with repositories_lock:
-        repositories[repo_id] = repo
+        await asyncio.to_thread(repositories.__setitem__, repo_id, repo)
 
-    asyncio.create_task(_run_repository_flow(repo_id))
+    task = asyncio.create_task(_run_repository_flow(repo_id))
+    active_tasks.add(task)
+    task.add_done_callback(active_tasks.discard)
 
     auth_state = repo.auth_state
     if auth_state is not None:
@@ -1359,30 +5921,131 @@ async def create_repository(payload: RepositoryCreateRequest) -> RepositoryRespo
         except asyncio.TimeoutError:
             pass
 
-    async with repositories_lock:
-        repo_snapshot = repositories.get(repo_id)
-
+    repo_snapshot = await _repository_snapshot(repo_id)
     if repo_snapshot is None:
         raise HTTPException(status_code=404, detail="Repository not found")
 
     return _repo_to_response(repo_snapshot)
 
 
-@app.get("/api/repos", response_model=List[RepositoryResponse])
-async def list_repositories() -> List[RepositoryResponse]:
-    async with repositories_lock:
-        return [_repo_to_response(repo) for repo in repositories.values()]
+async def _repository_snapshot(repo_id: str) -> RepositorySnapshot | None:
+    if repositories.shared:
+        return await asyncio.to_thread(repositories.snapshot, repo_id)
+    return repositories.snapshot(repo_id)
+
+
+async def _repository_page(**filters: Any) -> List[RepositorySnapshot]:
+    if repositories.shared:
+        return await asyncio.to_thread(repositories.page, **filters)
+    return repositories.page(**filters)
+
+
+def _encode_repo_cursor(repo: RepositorySnapshot) -> str:
+    raw = json.dumps([repo.created_at.timestamp(), repo.id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_repo_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        created_at, repo_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(created_at), str(repo_id)
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+@app.get("/api/repos", response_model=List[RepositoryResponse | RepositorySummary])
+async def list_repositories(
+    request: Request,
+    response: Response,
+    status: List[RepositoryStatus] | None = Query(default=None),
+    min_score: float | None = Query(default=None, alias="minScore"),
+    max_score: float | None = Query(default=None, alias="maxScore"),
+    view: Literal["full", "summary"] = "full",
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=500),
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+) -> List[RepositoryResponse | RepositorySummary] | Response:
+    """Repositories, oldest first.
+
+    ``status`` (repeatable) and ``minScore``/``maxScore`` filter the list;
+    repositories without a score are left out by a score filter.
+    ``view=summary`` drops check bodies, providers and artifacts. Without
+    ``limit`` every match is returned; with it, ``X-Next-Cursor`` carries
+    the ``cursor`` for the next page. Responses have a weak ETag that
+    changes with any repository change.
+    """
+
+    # Read the version before the records: the snapshot is then at least
+    # as new as the ETag claims.
+    if repositories.shared:
+        version = await asyncio.to_thread(lambda: repositories.version)
+    else:
+        version = repositories.version
+    query = sha256(str(sorted(request.query_params.multi_items())).encode("utf-8")).hexdigest()[:16]
+    etag = f'W/"repos-{version}-{query}"'
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    # One record past the page tells whether there is a next one.
+    records = await _repository_page(
+        after=_decode_repo_cursor(cursor) if cursor is not None else None,
+        statuses=status,
+        min_score=min_score,
+        max_score=max_score,
+        limit=limit + 1 if limit is not None else None,
+    )
+    if limit is not None and len(records) > limit:
+        records = records[:limit]
+        response.headers["X-Next-Cursor"] = _encode_repo_cursor(records[-1])
+
+    response.headers["ETag"] = etag
+    project = _repo_to_summary if view == "summary" else _repo_to_response
+    return [project(repo) for repo in records]
 
 
 @app.get("/api/repos/{repo_id}", response_model=RepositoryResponse)
-async def get_repository(repo_id: str) -> RepositoryResponse:
-    async with repositories_lock:
-        repo = repositories.get(repo_id)
+async def get_repository(
+    repo_id: str,
+    response: Response,
+    if_none_match: str | None = Header(default=None, alias="If-None-Match"),
+) -> RepositoryResponse | Response:
+    repo = await _repository_snapshot(repo_id)
     if repo is None:
         raise HTTPException(status_code=404, detail="Repository not found")
+    etag = f'W/"{repo.id}-{repo.version}"'
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return _repo_to_response(repo)
 
 
+async def _relay_oauth_callback(
+    repo: RepositoryRecord,
+    code: str | None,
+    state: str | None,
+    error: str | None,
+    error_description: str | None,
+) -> HTMLResponse:
+    """Pass a callback for a flow owned by another worker through the store."""
+
+    if repo.status not in ("awaiting_user", "authorizing"):
+        raise HTTPException(status_code=404, detail="Repository not awaiting authorization")
+
+    if error:
+        await asyncio.to_thread(
+            repositories.relay_callback, repo.id, None, state, f"{error}: {error_description or ''}"
+        )
+        await _update_repo(repo.id, status="error", last_error=f"OAuth error: {error}")
+        return HTMLResponse("OAuth error. You can close this window.", status_code=400)
+
+    if not code:
+        return HTMLResponse("Missing authorization code.", status_code=400)
+
+    await asyncio.to_thread(repositories.relay_callback, repo.id, code, state, None)
+    await _update_repo(repo.id, status="authorizing", authorize_url=None)
+    return HTMLResponse("Authentication complete. You can close this window.")
+
+
 @app.get("/api/oauth/callback/{repo_id}")
 async def oauth_callback(
     repo_id: str,
@@ -1392,7 +6055,9 @@ async def oauth_callback(
     error_description: str | None = None,
 ) -> HTMLResponse:
     async with repositories_lock:
-        repo = repositories.get(repo_id)
+        repo = await _repository_record(repo_id)
+    if repo is not None and repo.auth_state is None and SHARED_STATE:
+        return await _relay_oauth_callback(repo, code, state, error, error_description)
     if repo is None or repo.auth_state is None:
         raise HTTPException(status_code=404, detail="Repository not awaiting authorization")
 
@@ -0,0 +1,119 @@
+"""Resident mcp-scan worker process.
+
+The backend launches this script inside the mcp-scan project environment
+(``uv run python -u mcp_scan_worker.py`` with the mcp-scan checkout as the
+working directory) and keeps it alive across jobs, so interpreter startup,
+uv environment resolution and mcp-scan imports are paid once per worker
+instead of once per scan.
+
+Requests arrive as JSON lines on stdin; one JSON line is written back per
+request::
+
+    {"op": "ping"}
+    {"op": "scan", "argv": ["scan", "config.json", "--json", ...],
+     "stdout": "/path/scan.json", "stderr": "/path/scan.log"}
+
+The scan's stdout/stderr go straight to the given files, so output written
+before a crash or a kill is still on disk. Responses use a private duplicate
+of the original stdout; file descriptor 1 is pointed at stderr so stray
+writes cannot corrupt the protocol stream.
+
+This file must stay importable without the backend package: it only runs
+against the mcp-scan environment.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import importlib
+import json
+import os
+import runpy
+import sys
+import traceback
+from typing import Any, Dict, List, TextIO
+
+SCAN_MODULE = "src.mcp_scan.run"
+
+
+def _protocol_stream() -> TextIO:
+    protocol_fd = os.dup(1)
+    os.dup2(2, 1)
+    return os.fdopen(protocol_fd, "w", buffering=1, encoding="utf-8")
+
+
+def _reply(stream: TextIO, payload: Dict[str, Any]) -> None:
+    stream.write(json.dumps(payload) + "\n")
+    stream.flush()
+
+
+def _exit_code(code: Any) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _run_scan(argv: List[str], stdout_path: str, stderr_path: str) -> int:
+    saved_argv = sys.argv
+    with (
+        open(stdout_path, "w", buffering=1, encoding="utf-8") as out,
+        open(stderr_path, "w", buffering=1, encoding="utf-8") as err,
+    ):
+        sys.argv = ["mcp-scan", *argv]
+        try:
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                try:
+                    runpy.run_module(SCAN_MODULE, run_name="__main__", alter_sys=False)
+                except SystemExit as exc:
+                    return _exit_code(exc.code)
+                except BaseException:  # noqa: BLE001
+                    traceback.print_exc()
+                    return 1
+                return 0
+        finally:
+            sys.argv = saved_argv
+
+
+def main() -> int:
+    protocol = _protocol_stream()
+
+    cwd = os.getcwd()
+    if cwd not in sys.path:
+        sys.path.insert(0, cwd)
+
+    try:
+        importlib.import_module(SCAN_MODULE)
+    except Exception as exc:  # noqa: BLE001
+        _reply(protocol, {"op": "ready", "ok": False, "error": repr(exc)})
+        return 1
+    # Keep the heavy dependencies cached but let run_module execute the entry
+    # module fresh as __main__ for every job.
+    sys.modules.pop(SCAN_MODULE, None)
+    _reply(protocol, {"op": "ready", "ok": True, "pid": os.getpid()})
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as exc:
+            _reply(protocol, {"ok": False, "error": f"invalid request: {exc}"})
+            continue
+
+        op = request.get("op")
+        if op == "ping":
+            _reply(protocol, {"op": "pong", "ok": True})
+        elif op == "scan":
+            returncode = _run_scan(request["argv"], request["stdout"], request["stderr"])
+            _reply(protocol, {"op": "scan", "ok": True, "returncode": returncode})
+        else:
+            _reply(protocol, {"ok": False, "error": f"unknown op: {op!r}"})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -54,7 +54,12 @@ export type Evidence =
       flowId: string;
       kind: "TF001" | "TF002" | string;
       nodes: string[];
-      edges: Array<[string, string]>;
+      edges: Array<[string, string]>;       // capped, most frequent first
+      edgeCounts?: number[];                 // occurrences per entry in `edges`
+      adjacency?: Record<string, string[]>;
+      edgeTotal?: number;
+      overflow?: { omittedEdges: number; maxEdges: number; omittedBySource: Record<string, number> };
+      occurrences?: number;
       detected?: boolean;
       topExample?: string;
       raw?: unknown;
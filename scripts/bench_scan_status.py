@@ -0,0 +1,149 @@
+"""Benchmark ``GET /api/security/scans/<job>`` on a large finished result.
+
+Compares the status response built from the result bytes cached when the job
+finished against the previous path, which re-validated and re-encoded the
+whole ``securityLint`` report through ``ScanJobStatus`` on every request.
+
+    uv run python scripts/bench_scan_status.py --checks 400 --occurrences 50
+
+Install the backend's ``fast-json`` extra to measure with orjson.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+import uuid
+
+# Keep the benchmark job out of the real job store and storage root.
+_BENCH_DIR = tempfile.mkdtemp(prefix="bench-")
+os.environ.setdefault("MCP_JOB_STORE_PATH", os.path.join(_BENCH_DIR, "jobs.sqlite3"))
+os.environ.setdefault("MCP_SCAN_STORAGE_ROOT", os.path.join(_BENCH_DIR, "storage"))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend.main import (  # noqa: E402
+    DEFAULT_WEIGHT_BY_SEVERITY,
+    ScanJob,
+    ScanRequest,
+    _dump_json_bytes,
+    _finish_job,
+    _score_from_checks,
+    _viz_by_category,
+    _viz_dataset_from_checks,
+    app,
+    jobs,
+    jobs_lock,
+    orjson,
+)
+
+SEVERITIES = ("low", "medium", "high", "critical")
+CATEGORIES = ("supply_chain", "prompt_injection", "data_exfiltration", "auth")
+
+
+def synthetic_result(check_count: int, occurrence_count: int) -> dict:
+    checks = {}
+    for number in range(check_count):
+        code = f"E{number:04d}"
+        severity = SEVERITIES[number % len(SEVERITIES)]
+        occurrences = [
+            {
+                "code": code,
+                "message": f"Tool description {item} of {code} references an untrusted source " * 3,
+                "reference": [item % 7, item],
+                "extra_data": {"tool": f"tool_{item}", "server": "bench", "score": item / 10},
+            }
+            for item in range(occurrence_count if number % 3 else 0)
+        ]
+        weight = DEFAULT_WEIGHT_BY_SEVERITY[severity]
+        checks[f"SCAN-{code}"] = {
+            "id": f"SCAN-{code}",
+            "name": f"MCP Scan issue {code}",
+            "source": "mcp-scan",
+            "category": CATEGORIES[number % len(CATEGORIES)],
+            "severity": severity,
+            "weight": weight,
+            "satisfied": not occurrences,
+            "scoreContribution": 0 if occurrences else weight,
+            "evidence": {"type": "scanReport", "issue": code, "summary": {"occurrences": len(occurrences)}},
+            "raw": occurrences or None,
+        }
+
+    score, total_checks, passed_checks, critical_failures = _score_from_checks(checks)
+    providers = {"mcpScan": {"version": "bench", "mode": "synthetic", "runId": "bench"}}
+    return {
+        "providers": providers,
+        "securityLint": {
+            "score": score,
+            "totalChecks": total_checks,
+            "passedChecks": passed_checks,
+            "criticalFailures": critical_failures,
+            "providers": providers,
+            "scoring": {"weights": DEFAULT_WEIGHT_BY_SEVERITY, "capOnCriticalFailure": 0},
+            "checks": checks,
+            "vizDataset": _viz_dataset_from_checks(checks),
+            "vizByCategory": _viz_by_category(checks),
+        },
+        "rawArtifacts": {},
+    }
+
+
+async def finished_job(result: dict) -> ScanJob:
+    job = ScanJob(job_id=uuid.uuid4().hex, request=ScanRequest(serverUrl="https://bench.invalid/mcp"))
+    async with jobs_lock:
+        jobs[job.job_id] = job
+    await _finish_job(job, "succeeded", result=result)
+    return job
+
+
+def time_requests(client: TestClient, job_id: str, rounds: int) -> list[float]:
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        response = client.get(f"/api/security/scans/{job_id}")
+        samples.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return samples
+
+
+def report(label: str, samples: list[float]) -> float:
+    median = statistics.median(samples)
+    print(f"{label:<10} median {median * 1000:8.2f} ms   p90 {sorted(samples)[int(len(samples) * 0.9)] * 1000:8.2f} ms")
+    return median
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checks", type=int, default=400)
+    parser.add_argument("--occurrences", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=30)
+    args = parser.parse_args()
+
+    result = synthetic_result(args.checks, args.occurrences)
+    job = asyncio.run(finished_job(result))
+    assert job.result_json is not None
+    print(f"encoder: {'orjson' if orjson is not None else 'json'}; result size: {len(job.result_json) / 1e6:.1f} MB")
+
+    started = time.perf_counter()
+    _dump_json_bytes(result)
+    print(f"one-off encode on completion: {(time.perf_counter() - started) * 1000:.2f} ms")
+
+    with TestClient(app) as client:
+        cached = client.get(f"/api/security/scans/{job.job_id}").json()
+        cached_median = report("cached", time_requests(client, job.job_id, args.rounds))
+
+        # Drop the cached bytes so the route falls back to ScanJobStatus.
+        job.result_json = None
+        jobs.publish(job)
+        rebuilt = client.get(f"/api/security/scans/{job.job_id}").json()
+        rebuilt_median = report("rebuilt", time_requests(client, job.job_id, args.rounds))
+
+    if cached != rebuilt:
+        raise SystemExit("cached and rebuilt responses differ")
+    print(f"speedup: {rebuilt_median / cached_median:.1f}x")
+
+
+if __name__ == "__main__":
+    main()